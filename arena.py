@@ -0,0 +1,148 @@
+from array import array
+from typing import Iterable, List
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Compact Formula Representation:
+# Every clause is stored as signed integer literals packed back to back in a
+# single flat buffer, with clause i occupying lits[offsets[i]:offsets[i + 1]].
+# Clause ids are only materialised once a formula has been filtered, since
+# before that the id of a clause is simply its position.
+class ClauseArena:
+    __slots__ = ("numVars", "lits", "offsets", "ids")
+
+    def __init__(self, numVars: int = 0, lits: array = None, offsets: array = None,
+                 ids: array = None):
+        self.numVars = numVars
+        self.lits = lits if lits is not None else array("i")
+        self.offsets = offsets if offsets is not None else array("q", [0])
+        self.ids = ids
+
+    """
+        Builds an arena from any iterable of integer clauses.
+    """
+    @classmethod
+    def fromLists(cls, clauses: Iterable[Iterable[int]], ids: Iterable[int] = None,
+                  numVars: int = 0) -> "ClauseArena":
+        arena = cls(numVars)
+        for clause in clauses:
+            arena.lits.extend(clause)
+            arena.offsets.append(len(arena.lits))
+        if ids is not None:
+            arena.ids = array("q", ids)
+        if arena.lits:
+            arena.numVars = max(numVars, max(arena.lits), -min(arena.lits))
+        return arena
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        lits = self.lits
+        offsets = self.offsets
+        for i in range(len(offsets) - 1):
+            yield lits[offsets[i]:offsets[i + 1]]
+
+    def __repr__(self):
+        return f"ClauseArena({self.toLists()})"
+
+    def __eq__(self, other):
+        if type(other) != ClauseArena:
+            return False
+        return self.toLists() == other.toLists() and \
+            [self.clauseId(i) for i in range(len(self))] == \
+            [other.clauseId(i) for i in range(len(other))]
+
+    def clause(self, i: int) -> array:
+        return self.lits[self.offsets[i]:self.offsets[i + 1]]
+
+    def clauseLength(self, i: int) -> int:
+        return self.offsets[i + 1] - self.offsets[i]
+
+    def clauseId(self, i: int) -> int:
+        return i if self.ids is None else self.ids[i]
+
+    def toLists(self) -> List[List[int]]:
+        return [list(c) for c in self]
+
+    """
+        Appends a clause and returns its position in the arena.
+    """
+    def addClause(self, clause: Iterable[int], cid: int = None) -> int:
+        position = len(self)
+        if cid is not None and self.ids is None and cid != position:
+            self.ids = array("q", range(position))
+        self.lits.extend(clause)
+        self.offsets.append(len(self.lits))
+        if self.ids is not None:
+            self.ids.append(position if cid is None else cid)
+        for lit in self.lits[self.offsets[position]:]:
+            if abs(lit) > self.numVars:
+                self.numVars = abs(lit)
+        return position
+
+    def copy(self) -> "ClauseArena":
+        return ClauseArena(self.numVars, array("i", self.lits), array("q", self.offsets),
+                           None if self.ids is None else array("q", self.ids))
+
+    """
+        Returns a new arena holding only the clauses at the given positions,
+        keeping their ids.
+    """
+    def select(self, positions: Iterable[int]) -> "ClauseArena":
+        lits = self.lits
+        offsets = self.offsets
+        result = ClauseArena(self.numVars, ids=array("q"))
+        newLits = result.lits
+        newOffsets = result.offsets
+        newIds = result.ids
+        for i in positions:
+            newLits.extend(lits[offsets[i]:offsets[i + 1]])
+            newOffsets.append(len(newLits))
+            newIds.append(i if self.ids is None else self.ids[i])
+        return result
+
+    """
+        Removes, in place, every clause whose entry in keep is 0 and closes
+        the gaps they leave in the buffers. Returns the new position of every
+        old clause, with -1 for the removed ones.
+    """
+    def compact(self, keep) -> array:
+        lits = self.lits
+        offsets = self.offsets
+        newLits = array("i")
+        newOffsets = array("q", [0])
+        newIds = None if self.ids is None else array("q")
+        remap = array("q", [-1]) * len(self)
+        for i in range(len(self)):
+            if keep[i]:
+                remap[i] = len(newOffsets) - 1
+                newLits.extend(lits[offsets[i]:offsets[i + 1]])
+                newOffsets.append(len(newLits))
+                if newIds is not None:
+                    newIds.append(self.ids[i])
+        self.lits = newLits
+        self.offsets = newOffsets
+        self.ids = newIds
+        return remap
+
+    """
+        Number of bytes used by the literal, offset and id buffers.
+    """
+    def nbytes(self) -> int:
+        total = self.lits.itemsize * len(self.lits) + self.offsets.itemsize * len(self.offsets)
+        if self.ids is not None:
+            total += self.ids.itemsize * len(self.ids)
+        return total
+
+    """
+        Zero-copy NumPy views of the literal and offset buffers.
+    """
+    def asNumpy(self):
+        if np is None:
+            raise ImportError("numpy is required for ClauseArena.asNumpy")
+        return (np.frombuffer(self.lits, dtype=np.int32),
+                np.frombuffer(self.offsets, dtype=np.int64))
@@ -0,0 +1,223 @@
+#!/bin/python3
+import argparse
+import glob
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter, deque
+from multiprocessing.connection import wait
+from typing import Iterable, List, TextIO
+from dimacs import parseDimacs
+from heuristics import HEURISTICS
+from preprocess import Preprocessor
+from restarts import RESTART_POLICIES
+from search import CDCL, DEFAULT_RESTARTS, MODES, Solver
+from solver import completeSolve, variableNames
+
+# Batch Solving:
+# Solves many CNF files with one pool of worker processes, so the interpreter
+# starts and the modules load once per worker rather than once per file. Each
+# worker takes one file at a time; a worker that overruns the per-file timeout
+# is terminated and replaced. One JSON record per file is written, and
+# flushed, as soon as that file finishes, so the order is completion order and
+# an interrupted run keeps every record written so far.
+
+# Statuses of a record
+SAT = "SAT"
+UNSAT = "UNSAT"
+TIMEOUT = "TIMEOUT"
+ERROR = "ERROR"
+
+"""
+    Expands directories (recursively) and glob patterns into a sorted list
+    of files. Plain paths are kept as they are.
+"""
+def collectFiles(patterns: Iterable[str]) -> List[str]:
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            for root, dirs, names in os.walk(pattern):
+                dirs.sort()
+                files.extend(os.path.join(root, name) for name in sorted(names))
+        elif glob.has_magic(pattern):
+            files.extend(path for path in sorted(glob.glob(pattern, recursive=True))
+                         if os.path.isfile(path))
+        else:
+            files.append(pattern)
+    return files
+
+"""
+    SHA-256 of a model written as its literals, ordered by variable and
+    separated by spaces.
+"""
+def modelHash(model: List[int]) -> str:
+    return hashlib.sha256(" ".join(map(str, model)).encode()).hexdigest()
+
+"""
+    Solves one file the way solver.py does and returns its record.
+"""
+def solveFile(path: str, mode: str = CDCL, heuristic: str = None, seed: int = None,
+              restarts: str = DEFAULT_RESTARTS, preprocess: bool = True,
+              models: bool = False) -> dict:
+    start = time.perf_counter()
+    record = {"file": path}
+    try:
+        arena = parseDimacs(path)
+        preprocessor = None
+        searchClauses = arena
+        if preprocess:
+            preprocessor = Preprocessor(arena)
+            preprocessor.run()
+            searchClauses = preprocessor.toArena()
+        solver = Solver(searchClauses, mode, heuristic, seed, restarts)
+        isSat = solver.solve()
+    except Exception as error:
+        record.update(status=ERROR, error=f"{type(error).__name__}: {error}",
+                      seconds=round(time.perf_counter() - start, 6))
+        return record
+
+    record["status"] = SAT if isSat else UNSAT
+    if isSat:
+        model = solver.model if preprocessor is None else preprocessor.extendModel(solver.model)
+        model = sorted(map(int, completeSolve(variableNames(arena), set(map(str, model)))), key=abs)
+        if models:
+            record["model"] = model
+        else:
+            record["modelHash"] = modelHash(model)
+    record["seconds"] = round(time.perf_counter() - start, 6)
+    record["stats"] = {"variables": arena.numVars, "clauses": len(arena),
+                       "decisions": solver.decisions, "conflicts": solver.conflicts,
+                       "restarts": solver.restarts, "learnts": len(solver.clauseDb),
+                       "deleted": solver.clauseDb.deleted}
+    return record
+
+def _workerLoop(connection, options: dict):
+    while True:
+        path = connection.recv()
+        if path is None:
+            break
+        connection.send(solveFile(path, **options))
+
+class _Worker:
+    def __init__(self, context, options: dict):
+        self.connection, workerEnd = context.Pipe()
+        self.process = context.Process(target=_workerLoop, args=(workerEnd, options), daemon=True)
+        self.process.start()
+        workerEnd.close()
+        self.path = None
+        self.started = 0.0
+
+    def submit(self, path: str):
+        self.path = path
+        self.started = time.perf_counter()
+        self.connection.send(path)
+
+    def stop(self):
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join(1.0)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.connection.close()
+
+"""
+    Solves every file on a pool of jobs worker processes (one per CPU by
+    default), writing a JSON line to output as each one finishes. Files
+    running longer than timeout seconds are given up on. Returns the number
+    of records with each status.
+"""
+def runBatch(paths: Iterable[str], output: TextIO, jobs: int = None, timeout: float = None,
+             **options) -> Counter:
+    pending = deque(paths)
+    jobs = max(1, min(jobs or os.cpu_count() or 1, len(pending)))
+    context = multiprocessing.get_context()
+    idle: List[_Worker] = []
+    busy = {}
+    statuses = Counter()
+
+    def emit(record: dict):
+        statuses[record["status"]] += 1
+        output.write(json.dumps(record) + "\n")
+        output.flush()
+
+    try:
+        while pending or busy:
+            while pending and len(busy) < jobs:
+                worker = idle.pop() if idle else _Worker(context, options)
+                worker.submit(pending.popleft())
+                busy[worker.connection] = worker
+
+            waitFor = None
+            if timeout is not None:
+                now = time.perf_counter()
+                waitFor = max(0.0, min(worker.started + timeout - now for worker in busy.values()))
+            for connection in wait(list(busy), waitFor):
+                worker = busy.pop(connection)
+                try:
+                    emit(worker.connection.recv())
+                    idle.append(worker)
+                except EOFError:
+                    # The worker died without answering, e.g. killed for memory
+                    emit({"file": worker.path, "status": ERROR, "error": "worker exited",
+                          "seconds": round(time.perf_counter() - worker.started, 6)})
+                    worker.kill()
+
+            if timeout is not None:
+                now = time.perf_counter()
+                for connection, worker in list(busy.items()):
+                    if now - worker.started >= timeout:
+                        del busy[connection]
+                        worker.kill()
+                        emit({"file": worker.path, "status": TIMEOUT,
+                              "seconds": round(now - worker.started, 6)})
+    finally:
+        for worker in idle:
+            worker.stop()
+        for worker in busy.values():
+            worker.kill()
+    return statuses
+
+def parseArguments(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Solve many DIMACS CNF files, writing JSON lines.")
+    parser.add_argument("inputs", nargs="+",
+                        help="files, directories (searched recursively) or glob patterns")
+    parser.add_argument("--jobs", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--timeout", type=float, help="seconds allowed per file")
+    parser.add_argument("--output", help="file to append the records to (default: stdout)")
+    parser.add_argument("--models", action="store_true",
+                        help="write the full model of satisfiable files instead of its hash")
+    parser.add_argument("--mode", choices=MODES, default=CDCL,
+                        help="search algorithm (default: %(default)s)")
+    parser.add_argument("--heuristic", choices=tuple(HEURISTICS),
+                        help="branching heuristic (default: vsids for cdcl, jw for dpll)")
+    parser.add_argument("--seed", type=int, help="random seed, for reproducible runs")
+    parser.add_argument("--restarts", choices=tuple(RESTART_POLICIES), default=DEFAULT_RESTARTS,
+                        help="restart policy of cdcl mode (default: %(default)s)")
+    parser.add_argument("--no-preprocess", dest="preprocess", action="store_false",
+                        help="skip subsumption and variable elimination before search")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    arguments = parseArguments(sys.argv[1:])
+    files = collectFiles(arguments.inputs)
+    output = open(arguments.output, "a") if arguments.output else sys.stdout
+    start = time.perf_counter()
+    try:
+        statuses = runBatch(files, output, arguments.jobs, arguments.timeout,
+                            mode=arguments.mode, heuristic=arguments.heuristic, seed=arguments.seed,
+                            restarts=arguments.restarts, preprocess=arguments.preprocess,
+                            models=arguments.models)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+    summary = ", ".join(f"{count} {status}" for status, count in sorted(statuses.items()))
+    print(f"c {len(files)} files ({summary}) in {time.perf_counter() - start:.3f}s", file=sys.stderr)
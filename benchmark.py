@@ -0,0 +1,213 @@
+#!/bin/python3
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import sys
+import time
+from typing import Callable, Dict, List
+from arena import ClauseArena
+from generators import (directedTree, graphColouring, parityChain, pigeonhole, randomKSat,
+                        writeDimacs)
+from heuristics import HEURISTICS
+from search import CDCL, MODES, Solver
+from stats import peakRss
+
+# Benchmark Suite:
+# Solves a fixed set of generated instances and records, for each one, the
+# best wall time over a few repeats, the peak resident memory and the search
+# counters. Every run happens in a fresh spawned child process, so that its
+# peak memory counts an interpreter that imported the solver plus what
+# solving touched, and none of the parent's pages; a run whose process dies
+# is recorded with the status ERROR. The results are saved as a JSON
+# baseline, and compare reports every instance that got slower or hungrier
+# than a baseline by more than a threshold.
+#
+# Run 'python benchmark.py run -o baseline.json' on a known good revision,
+# then 'python benchmark.py run -o current.json' and
+# 'python benchmark.py compare baseline.json current.json' on a new one.
+
+# Name of every benchmark instance and the generator that builds it
+SUITE: Dict[str, Callable[[], ClauseArena]] = {
+    "random3-sat-120": lambda: randomKSat(120, 3, seed=4),
+    "random3-unsat-100": lambda: randomKSat(100, 3, seed=1),
+    "random4-unsat-40": lambda: randomKSat(40, 4, seed=1),
+    "pigeonhole-6": lambda: pigeonhole(6),
+    "parity-sat-20": lambda: parityChain(20, True, seed=1),
+    "parity-unsat-16": lambda: parityChain(16, False),
+    "colouring-unsat-100": lambda: graphColouring(100, 3, 4.2, seed=2),
+    "colouring-unsat-200": lambda: graphColouring(200, 3, 4.4, seed=3),
+    "tree-sat-12": lambda: directedTree(12),
+    "tree-unsat-6": lambda: directedTree(6, rooted=False),
+}
+
+# Relative slowdown (or memory growth) reported by compare
+DEFAULT_THRESHOLD = 0.25
+# Time differences below this many seconds are treated as noise
+DEFAULT_MIN_SECONDS = 0.05
+
+def _measureRun(connection, arena: ClauseArena, mode: str, heuristic: str):
+    start = time.perf_counter()
+    solver = Solver(arena, mode, heuristic)
+    solver.solve()
+    seconds = time.perf_counter() - start
+    connection.send({"status": "SAT" if solver.model is not None else "UNSAT",
+                     "seconds": round(seconds, 6), "peakRss": peakRss(),
+                     "variables": arena.numVars, "clauses": len(arena),
+                     "decisions": solver.decisions, "conflicts": solver.conflicts,
+                     "restarts": solver.restarts, "learnts": len(solver.clauseDb),
+                     "deleted": solver.clauseDb.deleted})
+    connection.close()
+
+"""
+    Benchmarks one formula, returning the record of its fastest run with
+    the lowest peak memory of all runs. If every run died without an
+    answer, the record has the status ERROR and the last exit code.
+"""
+def measure(arena: ClauseArena, repeats: int = 1, mode: str = CDCL,
+            heuristic: str = None) -> dict:
+    context = multiprocessing.get_context("spawn")
+    best = None
+    peaks = []
+    exitCode = None
+    for _ in range(max(1, repeats)):
+        receiver, sender = context.Pipe(duplex=False)
+        process = context.Process(target=_measureRun, args=(sender, arena, mode, heuristic))
+        process.start()
+        sender.close()
+        try:
+            record = receiver.recv()
+        except (EOFError, OSError):
+            record = None
+        finally:
+            receiver.close()
+        process.join()
+        if record is None:
+            exitCode = process.exitcode
+            continue
+        peaks.append(record["peakRss"])
+        if best is None or record["seconds"] < best["seconds"]:
+            best = record
+    if best is None:
+        return {"status": "ERROR", "seconds": None, "peakRss": None, "exitCode": exitCode,
+                "variables": arena.numVars, "clauses": len(arena)}
+    best["peakRss"] = None if None in peaks else min(peaks)
+    return best
+
+"""
+    Benchmarks the named instances of SUITE (all of them by default) and
+    returns the results in the baseline format.
+    Progress lines go to log if one is given.
+"""
+def runSuite(names: List[str] = None, repeats: int = 1, mode: str = CDCL, heuristic: str = None,
+             log=None) -> dict:
+    instances = {}
+    for name in names or list(SUITE):
+        instances[name] = measure(SUITE[name](), repeats, mode, heuristic)
+        if log is not None:
+            record = instances[name]
+            if record["seconds"] is None:
+                print(f"c {name}: {record['status']} (exit code {record['exitCode']})", file=log)
+            else:
+                print(f"c {name}: {record['status']} in {record['seconds']:.3f}s", file=log)
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"), "repeats": repeats,
+            "mode": mode, "heuristic": heuristic, "instances": instances}
+
+class Comparison:
+    __slots__ = ("name", "metric", "before", "after", "ratio", "regressed")
+
+    def __init__(self, name: str, metric: str, before, after, regressed: bool):
+        self.name = name
+        self.metric = metric
+        self.before = before
+        self.after = after
+        self.ratio = after / before if isinstance(before, (int, float)) and before else None
+        self.regressed = regressed
+
+    def __repr__(self):
+        ratio = "" if self.ratio is None else f" ({self.ratio:.2f}x)"
+        flag = "REGRESSION " if self.regressed else ""
+        return f"{flag}{self.name} {self.metric}: {self.before} -> {self.after}{ratio}"
+
+"""
+    Compares the instances two result sets have in common. Times that grow
+    by more than threshold (and more than minSeconds), peak memory that
+    grows by more than threshold and any change of status are regressions.
+    Times and memory are not compared for runs that errored.
+"""
+def compareResults(baseline: dict, current: dict, threshold: float = DEFAULT_THRESHOLD,
+                   minSeconds: float = DEFAULT_MIN_SECONDS) -> List[Comparison]:
+    comparisons = []
+    for name, before in baseline["instances"].items():
+        after = current["instances"].get(name)
+        if after is None:
+            continue
+        if before["status"] != after["status"]:
+            comparisons.append(Comparison(name, "status", before["status"], after["status"], True))
+        if before["seconds"] is None or after["seconds"] is None:
+            continue
+        slower = (after["seconds"] > before["seconds"] * (1 + threshold)
+                  and after["seconds"] - before["seconds"] > minSeconds)
+        comparisons.append(Comparison(name, "seconds", before["seconds"], after["seconds"], slower))
+        if before.get("peakRss") and after.get("peakRss"):
+            hungrier = after["peakRss"] > before["peakRss"] * (1 + threshold)
+            comparisons.append(Comparison(name, "peakRss", before["peakRss"], after["peakRss"],
+                                          hungrier))
+    return comparisons
+
+def parseArguments(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the solver on generated formulas.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="benchmark the suite and save the results")
+    run.add_argument("-o", "--output", help="JSON file to write (default: stdout)")
+    run.add_argument("--only", nargs="+", choices=tuple(SUITE), metavar="NAME",
+                     help="instances to run (default: all)")
+    run.add_argument("--repeats", type=int, default=3,
+                     help="timed runs per instance, the fastest counts (default: %(default)s)")
+    run.add_argument("--mode", choices=MODES, default=CDCL)
+    run.add_argument("--heuristic", choices=tuple(HEURISTICS),
+                     help="branching heuristic (default: vsids for cdcl, jw for dpll)")
+
+    compare = commands.add_parser("compare", help="flag regressions against a baseline")
+    compare.add_argument("baseline")
+    compare.add_argument("current")
+    compare.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                         help="relative growth reported as a regression (default: %(default)s)")
+    compare.add_argument("--min-seconds", dest="minSeconds", type=float,
+                         default=DEFAULT_MIN_SECONDS,
+                         help="ignore time differences below this (default: %(default)s)")
+
+    generate = commands.add_parser("generate", help="write the suite as DIMACS files")
+    generate.add_argument("directory")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    arguments = parseArguments(sys.argv[1:])
+    if arguments.command == "run":
+        results = runSuite(arguments.only, arguments.repeats, arguments.mode, arguments.heuristic,
+                           log=sys.stderr)
+        text = json.dumps(results, indent=2)
+        if arguments.output:
+            with open(arguments.output, "w") as f:
+                f.write(text + "\n")
+        else:
+            print(text)
+    elif arguments.command == "compare":
+        with open(arguments.baseline) as f:
+            baseline = json.load(f)
+        with open(arguments.current) as f:
+            current = json.load(f)
+        comparisons = compareResults(baseline, current, arguments.threshold, arguments.minSeconds)
+        for comparison in comparisons:
+            print(comparison)
+        regressions = sum(1 for comparison in comparisons if comparison.regressed)
+        print(f"c {regressions} regressions in {len(comparisons)} comparisons")
+        sys.exit(1 if regressions else 0)
+    else:
+        os.makedirs(arguments.directory, exist_ok=True)
+        for name, generator in SUITE.items():
+            with open(os.path.join(arguments.directory, name + ".cnf"), "w") as f:
+                writeDimacs(generator(), f, name)
@@ -0,0 +1,107 @@
+import threading
+import time
+from stats import currentRss, peakRss
+
+# Resource Budgets:
+# Limits on a single call to Solver.solve, counted from the start of that
+# call: wall time, conflicts, decisions, propagations and resident memory. The
+# search asks exhausted once per iteration of its loop. The counter limits
+# are plain integer comparisons; the clock, the memory reading and the
+# cancellation flag cost more, so they are only looked at every
+# CHECK_INTERVAL iterations. A solve that runs out of budget returns None
+# (unknown) and leaves the solver usable, with everything learned kept.
+#
+# Cancellation is cooperative: cancel, from another thread, or setting the
+# event passed in, from another process, makes the search stop at its next
+# check.
+
+# Loop iterations between two readings of the clock, memory and cancel flag
+CHECK_INTERVAL = 256
+
+# Reasons a search stopped without an answer
+TIME = "time"
+CONFLICTS = "conflicts"
+DECISIONS = "decisions"
+PROPAGATIONS = "propagations"
+MEMORY = "memory"
+CANCELLED = "cancelled"
+
+class Budget:
+    """
+        cancelEvent is anything with is_set, such as a threading.Event or a
+        multiprocessing Event shared with a controlling process; by default
+        a new threading.Event is used.
+    """
+    def __init__(self, seconds: float = None, conflicts: int = None, decisions: int = None,
+                 propagations: int = None, memory: int = None, cancelEvent=None):
+        self.seconds = seconds
+        self.conflicts = conflicts
+        self.decisions = decisions
+        self.propagations = propagations
+        # Resident set size limit in bytes
+        self.memory = memory
+        self.cancelEvent = cancelEvent if cancelEvent is not None else threading.Event()
+        # Why the last search stopped early, None if it did not
+        self.reason = None
+        # Absolute limits of the current search, set by start
+        self.deadline = None
+        self.conflictLimit = None
+        self.decisionLimit = None
+        self.propagationLimit = None
+        self.countdown = 0
+
+    """
+        Asks the search to stop at its next check. Safe to call from another
+        thread or a signal handler.
+    """
+    def cancel(self):
+        self.cancelEvent.set()
+
+    def cancelled(self) -> bool:
+        return self.cancelEvent.is_set()
+
+    """
+        Turns the relative limits into absolute ones for a search starting
+        now with the solver's current counters.
+    """
+    def start(self, solver):
+        self.reason = None
+        self.deadline = None if self.seconds is None else time.monotonic() + self.seconds
+        self.conflictLimit = None if self.conflicts is None else solver.conflicts + self.conflicts
+        self.decisionLimit = None if self.decisions is None else solver.decisions + self.decisions
+        self.propagationLimit = None if self.propagations is None \
+            else solver.propagations + self.propagations
+        self.countdown = 0
+
+    """
+        Whether the search should stop now, recording the reason if so.
+    """
+    def exhausted(self, solver) -> bool:
+        if self.conflictLimit is not None and solver.conflicts >= self.conflictLimit:
+            self.reason = CONFLICTS
+        elif self.decisionLimit is not None and solver.decisions >= self.decisionLimit:
+            self.reason = DECISIONS
+        elif self.propagationLimit is not None and solver.propagations >= self.propagationLimit:
+            self.reason = PROPAGATIONS
+        else:
+            self.countdown -= 1
+            if self.countdown > 0:
+                return False
+            self.countdown = CHECK_INTERVAL
+            if self.cancelEvent.is_set():
+                self.reason = CANCELLED
+            elif self.deadline is not None and time.monotonic() >= self.deadline:
+                self.reason = TIME
+            elif self.memory is not None and (currentRss() or peakRss() or 0) > self.memory:
+                self.reason = MEMORY
+            else:
+                return False
+        return True
+
+    def __repr__(self):
+        limits = [f"{name} {value}" for name, value in (
+            ("seconds", self.seconds), ("conflicts", self.conflicts),
+            ("decisions", self.decisions), ("propagations", self.propagations),
+            ("memory", self.memory)) if value is not None]
+        stopped = f", stopped by {self.reason}" if self.reason else ""
+        return f"budget: {', '.join(limits) or 'unlimited'}{stopped}"
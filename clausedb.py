@@ -0,0 +1,152 @@
+from typing import List
+
+# Learned Clause Database:
+# Tracks the literal block distance (LBD) and activity of every learned clause
+# and periodically deletes the least useful half of them. Clauses that are the
+# reason of a current assignment are never deleted, and "glue" clauses (LBD of
+# at most GLUE_LBD) survive the scheduled reductions. After a reduction the
+# clause arena is compacted and the watches and reasons are remapped.
+#
+# Besides the schedule, optional caps on the number of learned clauses and on
+# the bytes they occupy in the arena force a reduction as soon as they are
+# exceeded, and then glue clauses may go too.
+#
+# Clauses added only to serve as the reason of an implication made outside
+# the clauses (by the Gaussian elimination on XORs) sit among the learned
+# clauses in the arena but are not counted as learned: every reduction
+# deletes those that no longer are a reason, before choosing among the rest.
+
+GLUE_LBD = 2
+
+# Bytes taken in the arena by a clause: its literals plus its offset entry
+LITERAL_BYTES = 4
+OFFSET_BYTES = 8
+
+class ClauseDatabase:
+    def __init__(self, firstReduce: int = 2000, reduceIncrement: int = 300,
+                 maxLearnts: int = None, maxBytes: int = None, decayFactor: float = 0.999):
+        self.maxLearnts = maxLearnts
+        self.maxBytes = maxBytes
+        self.decayFactor = decayFactor
+        self.increment = 1.0
+        # Conflict count at which the next scheduled reduction happens
+        self.nextReduce = firstReduce
+        self.reduceInterval = firstReduce
+        self.reduceIncrement = reduceIncrement
+        # Metadata of the learned clause at arena position numOriginal + i
+        self.lbd: List[int] = []
+        self.activity: List[float] = []
+        # 1 for the reason only clauses
+        self.reasonOnly = bytearray()
+        self.reasonClauses = 0
+        self.learntBytes = 0
+        self.reasonBytes = 0
+        self.reductions = 0
+        self.deleted = 0
+
+    def __len__(self):
+        return len(self.lbd) - self.reasonClauses
+
+    def onLearnt(self, size: int, lbd: int):
+        self.lbd.append(lbd)
+        self.activity.append(self.increment)
+        self.reasonOnly.append(0)
+        self.learntBytes += size * LITERAL_BYTES + OFFSET_BYTES
+
+    def onReason(self, size: int):
+        self.lbd.append(size)
+        self.activity.append(0.0)
+        self.reasonOnly.append(1)
+        self.reasonClauses += 1
+        self.reasonBytes += size * LITERAL_BYTES + OFFSET_BYTES
+
+    def bump(self, index: int):
+        activity = self.activity
+        activity[index] += self.increment
+        if activity[index] > 1e20:
+            for i in range(len(activity)):
+                activity[i] *= 1e-20
+            self.increment *= 1e-20
+
+    def decay(self):
+        self.increment /= self.decayFactor
+
+    def overCap(self) -> bool:
+        return (self.maxLearnts is not None and len(self) > self.maxLearnts) or \
+            (self.maxBytes is not None and self.learntBytes > self.maxBytes)
+
+    def shouldReduce(self, conflicts: int) -> bool:
+        return conflicts >= self.nextReduce or self.overCap()
+
+    """
+        Deletes low value learned clauses from the solver and compacts its
+        clause storage.
+    """
+    def reduce(self, solver):
+        clauses = solver.clauses
+        lits = clauses.lits
+        offsets = clauses.offsets
+        value = solver.value
+        reason = solver.reason
+        numOriginal = solver.numOriginal
+        conflicts = solver.conflicts
+
+        if conflicts >= self.nextReduce:
+            self.reduceInterval += self.reduceIncrement
+            self.nextReduce = conflicts + self.reduceInterval
+        self.reductions += 1
+
+        # Clauses currently forcing their first literal
+        locked = set()
+        for i in range(len(self.lbd)):
+            position = numOriginal + i
+            first = lits[offsets[position]]
+            if value[first] == 1 and reason[abs(first)] == position:
+                locked.add(i)
+
+        reasonOnly = self.reasonOnly
+        unlocked = [i for i in range(len(self.lbd)) if i not in locked]
+        reasons = {i for i in unlocked if reasonOnly[i]}
+        # Worst first: high LBD, then low activity
+        candidates = [i for i in unlocked if not reasonOnly[i]]
+        candidates.sort(key=lambda i: (-self.lbd[i], self.activity[i]))
+        target = len(self) // 2
+        delete = set()
+        for i in candidates:
+            if len(delete) >= target:
+                break
+            if self.lbd[i] > GLUE_LBD:
+                delete.add(i)
+        # The caps override glue protection
+        if self.maxLearnts is not None or self.maxBytes is not None:
+            remaining = len(self) - len(delete)
+            remainingBytes = self.learntBytes - sum(self._bytes(clauses, numOriginal + i) for i in delete)
+            for i in candidates:
+                if not ((self.maxLearnts is not None and remaining > self.maxLearnts // 2) or
+                        (self.maxBytes is not None and remainingBytes > self.maxBytes // 2)):
+                    break
+                if i not in delete:
+                    delete.add(i)
+                    remaining -= 1
+                    remainingBytes -= self._bytes(clauses, numOriginal + i)
+        if not delete and not reasons:
+            return
+
+        keep = bytearray(b"\x01") * len(clauses)
+        for i in delete:
+            keep[numOriginal + i] = 0
+            self.learntBytes -= self._bytes(clauses, numOriginal + i)
+        for i in reasons:
+            keep[numOriginal + i] = 0
+            self.reasonBytes -= self._bytes(clauses, numOriginal + i)
+        self.reasonClauses -= len(reasons)
+        delete |= reasons
+        kept = [i for i in range(len(self.lbd)) if i not in delete]
+        self.lbd = [self.lbd[i] for i in kept]
+        self.activity = [self.activity[i] for i in kept]
+        self.reasonOnly = bytearray(reasonOnly[i] for i in kept)
+        self.deleted += len(delete) - len(reasons)
+        solver.compactClauses(keep)
+
+    def _bytes(self, clauses, position: int) -> int:
+        return clauses.clauseLength(position) * LITERAL_BYTES + OFFSET_BYTES
@@ -0,0 +1,81 @@
+#!/bin/python3
+import json
+import os
+import socket
+import sys
+import tempfile
+
+# Solver Service Client:
+# Sends one CNF file to a running solver service (service.py) and prints its
+# answer the way solver.py does, so 'python3 client.py FILE' can stand in for
+# run.sh. Only standard modules are imported, keeping start up cheap. When no
+# service is listening, or it answers BUSY or ERROR, the client runs solver.py
+# on the file itself, with the same time limit.
+#
+# Requests and responses are single JSON lines. A request carries an "id",
+# echoed in its response, and the DIMACS text itself under "cnf", plus an
+# optional "timeout" in seconds. A service started with --allow-paths also
+# takes a "path" it reads itself instead.
+#
+# The socket lives in a directory of its own that only its user may enter,
+# so no other local user can send the service requests.
+
+DEFAULT_SOCKET = os.environ.get("SAT_SOLVER_SOCKET", os.path.join(
+    tempfile.gettempdir(), f"sat-solver-{os.getuid()}", "service.sock"))
+
+"""
+    Sends request to the service listening on socketPath and returns its
+    response. Raises OSError if no service is listening there.
+"""
+def request(payload: dict, socketPath: str = DEFAULT_SOCKET) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+        connection.connect(socketPath)
+        connection.sendall(json.dumps(payload).encode() + b"\n")
+        connection.shutdown(socket.SHUT_WR)
+        with connection.makefile("rb") as stream:
+            for line in stream:
+                response = json.loads(line)
+                if response.get("id") == payload.get("id"):
+                    return response
+    raise ConnectionError("the service closed the connection without answering")
+
+# Statuses of a response the service could not answer, left to solver.py
+FALLBACK_STATUSES = ("BUSY", "ERROR")
+
+if __name__ == "__main__":
+    usage = f"usage: {sys.argv[0]} CNF_FILE [SECONDS]"
+    if not 2 <= len(sys.argv) <= 3:
+        sys.exit(usage)
+    inputFile = sys.argv[1]
+    seconds = None
+    if len(sys.argv) > 2:
+        try:
+            seconds = float(sys.argv[2])
+        except ValueError:
+            sys.exit(usage)
+        if not seconds > 0:
+            sys.exit(usage)
+    response = None
+    try:
+        with open(inputFile, "rb") as f:
+            cnf = f.read().decode()
+    except (OSError, UnicodeDecodeError):
+        # Compressed or unreadable input is left to solver.py
+        cnf = None
+    if cnf is not None:
+        payload = {"id": os.getpid(), "cnf": cnf}
+        if seconds is not None:
+            payload["timeout"] = seconds
+        try:
+            response = request(payload)
+        except OSError:
+            # No service, one we may not talk to, or one that hung up
+            pass
+    if response is None or response.get("status") in FALLBACK_STATUSES:
+        solverPath = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solver.py")
+        command = [sys.executable, solverPath, inputFile]
+        if seconds is not None:
+            command += ["--time-limit", str(seconds)]
+        os.execv(sys.executable, command)
+    print(f"c solved by the service in {response.get('seconds', 0.0):.3f}s")
+    sys.stdout.write(response.get("output", ""))
@@ -0,0 +1,131 @@
+import hashlib
+import mmap
+import os
+import struct
+import tempfile
+import time
+from array import array
+from arena import ClauseArena
+from dimacs import ParseStats, parseDimacs
+
+# Binary CNF Cache:
+# A parsed formula saved as the raw buffers of its ClauseArena, so that
+# loading it is a memory map rather than a parse. The file is a 64 byte
+# header followed by the int64 clause offset table and the int32 literals:
+#
+#   magic "CNFB", version (uint32), numVars, numClauses, numLits,
+#   source size, source mtime in nanoseconds (int64 each), zero padding
+#
+# Everything is in native byte order; a file written on a machine of the
+# other endianness reads back a garbled version and is treated as stale. The
+# size and mtime of the source CNF file are recorded so that a cache is
+# ignored, and rebuilt, as soon as the source changes.
+
+MAGIC = b"CNFB"
+VERSION = 1
+HEADER = struct.Struct("=4sI5q")
+HEADER_SIZE = 64
+# Suffix of cache files kept next to their source
+SUFFIX = ".cnfb"
+
+# Size and modification time that identify a version of the source file
+def _sourceStamp(source: str) -> (int, int):
+    info = os.stat(source)
+    return info.st_size, info.st_mtime_ns
+
+"""
+    Path of the cache of source: next to it, or in cacheDir under a name
+    derived from its absolute path.
+"""
+def cachePath(source: str, cacheDir: str = None) -> str:
+    if cacheDir is None:
+        return source + SUFFIX
+    digest = hashlib.sha256(os.path.abspath(source).encode()).hexdigest()[:32]
+    return os.path.join(cacheDir, digest + SUFFIX)
+
+"""
+    Writes arena to path in the binary format, stamped with the size and
+    mtime of source. The file is written under a temporary name and renamed
+    into place, so readers never see a partial cache.
+"""
+def writeCache(arena: ClauseArena, path: str, source: str = None):
+    size, mtime = _sourceStamp(source) if source is not None else (-1, -1)
+    lits = arena.lits if isinstance(arena.lits, array) else array("i", arena.lits)
+    offsets = arena.offsets if isinstance(arena.offsets, array) else array("q", arena.offsets)
+    header = HEADER.pack(MAGIC, VERSION, arena.numVars, len(arena), len(lits), size, mtime)
+    directory = os.path.dirname(os.path.abspath(path))
+    handle, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(handle, "wb") as f:
+            f.write(header.ljust(HEADER_SIZE, b"\0"))
+            offsets.tofile(f)
+            lits.tofile(f)
+        os.replace(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+"""
+    Loads a cache file, or returns None if it is not a valid cache of the
+    current version of source. With mapped True the arena's buffers are
+    read-only memoryviews of the mapped file, which takes constant time but
+    leaves the arena immutable; otherwise they are copied into arrays.
+"""
+def loadCache(path: str, source: str = None, mapped: bool = False) -> ClauseArena:
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size < HEADER_SIZE:
+                return None
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+    magic, version, numVars, numClauses, numLits, size, mtime = HEADER.unpack_from(buffer)
+    stale = magic != MAGIC or version != VERSION or numClauses < 0 or numLits < 0 \
+        or len(buffer) != HEADER_SIZE + 8 * (numClauses + 1) + 4 * numLits
+    if not stale and source is not None:
+        try:
+            stale = (size, mtime) != _sourceStamp(source)
+        except OSError:
+            stale = True
+    if stale:
+        buffer.close()
+        return None
+
+    litsStart = HEADER_SIZE + 8 * (numClauses + 1)
+    view = memoryview(buffer)
+    if mapped:
+        return ClauseArena(numVars, view[litsStart:].cast("i"),
+                           view[HEADER_SIZE:litsStart].cast("q"))
+    lits = array("i")
+    offsets = array("q")
+    lits.frombytes(view[litsStart:])
+    offsets.frombytes(view[HEADER_SIZE:litsStart])
+    view.release()
+    buffer.close()
+    return ClauseArena(numVars, lits, offsets)
+
+"""
+    Reads a CNF file through its binary cache: a valid cache is loaded,
+    otherwise the file is parsed and the cache (re)written. A cache that
+    cannot be written, e.g. in a read-only directory, is simply skipped.
+"""
+def parseCached(source: str, cacheDir: str = None, stats: ParseStats = None,
+                mapped: bool = False) -> ClauseArena:
+    start = time.perf_counter()
+    path = cachePath(source, cacheDir)
+    arena = loadCache(path, source, mapped)
+    if arena is not None:
+        if stats is not None:
+            stats.numBytes = os.path.getsize(path)
+            stats.numClauses = len(arena)
+            stats.numLiterals = len(arena.lits)
+            stats.seconds = time.perf_counter() - start
+        return arena
+    arena = parseDimacs(source, stats=stats)
+    try:
+        if cacheDir is not None:
+            os.makedirs(cacheDir, exist_ok=True)
+        writeCache(arena, path, source)
+    except OSError:
+        pass
+    return arena
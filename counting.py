@@ -0,0 +1,206 @@
+from array import array
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Set, Tuple
+from arena import ClauseArena
+
+# Model Counting (#SAT):
+# Counts the satisfying assignments of all numVars variables exactly, with
+# the DPLL scheme of the search (branch on a variable, propagate units) and
+# two additions. After every branch the residual clauses are split into
+# components sharing no variable, whose counts multiply; and every component
+# counted is cached under its canonical form, so the same sub-formula reached
+# along different branches is only counted once. Variables that drop out of
+# the residual formula without being assigned are free and double the count
+# each, which is also how variables occurring in no clause are counted.
+#
+# The recursion over branches and components runs on an explicit stack of
+# generators: a generator yields the sub-problem it needs counted and is sent
+# back the count, so the depth is bounded by memory rather than the
+# recursion limit.
+
+# Estimated bytes of component keys the cache may hold
+DEFAULT_CACHE_BYTES = 64 << 20
+
+Clause = Tuple[int, ...]
+
+# Rough memory taken by a cache entry: its key, its count and the dict slot
+def _entryBytes(key: bytes) -> int:
+    return len(key) + 150
+
+# Canonical form of a component: its sorted clauses as int32 literals, each
+# clause followed by a 0
+def _componentKey(clauses: List[Clause]) -> bytes:
+    flat = array("i")
+    for clause in sorted(clauses):
+        flat.extend(clause)
+        flat.append(0)
+    return flat.tobytes()
+
+class ModelCounter:
+    def __init__(self, arena: ClauseArena, cacheBytes: int = DEFAULT_CACHE_BYTES):
+        self.numVars = arena.numVars
+        self.cacheBytes = cacheBytes
+        # Canonical component -> number of models over its variables, least
+        # recently used first
+        self.cache: "OrderedDict[bytes, int]" = OrderedDict()
+        self.cachedBytes = 0
+        self.decisions = 0
+        self.components = 0
+        self.cacheHits = 0
+        self.cacheMisses = 0
+        self.evictions = 0
+        # Clauses without duplicate literals or tautologies, None if one is empty
+        self.clauses: List[Clause] = []
+        for clause in arena:
+            clause = tuple(sorted(set(clause)))
+            if not clause:
+                self.clauses = None
+                break
+            if not any(-lit in clause for lit in clause):
+                self.clauses.append(clause)
+
+    """
+        Applies the literals in units and then unit propagation to clauses.
+        Returns the residual clauses and the assigned literals, or None if
+        a clause becomes empty.
+    """
+    @staticmethod
+    def _propagate(clauses: List[Clause], units: Iterable[int]) -> (List[Clause], Set[int]):
+        assigned = set(units)
+        falsified = {-lit for lit in assigned}
+        if not assigned.isdisjoint(falsified):
+            return None
+        changed = bool(assigned)
+        while changed:
+            changed = False
+            residual = []
+            for clause in clauses:
+                if not assigned.isdisjoint(clause):
+                    continue
+                if not falsified.isdisjoint(clause):
+                    clause = tuple(lit for lit in clause if lit not in falsified)
+                    if not clause:
+                        return None
+                    if len(clause) == 1:
+                        lit = clause[0]
+                        assigned.add(lit)
+                        falsified.add(-lit)
+                        changed = True
+                        continue
+                residual.append(clause)
+            clauses = residual
+        return clauses, assigned
+
+    # Splits clauses into groups that share no variable
+    @staticmethod
+    def _components(clauses: List[Clause]) -> List[List[Clause]]:
+        parent: Dict[int, int] = {}
+
+        def find(var: int) -> int:
+            root = var
+            while parent[root] != root:
+                root = parent[root]
+            while parent[var] != root:
+                parent[var], var = root, parent[var]
+            return root
+
+        for clause in clauses:
+            first = abs(clause[0])
+            parent.setdefault(first, first)
+            for lit in clause[1:]:
+                var = abs(lit)
+                parent.setdefault(var, var)
+                a = find(first)
+                b = find(var)
+                if a != b:
+                    parent[b] = a
+        groups: Dict[int, List[Clause]] = {}
+        for clause in clauses:
+            groups.setdefault(find(abs(clause[0])), []).append(clause)
+        return list(groups.values())
+
+    def _cacheStore(self, key: bytes, count: int):
+        self.cache[key] = count
+        self.cachedBytes += _entryBytes(key)
+        while self.cachedBytes > self.cacheBytes and len(self.cache) > 1:
+            oldKey, _ = self.cache.popitem(last=False)
+            self.cachedBytes -= _entryBytes(oldKey)
+            self.evictions += 1
+
+    """
+        Models over variables of the residual formula left by assigning
+        units (and propagating) in clauses, whose variables are variables.
+    """
+    def _branch(self, clauses: List[Clause], variables: Set[int], units: Iterable[int]):
+        propagated = self._propagate(clauses, units)
+        if propagated is None:
+            return 0
+        residual, assigned = propagated
+        components = self._components(residual)
+        remaining = set()
+        for clause in residual:
+            remaining.update(abs(lit) for lit in clause)
+        free = len(variables) - len(assigned) - len(remaining)
+        count = 1 << free
+        # Small components first, so an unsatisfiable one is found cheaply
+        components.sort(key=len)
+        for component in components:
+            count *= yield self._component(component)
+            if count == 0:
+                break
+        return count
+
+    # Models of one component over exactly its variables
+    def _component(self, clauses: List[Clause]):
+        self.components += 1
+        key = _componentKey(clauses)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cacheHits += 1
+            self.cache.move_to_end(key)
+            return cached
+        self.cacheMisses += 1
+        occurrences: Dict[int, int] = {}
+        for clause in clauses:
+            for lit in clause:
+                occurrences[abs(lit)] = occurrences.get(abs(lit), 0) + 1
+        var = max(occurrences, key=occurrences.get)
+        variables = set(occurrences)
+        self.decisions += 1
+        count = yield self._branch(clauses, variables, [var])
+        count += yield self._branch(clauses, variables, [-var])
+        self._cacheStore(key, count)
+        return count
+
+    """
+        The exact number of assignments to variables 1 to numVars that
+        satisfy every clause.
+    """
+    def count(self) -> int:
+        if self.clauses is None:
+            return 0
+        stack = [self._branch(self.clauses, set(range(1, self.numVars + 1)), [])]
+        value = None
+        while True:
+            try:
+                request = stack[-1].send(value)
+            except StopIteration as finished:
+                stack.pop()
+                value = finished.value
+                if not stack:
+                    return value
+                continue
+            stack.append(request)
+            value = None
+
+    def __repr__(self):
+        return (f"count: {self.decisions} decisions, {self.components} components, "
+                f"cache {self.cacheHits} hits {self.cacheMisses} misses "
+                f"{self.evictions} evictions ({len(self.cache)} entries, "
+                f"~{self.cachedBytes >> 10} KB)")
+
+"""
+    Counts the models of arena over its numVars variables.
+"""
+def countModels(arena: ClauseArena, cacheBytes: int = DEFAULT_CACHE_BYTES) -> int:
+    return ModelCounter(arena, cacheBytes).count()
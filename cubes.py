@@ -0,0 +1,216 @@
+import multiprocessing
+import os
+import time
+from typing import List
+from arena import ClauseArena
+from propagation import FALSE, NO_REASON, TRUE, Propagator
+from search import CDCL, Solver
+
+# Cube and Conquer:
+# A lookahead phase splits the formula into cubes, partial assignments that
+# together cover every assignment not already refuted, by branching to a
+# fixed depth on the variable whose two values propagate the most. Each cube
+# is then solved independently as the original clauses plus one unit clause
+# per literal of the cube, on a pool of worker processes. The first
+# satisfiable cube ends the run; otherwise the formula is unsatisfiable once
+# every cube is.
+
+# Number of splits along each cube, giving up to 2^depth cubes
+DEFAULT_DEPTH = 6
+# Most frequently occurring free variables tried by each lookahead
+DEFAULT_CANDIDATES = 20
+
+class CubeResult:
+    __slots__ = ("index", "cube", "isSat", "model", "seconds", "conflicts")
+
+    def __init__(self, index: int, cube: List[int], isSat: bool, model: List[int],
+                 seconds: float, conflicts: int):
+        self.index = index
+        self.cube = cube
+        self.isSat = isSat
+        self.model = model
+        self.seconds = seconds
+        self.conflicts = conflicts
+
+    def __repr__(self):
+        return (f"cube {self.index} {self.cube} {'SAT' if self.isSat else 'UNSAT'} "
+                f"in {self.seconds:.3f}s after {self.conflicts} conflicts")
+
+class CubeAndConquerResult:
+    __slots__ = ("isSat", "model", "cubes", "refuted", "solved", "lookaheadSeconds", "seconds")
+
+    def __init__(self):
+        self.isSat = False
+        self.model = None
+        # Number of cubes generated, and of those refuted by the lookahead
+        self.cubes = 0
+        self.refuted = 0
+        # CubeResult of every cube solved, in completion order
+        self.solved: List[CubeResult] = []
+        self.lookaheadSeconds = 0.0
+        self.seconds = 0.0
+
+    def __repr__(self):
+        times = sorted(result.seconds for result in self.solved)
+        spread = (f", cube times min {times[0]:.3f}s median {times[len(times) // 2]:.3f}s "
+                  f"max {times[-1]:.3f}s" if times else "")
+        return (f"cubes: {self.cubes} generated in {self.lookaheadSeconds:.3f}s "
+                f"({self.refuted} refuted by lookahead), {len(self.solved)} solved{spread}, "
+                f"{self.seconds:.3f}s in total")
+
+# Splits a formula with lookahead on a propagator, replaying a cube from level
+# 0 each time it is extended.
+class CubeGenerator:
+    def __init__(self, arena: ClauseArena, depth: int = DEFAULT_DEPTH,
+                 candidates: int = DEFAULT_CANDIDATES):
+        self.depth = depth
+        self.candidates = candidates
+        self.propagator = Propagator(arena)
+        # Occurrences of each variable, used to preselect lookahead candidates
+        self.occurrences = [0] * (arena.numVars + 1)
+        for lit in arena.lits:
+            self.occurrences[abs(lit)] += 1
+        self.refuted = 0
+
+    """
+        Assigns the literals of cube, each on its own decision level, and
+        propagates them. Returns False if that leads to a conflict.
+    """
+    def _replay(self, cube: List[int]) -> bool:
+        propagator = self.propagator
+        propagator.cancelUntil(0)
+        if not propagator.ok or propagator.propagate() != NO_REASON:
+            return False
+        for lit in cube:
+            if propagator.value[lit] == FALSE:
+                return False
+            if propagator.value[lit] == TRUE:
+                continue
+            propagator.newDecisionLevel()
+            propagator.assign(lit, NO_REASON)
+            if propagator.propagate() != NO_REASON:
+                return False
+        return True
+
+    # Number of assignments lit implies, or -1 if it leads to a conflict
+    def _lookahead(self, lit: int) -> int:
+        propagator = self.propagator
+        level = propagator.decisionLevel()
+        before = len(propagator.trail)
+        propagator.newDecisionLevel()
+        propagator.assign(lit, NO_REASON)
+        conflict = propagator.propagate()
+        implied = len(propagator.trail) - before
+        propagator.cancelUntil(level)
+        return -1 if conflict != NO_REASON else implied
+
+    """
+        Picks the variable to split the current cube on. Literals whose
+        lookahead fails are implied false, so their negations are added to
+        the cube. Returns 0 when every variable is assigned, and None when
+        the cube turns out to be unsatisfiable.
+    """
+    def _pickSplit(self, cube: List[int]) -> int:
+        value = self.propagator.value
+        occurrences = self.occurrences
+        while True:
+            free = [var for var in range(1, len(occurrences)) if occurrences[var] and value[var] == 0]
+            if not free:
+                return 0
+            free.sort(key=lambda var: -occurrences[var])
+            bestVar = 0
+            bestScore = -1
+            forced = []
+            for var in free[:self.candidates]:
+                positive = self._lookahead(var)
+                negative = self._lookahead(-var)
+                if positive < 0 and negative < 0:
+                    return None
+                if positive < 0 or negative < 0:
+                    forced.append(-var if positive < 0 else var)
+                    continue
+                # Prefers variables that are strong both ways
+                score = positive * negative + positive + negative
+                if score > bestScore:
+                    bestVar = var
+                    bestScore = score
+            if not forced:
+                return bestVar
+            cube.extend(forced)
+            if not self._replay(cube):
+                return None
+
+    """
+        The cubes of the formula, each a list of literals. Cubes found
+        unsatisfiable by propagation are left out and counted in refuted.
+    """
+    def generate(self) -> List[List[int]]:
+        cubes = []
+        # (cube, number of splits that led to it)
+        pending = [([], 0)]
+        while pending:
+            cube, splits = pending.pop()
+            if not self._replay(cube):
+                self.refuted += 1
+                continue
+            var = self._pickSplit(cube) if splits < self.depth else 0
+            if var is None:
+                self.refuted += 1
+            elif var == 0:
+                cubes.append(cube)
+            else:
+                pending.append((cube + [-var], splits + 1))
+                pending.append((cube + [var], splits + 1))
+        self.propagator.cancelUntil(0)
+        return cubes
+
+# Formula shared by the cube solvers of a worker process
+_workerArena = None
+_workerOptions = None
+
+def _initWorker(arena: ClauseArena, options: dict):
+    global _workerArena, _workerOptions
+    _workerArena = arena
+    _workerOptions = options
+
+def _solveCube(task) -> CubeResult:
+    index, cube = task
+    start = time.perf_counter()
+    arena = _workerArena.copy()
+    for lit in cube:
+        arena.addClause([lit])
+    solver = Solver(arena, CDCL, **_workerOptions)
+    isSat = solver.solve()
+    return CubeResult(index, cube, isSat, solver.model, time.perf_counter() - start, solver.conflicts)
+
+"""
+    Solves the clauses by splitting them into cubes to the given depth and
+    solving the cubes on a pool of worker processes, one per CPU unless
+    told otherwise. The pool is terminated as soon as a cube is satisfiable.
+"""
+def solveCubes(arena: ClauseArena, depth: int = DEFAULT_DEPTH, workers: int = None,
+               candidates: int = DEFAULT_CANDIDATES, heuristic: str = None, seed: int = None,
+               restarts: str = None, phaseSaving: bool = True) -> CubeAndConquerResult:
+    start = time.perf_counter()
+    result = CubeAndConquerResult()
+    generator = CubeGenerator(arena, depth, candidates)
+    cubes = generator.generate()
+    result.cubes = len(cubes) + generator.refuted
+    result.refuted = generator.refuted
+    result.lookaheadSeconds = time.perf_counter() - start
+
+    if cubes:
+        options = {"heuristic": heuristic, "seed": seed, "phaseSaving": phaseSaving}
+        if restarts is not None:
+            options["restarts"] = restarts
+        workers = min(workers or os.cpu_count() or 1, len(cubes))
+        # Leaving the with block terminates any cube still being solved
+        with multiprocessing.Pool(workers, _initWorker, (arena, options)) as pool:
+            for cubeResult in pool.imap_unordered(_solveCube, enumerate(cubes)):
+                result.solved.append(cubeResult)
+                if cubeResult.isSat:
+                    result.isSat = True
+                    result.model = cubeResult.model
+                    break
+    result.seconds = time.perf_counter() - start
+    return result
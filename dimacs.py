@@ -0,0 +1,221 @@
+import bz2
+import gzip
+import io
+import lzma
+import time
+from array import array
+from typing import BinaryIO, List
+from arena import ClauseArena
+
+# Streaming DIMACS CNF Parser:
+# Reads the file in large binary chunks and produces signed integer literals
+# directly, without building an object per token. Files compressed with gzip,
+# bzip2 or xz are recognised by their magic bytes and decompressed as they are
+# read, so they are never expanded in memory or on disk.
+#
+# Lines starting with 'x' are XOR constraints, as read by CryptoMiniSat:
+# 'x1 -2 3 0' requires an odd number of its literals to be true. They are
+# either collected for a solver that handles XORs natively, or written out
+# as the equivalent clauses, of which an XOR of k variables takes 2^(k-1).
+
+DEFAULT_CHUNK_SIZE = 1 << 22
+
+# Leading bytes of each supported compression format and its opener
+COMPRESSIONS = ((b"\x1f\x8b", gzip.open), (b"BZh", bz2.open),
+                (b"\xfd7zXZ\x00", lzma.open))
+
+"""
+    Opens a CNF file for binary reading, decompressing it on the fly if it
+    is gzip, bzip2 or xz compressed, whatever its name. The contents of a
+    file already in memory may be passed as bytes instead of a path.
+"""
+def openInput(cnfFile) -> BinaryIO:
+    if isinstance(cnfFile, (bytes, bytearray)):
+        magic = cnfFile[:6]
+        cnfFile = io.BytesIO(cnfFile)
+    else:
+        with open(cnfFile, "rb") as f:
+            magic = f.read(6)
+    for prefix, opener in COMPRESSIONS:
+        if magic.startswith(prefix):
+            return opener(cnfFile, "rb")
+    return cnfFile if isinstance(cnfFile, io.BytesIO) else open(cnfFile, "rb")
+
+# Statistics about a single parse, used to report throughput
+class ParseStats:
+    __slots__ = ("numBytes", "numClauses", "numLiterals", "seconds")
+
+    def __init__(self):
+        self.numBytes = 0
+        self.numClauses = 0
+        self.numLiterals = 0
+        self.seconds = 0.0
+
+    def megabytesPerSecond(self) -> float:
+        if self.seconds <= 0:
+            return 0.0
+        return self.numBytes / (1 << 20) / self.seconds
+
+    def __repr__(self):
+        return (f"parsed {self.numClauses} clauses, {self.numLiterals} literals "
+                f"({self.numBytes} bytes) in {self.seconds:.3f}s "
+                f"({self.megabytesPerSecond():.1f} MB/s)")
+
+"""
+    The clauses equivalent to the XOR of lits being true, that is an odd
+    number of lits being true: one clause ruling out each assignment of
+    even parity.
+"""
+def xorClauses(lits: List[int]) -> List[List[int]]:
+    parity = 1
+    counts = {}
+    for lit in lits:
+        if lit < 0:
+            parity ^= 1
+        counts[abs(lit)] = counts.get(abs(lit), 0) ^ 1
+    variables = [var for var, count in counts.items() if count]
+    clauses = []
+    for mask in range(1 << len(variables)):
+        # Negating m of the variables rules out an assignment with m true
+        if bin(mask).count("1") % 2 != parity:
+            clauses.append([-var if mask >> i & 1 else var for i, var in enumerate(variables)])
+    return clauses
+
+"""
+    Removes comment and header lines from a chunk, recording the
+    'p cnf' counts in header. XOR lines go to xors, or are replaced by
+    their clauses when xors is None. Also reports whether a '%' end marker
+    was hit.
+"""
+def _stripNonClauseLines(data: bytes, header: List[int], xors: List[List[int]] = None) -> (bytes, bool):
+    kept = []
+    finished = False
+    for line in data.split(b"\n"):
+        stripped = line.lstrip()
+        if not stripped:
+            continue
+        first = stripped[:1]
+        if first == b"c":
+            continue
+        if first == b"p":
+            tokens = stripped.split()
+            if len(tokens) >= 4 and tokens[1] == b"cnf":
+                header[0] = int(tokens[2])
+                header[1] = int(tokens[3])
+            continue
+        if first == b"x":
+            lits = [int(token) for token in stripped[1:].split()]
+            if lits and lits[-1] == 0:
+                lits.pop()
+            if xors is None:
+                kept.extend(" ".join(map(str, clause)).encode() + b" 0" for clause in xorClauses(lits))
+            else:
+                xors.append(lits)
+                header[2] = max([header[2]] + [abs(lit) for lit in lits])
+            continue
+        # SATLIB files end with a '%' line followed by a stray '0'
+        if first == b"%":
+            finished = True
+            break
+        kept.append(line)
+    return b"\n".join(kept), finished
+
+"""
+    Reads a DIMACS CNF file, plain or compressed and given by its path or
+    its contents, as a stream of integer literals into a ClauseArena.
+    Clauses may span several lines or share one, since only the
+    terminating 0 marks the end of a clause. Pass a
+    ParseStats to collect throughput figures (in uncompressed bytes), and
+    a list as xors to collect the XOR lines as lists of literals rather
+    than turn them into clauses.
+"""
+def parseDimacs(cnfFile, chunkSize: int = DEFAULT_CHUNK_SIZE,
+                stats: ParseStats = None, xors: List[List[int]] = None) -> ClauseArena:
+    start = time.perf_counter()
+    if stats is None:
+        stats = ParseStats()
+    # [number of variables, number of clauses] from the 'p cnf' line, and
+    # the largest variable of the XOR lines collected
+    header = [0, -1, 0]
+    lits = array("i")
+    offsets = array("q", [0])
+    pending = []
+    numClauses = 0
+    maxVar = 0
+    carry = b""
+
+    with openInput(cnfFile) as f:
+        finished = False
+        while not finished:
+            chunk = f.read(chunkSize)
+            if not chunk:
+                data = carry
+                carry = b""
+                finished = True
+            else:
+                stats.numBytes += len(chunk)
+                # Only split on complete lines so a token is never cut in half
+                cut = chunk.rfind(b"\n")
+                if cut < 0:
+                    carry += chunk
+                    continue
+                data = carry + chunk[:cut + 1]
+                carry = chunk[cut + 1:]
+
+            # Fast path: a chunk with no comments or header is pure clause data
+            if data[:1] in (b"c", b"p", b"%", b"x") or b"\nc" in data or b"\np" in data \
+                    or b"\n%" in data or b"\nx" in data or b"\n " in data or b"\n\t" in data:
+                data, stop = _stripNonClauseLines(data, header, xors)
+                finished = finished or stop
+                # Once the header is known, preallocate the offset table
+                if numClauses == 0 and header[1] > 0 and len(offsets) == 1:
+                    offsets = array("q", bytes(8 * (header[1] + 1)))
+
+            tokens = list(map(int, data.split()))
+            if not tokens:
+                continue
+            maxVar = max(maxVar, max(tokens), -min(tokens))
+
+            # Clause boundaries are the positions of the terminating zeros;
+            # the k-th zero of this chunk closes a clause ending at base + pos - k
+            base = len(lits) + len(pending)
+            pos = -1
+            k = 0
+            index = tokens.index
+            append = offsets.append
+            try:
+                while True:
+                    pos = index(0, pos + 1)
+                    numClauses += 1
+                    if numClauses < len(offsets):
+                        offsets[numClauses] = base + pos - k
+                    else:
+                        append(base + pos - k)
+                    k += 1
+            except ValueError:
+                pass
+            if pending:
+                lits.extend(pending)
+                pending = []
+            if k == 0:
+                pending = tokens
+                continue
+            last = len(tokens) - 1 - tokens[::-1].index(0)
+            lits.extend(filter(None, tokens[:last]))
+            pending = tokens[last + 1:]
+
+    # A final clause that is missing its terminating 0
+    if pending:
+        lits.extend(pending)
+        numClauses += 1
+        if numClauses < len(offsets):
+            offsets[numClauses] = len(lits)
+        else:
+            offsets.append(len(lits))
+    # Drop any slots the header promised but the file did not deliver
+    del offsets[numClauses + 1:]
+
+    stats.numClauses = numClauses
+    stats.numLiterals = len(lits)
+    stats.seconds = time.perf_counter() - start
+    return ClauseArena(max(header[0], maxVar, header[2]), lits, offsets)
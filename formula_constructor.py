@@ -1,6 +1,12 @@
 from solver import *
 from typing import List, Dict
 import random
+from verify import ModelChecker
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 """
     Constructs a formula with a given dictionary of id to List of integers
@@ -41,21 +47,12 @@ def constructRandomFormula(numLit: int, numClause: int) -> (List[str], List[Clau
     Given a solution and a formula, solves the formula with that solution
 """ 
 def solveFormula(formula : List[Clause], solution : List[str]) -> bool:
-    boolDict = {}
-    # Convert the solution to a dictionary of integer to true or false
-    for eachS in solution:
-        numSol = int(eachS)
-        absSol = abs(numSol)
-        boolDict[absSol] = (numSol > 0)
-        boolDict[(-1 * absSol)] = not boolDict[absSol]
-    
-    answer = True
-    # Apply the solution to the formula
+    # Checks every clause at once with NumPy when it is installed
+    if np is not None:
+        return ModelChecker(formula).satisfies(solution)
+    trueLits = set(solution)
+    # Apply the solution to the formula, stopping at the first false clause
     for eachClause in formula:
-        eachClauseVal = False
-        for eachLit in eachClause.literalSet:
-            eachVal = int(eachLit.value)
-            eachClauseVal = eachClauseVal or boolDict[eachVal]
-        
-        answer = answer and eachClauseVal
-    return answer
\ No newline at end of file
+        if not any(eachLit.value in trueLits for eachLit in eachClause.literalSet):
+            return False
+    return True
@@ -0,0 +1,314 @@
+from typing import Dict, Iterable, List, Tuple
+from arena import ClauseArena
+from propagation import NO_REASON, TRUE, UNASSIGNED
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Gaussian Elimination over GF(2):
+# An XOR constraint says that an odd number of its literals is true, which is
+# a linear equation over GF(2): the sum of its variables equals its right
+# hand side, flipped once for every negated literal. Written as clauses an
+# XOR of k variables takes 2^(k-1) of them, and unit propagation on those
+# never combines two XORs, so parity problems defeat plain CDCL.
+#
+# The XORs are kept as the rows of a bit-packed matrix (one uint64 word per
+# 64 variables) in reduced row echelon form: every row has a basic variable
+# that no other row contains. During search the basic variable of each row
+# is kept unassigned for as long as the row has another unassigned variable
+# to swap it with, by adding the row to every other row containing that
+# variable. A row whose variables are then all assigned but one determines
+# the last, and a row with none left that has the wrong parity is a
+# conflict. Both are turned into clauses over the row's variables (a reason
+# or a conflict clause), stored among the learned clauses so that conflict
+# analysis works on them as on any other clause, but not counted as learned
+# and deleted by the next reduction once they stop being a reason.
+
+# Longest XOR looked for among the clauses, which takes 2^(k-1) of them
+DEFAULT_DETECT_LENGTH = 5
+
+"""
+    The variables (sorted, each once) and the right hand side of the XOR of
+    lits: duplicate variables cancel out and every negation flips it.
+"""
+def normalizeXor(lits: Iterable[int]) -> (List[int], bool):
+    rhs = True
+    counts = {}
+    for lit in lits:
+        if lit < 0:
+            rhs = not rhs
+        counts[abs(lit)] = counts.get(abs(lit), 0) ^ 1
+    return sorted(var for var, count in counts.items() if count), rhs
+
+"""
+    Whether an odd number of lits is true under model, a list of literals.
+"""
+def xorSatisfied(lits: Iterable[int], model: Iterable[int]) -> bool:
+    variables, rhs = normalizeXor(lits)
+    trueVars = {lit for lit in model if lit > 0}
+    return sum(1 for var in variables if var in trueVars) % 2 == rhs
+
+"""
+    Finds the XORs encoded among the clauses of arena: a set of variables
+    whose clauses between them rule out every assignment of one parity.
+    Each is returned as a list of literals, as parsed from an 'x' line.
+    Binary XORs (equivalences) are only returned along with longer ones,
+    since on their own the clauses handle them just as well.
+"""
+def detectXors(arena: ClauseArena, maxLength: int = DEFAULT_DETECT_LENGTH) -> List[List[int]]:
+    # Sorted variables of a clause -> bitmask of its negated positions
+    signs: Dict[Tuple[int, ...], set] = {}
+    for clause in arena:
+        if not 2 <= len(clause) <= maxLength:
+            continue
+        ordered = sorted(clause, key=abs)
+        variables = tuple(abs(lit) for lit in ordered)
+        if len(set(variables)) != len(variables):
+            continue
+        mask = sum(1 << i for i, lit in enumerate(ordered) if lit < 0)
+        signs.setdefault(variables, set()).add(mask)
+    xors = []
+    for variables, masks in signs.items():
+        needed = 1 << (len(variables) - 1)
+        if len(masks) < needed:
+            continue
+        for parity in (0, 1):
+            # A clause negating m variables rules out the assignment with
+            # exactly those m true, of parity m % 2
+            if sum(1 for mask in masks if bin(mask).count("1") % 2 == parity) == needed:
+                lits = list(variables)
+                if parity == 1:
+                    lits[0] = -lits[0]
+                xors.append(lits)
+                break
+    if all(len(lits) == 2 for lits in xors):
+        return []
+    return xors
+
+class GaussStats:
+    __slots__ = ("rows", "columns", "propagations", "conflicts", "pivots")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def __repr__(self):
+        return (f"gauss: {self.rows} rows over {self.columns} variables, "
+                f"{self.propagations} propagations, {self.conflicts} conflicts, "
+                f"{self.pivots} pivots")
+
+# Number of set bits in each row of a uint64 matrix
+def _rowCounts(words):
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    return np.unpackbits(words.view(np.uint8), axis=1).sum(axis=1, dtype=np.int64)
+
+class GaussEngine:
+    def __init__(self, solver, xors: Iterable[Iterable[int]]):
+        if np is None:
+            raise ImportError("numpy is required for GaussEngine")
+        self.solver = solver
+        self.stats = GaussStats()
+        # False once the XORs are known to be unsatisfiable on their own
+        self.ok = True
+        equations = [normalizeXor(lits) for lits in xors]
+        self.columns: List[int] = sorted({var for variables, _ in equations for var in variables})
+        self.column = {var: c for c, var in enumerate(self.columns)}
+        self.stats.columns = len(self.columns)
+        if self.columns:
+            solver.growVariables(self.columns[-1])
+        occurs = solver.occurs
+        for var in self.columns:
+            # Variables of the XORs alone still have to be branched on
+            if not occurs[var]:
+                occurs[var] = 1
+                solver.heuristic.addVariable(var)
+
+        # Gauss-Jordan elimination on Python integers as bit vectors
+        reduced: List[List[int]] = []
+        for variables, rhs in equations:
+            mask = 0
+            for var in variables:
+                mask |= 1 << self.column[var]
+            rhs = int(rhs)
+            for rowMask, rowRhs, pivot in reduced:
+                if mask >> pivot & 1:
+                    mask ^= rowMask
+                    rhs ^= rowRhs
+            if mask == 0:
+                if rhs:
+                    self.ok = False
+                    return
+                continue
+            pivot = (mask & -mask).bit_length() - 1
+            for row in reduced:
+                if row[0] >> pivot & 1:
+                    row[0] ^= mask
+                    row[1] ^= rhs
+            reduced.append([mask, rhs, pivot])
+        # A row of one variable fixes it at the root, and no other row can
+        # contain that variable, nor ever will
+        rows = []
+        for mask, rhs, pivot in reduced:
+            if mask & (mask - 1):
+                rows.append((mask, rhs, pivot))
+                continue
+            lit = self.columns[pivot] if rhs else -self.columns[pivot]
+            if solver.value[lit] == UNASSIGNED:
+                solver.assign(lit, NO_REASON)
+            elif solver.value[lit] != TRUE:
+                self.ok = False
+                return
+
+        self.words = max(1, (len(self.columns) + 63) // 64)
+        bits = self.words * 64
+        self.matrix = np.zeros((len(rows), self.words), dtype=np.uint64)
+        self.rhs = np.zeros(len(rows), dtype=np.uint8)
+        self.basic = np.zeros(len(rows), dtype=np.intp)
+        basicMask = 0
+        for r, (mask, rhs, pivot) in enumerate(rows):
+            self.matrix[r] = np.frombuffer(mask.to_bytes(bits // 8, "little"), dtype="<u8")
+            self.rhs[r] = rhs
+            self.basic[r] = pivot
+            basicMask |= 1 << pivot
+        self.basicWords = np.frombuffer(basicMask.to_bytes(bits // 8, "little"), dtype="<u8").copy()
+        # Assignment of each column, as synced from the solver's trail
+        self.assigned = np.zeros(bits, dtype=np.uint8)
+        self.true = np.zeros(bits, dtype=np.uint8)
+        # Trail position up to which assignments have been synced
+        self.head = 0
+        # Whether an assignment changed since the rows were last checked
+        self.dirty = True
+        self.stats.rows = len(rows)
+
+    def _sync(self):
+        trail = self.solver.trail
+        column = self.column
+        assigned = self.assigned
+        true = self.true
+        for i in range(self.head, len(trail)):
+            lit = trail[i]
+            c = column.get(abs(lit))
+            if c is not None:
+                assigned[c] = 1
+                true[c] = lit > 0
+                self.dirty = True
+        self.head = len(trail)
+
+    """
+        Forgets the assignments from trail position start on. Called
+        before the solver takes them off its trail.
+    """
+    def undo(self, start: int):
+        if start >= self.head:
+            return
+        trail = self.solver.trail
+        column = self.column
+        for i in range(start, self.head):
+            c = column.get(abs(trail[i]))
+            if c is not None:
+                self.assigned[c] = 0
+                self.true[c] = 0
+                self.dirty = True
+        self.head = start
+
+    def _pack(self, bits):
+        return np.packbits(bits, bitorder="little").view("<u8")
+
+    # The variables of row r
+    def _rowVars(self, r: int) -> List[int]:
+        mask = int.from_bytes(self.matrix[r].astype("<u8").tobytes(), "little")
+        columns = self.columns
+        variables = []
+        while mask:
+            low = mask & -mask
+            variables.append(columns[low.bit_length() - 1])
+            mask ^= low
+        return variables
+
+    # Makes column c the basic variable of row r, removing it from every other row
+    def _pivot(self, r: int, c: int):
+        matrix = self.matrix
+        word, bit = divmod(c, 64)
+        bit = np.uint64(1 << bit)
+        hits = (matrix[:, word] & bit) != 0
+        hits[r] = False
+        matrix[hits] ^= matrix[r]
+        self.rhs[hits] ^= self.rhs[r]
+        old = int(self.basic[r])
+        self.basicWords[old >> 6] ^= np.uint64(1 << (old & 63))
+        self.basicWords[word] |= bit
+        self.basic[r] = c
+        self.stats.pivots += 1
+
+    """
+        Brings the rows up to date with the solver's trail and acts on
+        them: assigns the variables they imply, each with a reason clause,
+        and returns the position of a conflict clause if a row is violated,
+        or NO_REASON. A conflict clause whose literals are all below the
+        current decision level is returned after backjumping to the highest
+        of them, as conflict analysis expects one at the current level.
+    """
+    def propagate(self) -> int:
+        self._sync()
+        if not self.dirty or len(self.rhs) == 0:
+            return NO_REASON
+        self.dirty = False
+        matrix = self.matrix
+        assigned = self._pack(self.assigned)
+        # Swap assigned basic variables for unassigned non-basic ones
+        for r in np.flatnonzero(self.assigned[self.basic]):
+            candidates = matrix[r] & ~assigned & ~self.basicWords
+            nonzero = np.flatnonzero(candidates)
+            if nonzero.size:
+                word = int(nonzero[0])
+                low = int(candidates[word])
+                self._pivot(int(r), word * 64 + (low & -low).bit_length() - 1)
+        free = _rowCounts(matrix & ~assigned)
+        # Whether the true variables of a row still miss its right hand side
+        parity = (_rowCounts(matrix & self._pack(self.true)) & 1) ^ self.rhs
+        conflicts = np.flatnonzero((free == 0) & (parity == 1))
+        if conflicts.size:
+            return self._conflict(int(conflicts[0]))
+        solver = self.solver
+        value = solver.value
+        for r in np.flatnonzero(free == 1):
+            r = int(r)
+            unassigned = [var for var in self._rowVars(r) if value[var] == UNASSIGNED]
+            if len(unassigned) != 1:
+                # Assigned by an earlier row, checked on the next call
+                continue
+            var = unassigned[0]
+            self._imply(r, var if parity[r] else -var)
+        return NO_REASON
+
+    # The literals of row r that are false, highest decision level first
+    def _falseLits(self, r: int, skip: int = 0) -> List[int]:
+        value = self.solver.value
+        level = self.solver.level
+        lits = [-var if value[var] == TRUE else var for var in self._rowVars(r) if var != skip]
+        lits.sort(key=lambda lit: -level[abs(lit)])
+        return lits
+
+    def _imply(self, r: int, lit: int):
+        solver = self.solver
+        self.stats.propagations += 1
+        if not solver.trailLim:
+            solver.assign(lit, NO_REASON)
+            return
+        clause = [lit] + self._falseLits(r, abs(lit))
+        solver.assign(lit, solver.attachClause(clause))
+        solver.clauseDb.onReason(len(clause))
+
+    def _conflict(self, r: int) -> int:
+        solver = self.solver
+        self.stats.conflicts += 1
+        clause = self._falseLits(r)
+        solver.cancelUntil(solver.level[abs(clause[0])])
+        position = solver.attachClause(clause)
+        solver.clauseDb.onReason(len(clause))
+        # The rows are rechecked once the conflict is resolved
+        self.dirty = True
+        return position
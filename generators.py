@@ -0,0 +1,171 @@
+import itertools
+import math
+import random
+from typing import List, TextIO
+from arena import ClauseArena
+
+# Benchmark Formula Generators:
+# Families of CNF formulas with known structure, used by the benchmark suite.
+# Every generator is deterministic for a given seed and returns a ClauseArena.
+
+# Clause to variable ratio at the satisfiability threshold of random k-SAT
+PHASE_TRANSITION = {2: 1.0, 3: 4.267, 4: 9.931, 5: 21.117, 6: 43.37, 7: 87.79}
+
+"""
+    Uniform random k-SAT: every clause has k distinct variables with random
+    signs. The number of clauses defaults to the phase transition, where
+    instances are hardest for their size.
+"""
+def randomKSat(numVars: int, k: int = 3, ratio: float = None, seed: int = 0) -> ClauseArena:
+    rng = random.Random(seed)
+    if ratio is None:
+        ratio = PHASE_TRANSITION.get(k, 2 ** k * math.log(2))
+    numClauses = round(ratio * numVars)
+    variables = range(1, numVars + 1)
+    clauses = ([rng.choice((1, -1)) * var for var in rng.sample(variables, k)]
+               for _ in range(numClauses))
+    return ClauseArena.fromLists(clauses, numVars=numVars)
+
+"""
+    Pigeonhole principle: holes + 1 pigeons in holes holes, no two sharing
+    one. Always unsatisfiable and exponentially hard for resolution.
+"""
+def pigeonhole(holes: int) -> ClauseArena:
+    # Variable p * holes + h + 1 means pigeon p sits in hole h
+    var = lambda p, h: p * holes + h + 1
+    clauses = [[var(p, h) for h in range(holes)] for p in range(holes + 1)]
+    for h in range(holes):
+        for p, q in itertools.combinations(range(holes + 1), 2):
+            clauses.append([-var(p, h), -var(q, h)])
+    return ClauseArena.fromLists(clauses, numVars=(holes + 1) * holes)
+
+# Clauses of a = b xor c
+def _xorClauses(a: int, b: int, c: int) -> List[List[int]]:
+    return [[-a, b, c], [-a, -b, -c], [a, -b, c], [a, b, -c]]
+
+# Encodes the parity of variables as a chain of auxiliary variables starting
+# at nextVar, returning the variable equal to the parity and the next free one
+def _parityChain(variables: List[int], nextVar: int, clauses: List[List[int]]) -> (int, int):
+    current = variables[0]
+    for var in variables[1:]:
+        clauses.extend(_xorClauses(nextVar, current, var))
+        current = nextVar
+        nextVar += 1
+    return current, nextVar
+
+"""
+    Parity (XOR) chains: the parity of numVars variables is encoded twice,
+    over two random orders of the variables, with auxiliary variables. The
+    two parities are required to be equal (satisfiable) or to differ
+    (unsatisfiable, which is hard without reasoning about XORs).
+"""
+def parityChain(numVars: int, satisfiable: bool = True, seed: int = 0) -> ClauseArena:
+    rng = random.Random(seed)
+    variables = list(range(1, numVars + 1))
+    clauses = []
+    first, nextVar = _parityChain(variables, numVars + 1, clauses)
+    rng.shuffle(variables)
+    second, nextVar = _parityChain(variables, nextVar, clauses)
+    if satisfiable:
+        clauses.extend([[first, -second], [-first, second]])
+    else:
+        clauses.extend([[first, second], [-first, -second]])
+    return ClauseArena.fromLists(clauses, numVars=nextVar - 1)
+
+"""
+    Colouring of a random graph with numVertices vertices and the given
+    average degree: each vertex takes exactly one of colours colours and
+    adjacent vertices take different ones.
+"""
+def graphColouring(numVertices: int, colours: int = 3, degree: float = 4.0,
+                   seed: int = 0) -> ClauseArena:
+    rng = random.Random(seed)
+    # Variable v * colours + c + 1 means vertex v has colour c
+    var = lambda v, c: v * colours + c + 1
+    clauses = []
+    for v in range(numVertices):
+        clauses.append([var(v, c) for c in range(colours)])
+        for c, d in itertools.combinations(range(colours), 2):
+            clauses.append([-var(v, c), -var(v, d)])
+    probability = min(1.0, degree / max(1, numVertices - 1))
+    for u, v in itertools.combinations(range(numVertices), 2):
+        if rng.random() < probability:
+            for c in range(colours):
+                clauses.append([-var(u, c), -var(v, c)])
+    return ClauseArena.fromLists(clauses, numVars=numVertices * colours)
+
+# Hands out fresh variables to Tseitin encodings
+class _Variables:
+    def __init__(self):
+        self.count = 0
+
+    def new(self) -> int:
+        self.count += 1
+        return self.count
+
+# Defines a fresh variable as the AND of lits
+def _tseitinAnd(lits: List[int], variables: _Variables, clauses: List[List[int]]) -> int:
+    gate = variables.new()
+    clauses.extend([-gate, lit] for lit in lits)
+    clauses.append([gate] + [-lit for lit in lits])
+    return gate
+
+# Defines a fresh variable as the OR of lits
+def _tseitinOr(lits: List[int], variables: _Variables, clauses: List[List[int]]) -> int:
+    return -_tseitinAnd([-lit for lit in lits], variables, clauses)
+
+"""
+    Forge style encoding of "edges is a directed tree" over atoms atoms,
+    like the directed_tree model in the write-up: a relation variable per
+    pair of atoms, and a transitive closure built by repeated squaring out
+    of Tseitin AND/OR gates, which is how Kodkod translates the closure
+    operator. With rooted False no atom may be the root, which makes every
+    atom need a parent and the formula unsatisfiable.
+"""
+def directedTree(atoms: int, rooted: bool = True) -> ClauseArena:
+    variables = _Variables()
+    clauses = []
+    edge = [[variables.new() for j in range(atoms)] for i in range(atoms)]
+    root = [variables.new() for i in range(atoms)]
+    for j in range(atoms):
+        clauses.append([-edge[j][j]])
+        # A root has no parent, any other atom at most one
+        parents = [edge[i][j] for i in range(atoms) if i != j]
+        clauses.extend([-root[j], -parent] for parent in parents)
+        clauses.append([root[j]] + parents)
+        clauses.extend([-p, -q] for p, q in itertools.combinations(parents, 2))
+    if rooted:
+        clauses.append(root)
+        clauses.extend([-p, -q] for p, q in itertools.combinations(root, 2))
+    else:
+        clauses.extend([-r] for r in root)
+
+    # reach[i][j] holds when j can be reached from i in at most 2^k steps
+    reach = [row[:] for row in edge]
+    steps = 1
+    while steps < atoms:
+        squared = []
+        for i in range(atoms):
+            row = []
+            for j in range(atoms):
+                paths = [_tseitinAnd([reach[i][m], reach[m][j]], variables, clauses)
+                         for m in range(atoms) if m != i and m != j]
+                row.append(_tseitinOr([reach[i][j]] + paths, variables, clauses))
+            squared.append(row)
+        reach = squared
+        steps *= 2
+    for i in range(atoms):
+        # Acyclic, and the root reaches every other atom
+        clauses.append([-reach[i][i]])
+        clauses.extend([-root[i], reach[i][j]] for j in range(atoms) if j != i)
+    return ClauseArena.fromLists(clauses, numVars=variables.count)
+
+"""
+    Writes a formula in DIMACS CNF format.
+"""
+def writeDimacs(arena: ClauseArena, output: TextIO, comment: str = None):
+    if comment:
+        output.write(f"c {comment}\n")
+    output.write(f"p cnf {arena.numVars} {len(arena)}\n")
+    for clause in arena:
+        output.write(" ".join(map(str, clause)) + " 0\n")
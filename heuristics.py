@@ -0,0 +1,307 @@
+import random
+from typing import List
+
+# Branching Heuristics:
+# A heuristic is attached to a Solver and asked for the next decision literal.
+# The solver tells it about backtracking (so unassigned variables become
+# candidates again) and about the variables involved in each conflict.
+
+# Largest activity before every activity is scaled back down
+RESCALE_LIMIT = 1e100
+
+class BranchingHeuristic:
+    name = None
+
+    def __init__(self, seed: int = None):
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.solver = None
+
+    def attach(self, solver):
+        self.solver = solver
+
+    """
+        Returns the next decision literal, or 0 once every variable that
+        occurs in the formula is assigned.
+    """
+    def pick(self) -> int:
+        raise NotImplementedError
+
+    # Called before trail[start:] is unassigned
+    def onBacktrack(self, trail: List[int], start: int):
+        pass
+
+    # Called when the solver makes room for variables up to numVars
+    def grow(self, numVars: int):
+        pass
+
+    # Called when var first occurs in a clause added after attaching
+    def addVariable(self, var: int):
+        pass
+
+    # Called for every variable that took part in a conflict
+    def bump(self, var: int):
+        pass
+
+    # Called once per conflict, after its variables were bumped
+    def decay(self):
+        pass
+
+    # Literal of the variable with the polarity the solver prefers for it
+    def _withPolarity(self, var: int) -> int:
+        return var if self.solver.polarity[var] else -var
+
+# Indexed binary max-heap of variables ordered by activity. indices[var] is
+# the position of var in heap, or -1 if it is not in the heap.
+class ActivityHeap:
+    def __init__(self, activity: List[float]):
+        self.activity = activity
+        self.heap = []
+        self.indices = [-1] * len(activity)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, var: int) -> bool:
+        return self.indices[var] >= 0
+
+    def grow(self, numVars: int):
+        self.indices.extend([-1] * (numVars + 1 - len(self.indices)))
+
+    def insert(self, var: int):
+        if self.indices[var] >= 0:
+            return
+        self.indices[var] = len(self.heap)
+        self.heap.append(var)
+        self._up(len(self.heap) - 1)
+
+    def pop(self) -> int:
+        heap = self.heap
+        top = heap[0]
+        last = heap.pop()
+        self.indices[top] = -1
+        if heap:
+            heap[0] = last
+            self.indices[last] = 0
+            self._down(0)
+        return top
+
+    # Restores the heap order after the activity of var increased
+    def increase(self, var: int):
+        if self.indices[var] >= 0:
+            self._up(self.indices[var])
+
+    def _up(self, i: int):
+        heap = self.heap
+        indices = self.indices
+        activity = self.activity
+        var = heap[i]
+        key = activity[var]
+        while i > 0:
+            parent = (i - 1) >> 1
+            if activity[heap[parent]] >= key:
+                break
+            heap[i] = heap[parent]
+            indices[heap[i]] = i
+            i = parent
+        heap[i] = var
+        indices[var] = i
+
+    def _down(self, i: int):
+        heap = self.heap
+        indices = self.indices
+        activity = self.activity
+        size = len(heap)
+        var = heap[i]
+        key = activity[var]
+        while True:
+            child = 2 * i + 1
+            if child >= size:
+                break
+            if child + 1 < size and activity[heap[child + 1]] > activity[heap[child]]:
+                child += 1
+            if activity[heap[child]] <= key:
+                break
+            heap[i] = heap[child]
+            indices[heap[i]] = i
+            i = child
+        heap[i] = var
+        indices[var] = i
+
+# Exponential VSIDS: every conflict bumps its variables by an increment that
+# grows geometrically, so older bumps decay relative to newer ones without
+# touching every activity. Activities are rescaled before they overflow.
+class VsidsHeuristic(BranchingHeuristic):
+    name = "vsids"
+
+    def __init__(self, seed: int = None, decayFactor: float = 0.95):
+        super().__init__(seed)
+        self.decayFactor = decayFactor
+        self.increment = 1.0
+        self.activity = []
+        self.order = None
+
+    def attach(self, solver):
+        super().attach(solver)
+        self.activity = [0.0] * (solver.numVars + 1)
+        # A seed breaks the initial ties randomly instead of by index
+        if self.seed is not None:
+            for var in range(1, solver.numVars + 1):
+                self.activity[var] = self.rng.random() * 1e-5
+        self.order = ActivityHeap(self.activity)
+        for var in range(1, solver.numVars + 1):
+            if solver.occurs[var]:
+                self.order.insert(var)
+
+    def grow(self, numVars: int):
+        # Extended in place, the heap shares this list
+        self.activity.extend([0.0] * (numVars + 1 - len(self.activity)))
+        self.order.grow(numVars)
+
+    def addVariable(self, var: int):
+        self.order.insert(var)
+
+    def pick(self) -> int:
+        order = self.order
+        value = self.solver.value
+        while order.heap:
+            var = order.pop()
+            if value[var] == 0:
+                return self._withPolarity(var)
+        return 0
+
+    def onBacktrack(self, trail: List[int], start: int):
+        insert = self.order.insert
+        for i in range(start, len(trail)):
+            lit = trail[i]
+            insert(lit if lit > 0 else -lit)
+
+    def bump(self, var: int):
+        activity = self.activity
+        activity[var] += self.increment
+        if activity[var] > RESCALE_LIMIT:
+            for i in range(len(activity)):
+                activity[i] *= 1.0 / RESCALE_LIMIT
+            self.increment *= 1.0 / RESCALE_LIMIT
+        self.order.increase(var)
+
+    def decay(self):
+        self.increment /= self.decayFactor
+
+# Scores every unassigned variable over the clauses that are not yet
+# satisfied, counting only their unassigned literals. Ties go to the lowest
+# variable index, so these heuristics are fully deterministic.
+class _ClauseScoreHeuristic(BranchingHeuristic):
+    def pick(self) -> int:
+        solver = self.solver
+        value = solver.value
+        lits = solver.clauses.lits
+        offsets = solver.clauses.offsets
+        scores = {}
+        for ci in range(solver.numOriginal):
+            free = []
+            for k in range(offsets[ci], offsets[ci + 1]):
+                lit = lits[k]
+                litValue = value[lit]
+                if litValue == 1:
+                    break
+                if litValue == 0:
+                    free.append(lit)
+            else:
+                self.scoreClause(scores, free)
+        if not scores:
+            # Every clause is satisfied, assign any variable that is left
+            occurs = solver.occurs
+            for var in range(1, solver.numVars + 1):
+                if occurs[var] and value[var] == 0:
+                    return self._withPolarity(var)
+            return 0
+        return self.choose(scores)
+
+    def scoreClause(self, scores: dict, free: List[int]):
+        raise NotImplementedError
+
+    def choose(self, scores: dict) -> int:
+        raise NotImplementedError
+
+# Two-sided Jeroslow-Wang: J(l) is the sum of 2^-|C| over the clauses C that
+# contain l. Branches on the variable with the largest J(x) + J(-x), choosing
+# the polarity with the larger score.
+class JeroslowWangHeuristic(_ClauseScoreHeuristic):
+    name = "jw"
+
+    def scoreClause(self, scores: dict, free: List[int]):
+        weight = 2.0 ** -len(free)
+        for lit in free:
+            scores[lit] = scores.get(lit, 0.0) + weight
+
+    def choose(self, scores: dict) -> int:
+        bestVar = 0
+        bestScore = -1.0
+        for var in sorted({abs(lit) for lit in scores}):
+            score = scores.get(var, 0.0) + scores.get(-var, 0.0)
+            if score > bestScore:
+                bestVar = var
+                bestScore = score
+        return bestVar if scores.get(bestVar, 0.0) >= scores.get(-bestVar, 0.0) else -bestVar
+
+# Maximum Occurrences in clauses of Minimum Size: only the shortest unsatisfied
+# clauses count, and variables are ranked by (f(x) + f(-x)) * 2^k + f(x) * f(-x).
+class MomsHeuristic(_ClauseScoreHeuristic):
+    name = "moms"
+    weight = 2 ** 4
+
+    def pick(self) -> int:
+        self.minSize = None
+        return super().pick()
+
+    def scoreClause(self, scores: dict, free: List[int]):
+        if self.minSize is None or len(free) < self.minSize:
+            self.minSize = len(free)
+            scores.clear()
+        if len(free) == self.minSize:
+            for lit in free:
+                scores[lit] = scores.get(lit, 0) + 1
+
+    def choose(self, scores: dict) -> int:
+        bestVar = 0
+        bestScore = -1
+        for var in sorted({abs(lit) for lit in scores}):
+            positive = scores.get(var, 0)
+            negative = scores.get(-var, 0)
+            score = (positive + negative) * self.weight + positive * negative
+            if score > bestScore:
+                bestVar = var
+                bestScore = score
+        return bestVar if scores.get(bestVar, 0) >= scores.get(-bestVar, 0) else -bestVar
+
+# Uniformly random unassigned variable, as the original pickVar did, but
+# drawn from a seedable generator so runs can be reproduced.
+class RandomHeuristic(BranchingHeuristic):
+    name = "random"
+
+    def attach(self, solver):
+        super().attach(solver)
+        self.variables = [var for var in range(1, solver.numVars + 1) if solver.occurs[var]]
+
+    def addVariable(self, var: int):
+        self.variables.append(var)
+
+    def pick(self) -> int:
+        value = self.solver.value
+        free = [var for var in self.variables if value[var] == 0]
+        if not free:
+            return 0
+        var = self.rng.choice(free)
+        return var if self.rng.random() < 0.5 else -var
+
+HEURISTICS = {heuristic.name: heuristic for heuristic in
+              (VsidsHeuristic, JeroslowWangHeuristic, MomsHeuristic, RandomHeuristic)}
+
+"""
+    Builds a branching heuristic from its name.
+"""
+def makeHeuristic(name: str, seed: int = None) -> BranchingHeuristic:
+    if name not in HEURISTICS:
+        raise ValueError(f"unknown branching heuristic {name!r}, expected one of {tuple(HEURISTICS)}")
+    return HEURISTICS[name](seed)
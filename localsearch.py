@@ -0,0 +1,248 @@
+import random
+import time
+from array import array
+from typing import List
+from arena import ClauseArena
+
+# Stochastic Local Search:
+# Starts from a random complete assignment and repeatedly flips a variable of
+# a randomly chosen unsatisfied clause until no clause is left unsatisfied or
+# a budget runs out. It can only find models, never prove that there is none.
+#
+# Each clause keeps its number of true literals and the XOR of its true
+# variables, which is the critical variable whenever exactly one literal is
+# true. The break count of a variable is the number of clauses it is critical
+# for, i.e. that flipping it would make unsatisfied. The unsatisfied clauses
+# sit in a list with each clause's position, for constant time insertion and
+# removal. Flipping a variable therefore only visits the clauses it occurs in.
+#
+# Literal indexed tables have 2 * numVars + 1 entries, as in the propagator.
+
+WALKSAT = "walksat"
+PROBSAT = "probsat"
+ALGORITHMS = (PROBSAT, WALKSAT)
+
+# Probability of a random walk step in WalkSAT when every candidate breaks
+# some clause
+DEFAULT_NOISE = 0.567
+# ProbSAT polynomial break weight (EPSILON + break) ^ -cb, with cb tuned by
+# the longest clause length
+PROBSAT_CB = {3: 2.38, 4: 3.0, 5: 3.7, 6: 5.1, 7: 5.4}
+PROBSAT_EPSILON = 1.0
+# Flips between two checks of the time budget
+TIME_CHECK_INTERVAL = 1024
+
+class LocalSearchResult:
+    __slots__ = ("isSat", "model", "algorithm", "flips", "tries", "bestUnsat", "seconds")
+
+    def __init__(self, algorithm: str):
+        self.isSat = False
+        self.model = None
+        self.algorithm = algorithm
+        self.flips = 0
+        self.tries = 0
+        # Fewest unsatisfied clauses seen at any point
+        self.bestUnsat = None
+        self.seconds = 0.0
+
+    def __repr__(self):
+        outcome = "found a model" if self.isSat else \
+            f"gave up with {self.bestUnsat} clauses unsatisfied at best"
+        return (f"local search: {self.algorithm} {outcome} after {self.flips} flips "
+                f"in {self.tries} tries, {self.seconds:.3f}s")
+
+class LocalSearch:
+    def __init__(self, arena: ClauseArena, algorithm: str = PROBSAT, seed: int = None,
+                 noise: float = DEFAULT_NOISE, cb: float = None):
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"unknown local search {algorithm!r}, expected one of {ALGORITHMS}")
+        numVars = arena.numVars
+        self.algorithm = algorithm
+        self.numVars = numVars
+        self.rng = random.Random(seed)
+        self.noise = noise
+        # Clauses without duplicate literals or tautologies
+        self.clauses: List[List[int]] = []
+        self.hasEmpty = False
+        for clause in arena:
+            clause = list(dict.fromkeys(clause))
+            if not clause:
+                self.hasEmpty = True
+            elif not any(-lit in clause for lit in clause):
+                self.clauses.append(clause)
+        self.occurrences: List[List[int]] = [[] for _ in range(2 * numVars + 1)]
+        self.occurs = bytearray(numVars + 1)
+        for index, clause in enumerate(self.clauses):
+            for lit in clause:
+                self.occurrences[lit].append(index)
+                self.occurs[abs(lit)] = 1
+        maxLength = max(map(len, self.clauses), default=3)
+        if cb is None:
+            cb = PROBSAT_CB.get(maxLength, PROBSAT_CB[7] if maxLength > 7 else PROBSAT_CB[3])
+        self.cb = cb
+        # Selection weight of each break count, extended as larger ones appear
+        self.weights = [(PROBSAT_EPSILON + b) ** -cb for b in range(64)]
+
+        numClauses = len(self.clauses)
+        self.assignment = bytearray(numVars + 1)
+        self.numTrue = array("i", bytes(4 * numClauses))
+        self.trueXor = array("i", bytes(4 * numClauses))
+        self.breakCount = array("i", bytes(4 * (numVars + 1)))
+        self.unsat: List[int] = []
+        # Position of each clause in unsat, -1 while it is satisfied
+        self.unsatPos = array("i", [-1]) * numClauses
+
+    # Takes a fresh random assignment and recomputes every counter from it
+    def _randomise(self):
+        rng = self.rng
+        assignment = self.assignment
+        for var in range(1, self.numVars + 1):
+            assignment[var] = rng.getrandbits(1)
+        numTrue = self.numTrue
+        trueXor = self.trueXor
+        breakCount = self.breakCount
+        unsatPos = self.unsatPos
+        for var in range(len(breakCount)):
+            breakCount[var] = 0
+        self.unsat = unsat = []
+        for index, clause in enumerate(self.clauses):
+            count = 0
+            xor = 0
+            for lit in clause:
+                if assignment[abs(lit)] == (lit > 0):
+                    count += 1
+                    xor ^= abs(lit)
+            numTrue[index] = count
+            trueXor[index] = xor
+            if count == 0:
+                unsatPos[index] = len(unsat)
+                unsat.append(index)
+            else:
+                unsatPos[index] = -1
+                if count == 1:
+                    breakCount[xor] += 1
+
+    """
+        Flips var, updating the counters of the clauses it occurs in.
+    """
+    def flip(self, var: int):
+        assignment = self.assignment
+        assignment[var] ^= 1
+        trueLit = var if assignment[var] else -var
+        numTrue = self.numTrue
+        trueXor = self.trueXor
+        breakCount = self.breakCount
+        unsat = self.unsat
+        unsatPos = self.unsatPos
+        for index in self.occurrences[trueLit]:
+            count = numTrue[index]
+            if count == 0:
+                # Satisfied again, by var alone
+                position = unsatPos[index]
+                last = unsat.pop()
+                if last != index:
+                    unsat[position] = last
+                    unsatPos[last] = position
+                unsatPos[index] = -1
+                breakCount[var] += 1
+            elif count == 1:
+                # The previously critical variable is no longer critical
+                breakCount[trueXor[index]] -= 1
+            numTrue[index] = count + 1
+            trueXor[index] ^= var
+        for index in self.occurrences[-trueLit]:
+            count = numTrue[index] - 1
+            numTrue[index] = count
+            xor = trueXor[index] ^ var
+            trueXor[index] = xor
+            if count == 0:
+                unsatPos[index] = len(unsat)
+                unsat.append(index)
+                breakCount[var] -= 1
+            elif count == 1:
+                breakCount[xor] += 1
+
+    # WalkSAT/SKC: a variable breaking nothing if there is one, otherwise a
+    # random variable with probability noise and one breaking the least else
+    def _pickWalkSat(self, clause: List[int]) -> int:
+        breakCount = self.breakCount
+        best = []
+        bestBreak = None
+        for lit in clause:
+            var = abs(lit)
+            count = breakCount[var]
+            if bestBreak is None or count < bestBreak:
+                best = [var]
+                bestBreak = count
+            elif count == bestBreak:
+                best.append(var)
+        rng = self.rng
+        if bestBreak > 0 and rng.random() < self.noise:
+            return abs(rng.choice(clause))
+        return best[0] if len(best) == 1 else rng.choice(best)
+
+    # ProbSAT: a variable drawn with probability proportional to the weight
+    # of its break count
+    def _pickProbSat(self, clause: List[int]) -> int:
+        breakCount = self.breakCount
+        weights = self.weights
+        scores = []
+        total = 0.0
+        for lit in clause:
+            count = breakCount[abs(lit)]
+            while count >= len(weights):
+                weights.append((PROBSAT_EPSILON + len(weights)) ** -self.cb)
+            total += weights[count]
+            scores.append(total)
+        threshold = self.rng.random() * total
+        for position, score in enumerate(scores):
+            if score > threshold:
+                return abs(clause[position])
+        return abs(clause[-1])
+
+    """
+        Searches for a model with at most maxFlips flips in total and
+        seconds of wall time (both unlimited when None), starting a new
+        random assignment every triesFlips flips if that is given.
+    """
+    def solve(self, maxFlips: int = None, seconds: float = None,
+              triesFlips: int = None) -> LocalSearchResult:
+        start = time.perf_counter()
+        result = LocalSearchResult(self.algorithm)
+        if self.hasEmpty:
+            return result
+        deadline = None if seconds is None else start + seconds
+        pick = self._pickProbSat if self.algorithm == PROBSAT else self._pickWalkSat
+        clauses = self.clauses
+        rng = self.rng
+        flip = self.flip
+        flips = 0
+        outOfBudget = False
+        while not result.isSat and not outOfBudget:
+            self._randomise()
+            result.tries += 1
+            tryFlips = 0
+            while True:
+                unsat = self.unsat
+                if result.bestUnsat is None or len(unsat) < result.bestUnsat:
+                    result.bestUnsat = len(unsat)
+                if not unsat:
+                    result.isSat = True
+                    break
+                if (maxFlips is not None and flips >= maxFlips) or \
+                        (deadline is not None and flips % TIME_CHECK_INTERVAL == 0
+                         and time.perf_counter() >= deadline):
+                    outOfBudget = True
+                    break
+                if triesFlips is not None and tryFlips >= triesFlips:
+                    break
+                flip(pick(clauses[unsat[rng.randrange(len(unsat))]]))
+                flips += 1
+                tryFlips += 1
+        result.flips = flips
+        if result.isSat:
+            assignment = self.assignment
+            result.model = [var if assignment[var] else -var
+                            for var in range(1, self.numVars + 1) if self.occurs[var]]
+        result.seconds = time.perf_counter() - start
+        return result
@@ -0,0 +1,186 @@
+import multiprocessing
+import os
+import queue
+import time
+from typing import Iterable, List, Tuple
+from arena import ClauseArena
+from search import CDCL, Solver
+
+# Parallel Portfolio:
+# Races differently configured CDCL solvers on the same clauses, one per
+# process. The first worker to finish decides the result and the others are
+# told to stop. Short learned clauses are shared between the workers through
+# a ring buffer in shared memory: each worker publishes the clauses it learns
+# in small batches and, at every restart, imports the ones published by the
+# other workers since its last visit.
+
+# Branching heuristic and restart policy of each worker, cycled through when
+# there are more workers. The first one is the default single solver.
+CONFIGURATIONS = (("vsids", "luby"), ("vsids", "glucose"), ("vsids", "geometric"),
+                  ("random", "luby"), ("jw", "glucose"), ("moms", "luby"))
+# Longest learned clause sent to the other workers
+DEFAULT_SHARE_LENGTH = 8
+# Clauses held by the ring buffer before the oldest are overwritten
+DEFAULT_CAPACITY = 4096
+# Queued clauses that make a worker publish without waiting for a restart
+FLUSH_SIZE = 32
+# Seconds the other workers get to stop before they are terminated
+GRACE_PERIOD = 1.0
+
+# Raised inside a worker once another worker has finished
+class Cancelled(Exception):
+    pass
+
+# Fixed size slots of [length, source worker, lbd, literals...] in a shared
+# array, with head counting every clause ever written. A reader that falls
+# more than capacity clauses behind skips the ones already overwritten.
+class ClauseExchange:
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, maxLength: int = DEFAULT_SHARE_LENGTH,
+                 context=None):
+        context = context or multiprocessing.get_context()
+        self.capacity = capacity
+        self.maxLength = maxLength
+        self.slotSize = maxLength + 3
+        self.slots = context.Array("i", capacity * self.slotSize, lock=False)
+        self.head = context.Value("q", 0, lock=False)
+        self.lock = context.Lock()
+        self.stop = context.Event()
+        # State of the process using the exchange, set by bind
+        self.worker = -1
+        self.position = 0
+        self.outbox: List[Tuple[List[int], int]] = []
+        self.exported = 0
+        self.imported = 0
+
+    def bind(self, worker: int):
+        self.worker = worker
+        self.position = self.head.value
+        self.outbox = []
+        self.exported = 0
+        self.imported = 0
+
+    def export(self, clause: Iterable[int], lbd: int):
+        if len(clause) <= self.maxLength:
+            self.outbox.append((list(clause), lbd))
+            if len(self.outbox) >= FLUSH_SIZE:
+                with self.lock:
+                    self._publish()
+
+    # Writes the queued clauses to the ring buffer, with the lock held
+    def _publish(self):
+        slots = self.slots
+        slotSize = self.slotSize
+        head = self.head.value
+        for clause, lbd in self.outbox:
+            base = (head % self.capacity) * slotSize
+            slots[base] = len(clause)
+            slots[base + 1] = self.worker
+            slots[base + 2] = lbd
+            slots[base + 3:base + 3 + len(clause)] = clause
+            head += 1
+        self.head.value = head
+        self.exported += len(self.outbox)
+        self.outbox = []
+
+    """
+        Publishes the queued clauses and returns the (clause, lbd) pairs
+        published by the other workers since the last call.
+    """
+    def collect(self) -> List[Tuple[List[int], int]]:
+        if self.stop.is_set():
+            raise Cancelled()
+        slots = self.slots
+        slotSize = self.slotSize
+        capacity = self.capacity
+        received = []
+        with self.lock:
+            self._publish()
+            head = self.head.value
+            # Skips this worker's own clauses
+            for position in range(max(self.position, head - capacity), head):
+                base = (position % capacity) * slotSize
+                if slots[base + 1] != self.worker:
+                    length = slots[base]
+                    received.append((slots[base + 3:base + 3 + length], slots[base + 2]))
+            self.position = head
+        self.imported += len(received)
+        return received
+
+class PortfolioResult:
+    __slots__ = ("isSat", "model", "worker", "workers", "heuristic", "restarts", "seed",
+                 "seconds", "decisions", "conflicts", "exported", "imported")
+
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            setattr(self, name, fields.get(name))
+
+    def __repr__(self):
+        return (f"portfolio: worker {self.worker} of {self.workers} ({self.heuristic}, "
+                f"{self.restarts} restarts, seed {self.seed}) finished first in {self.seconds:.3f}s "
+                f"after {self.conflicts} conflicts, sharing {self.exported} clauses out "
+                f"and {self.imported} in")
+
+def _runWorker(worker: int, workers: int, arena: ClauseArena, heuristic: str, restarts: str,
+               seed: int, options: dict, exchange: ClauseExchange, results):
+    start = time.perf_counter()
+    solver = Solver(arena, CDCL, heuristic, seed, restarts, **options)
+    exchange.bind(worker)
+    solver.exchange = exchange
+    try:
+        isSat = solver.solve()
+    except Cancelled:
+        return
+    results.put(PortfolioResult(
+        isSat=isSat, model=solver.model, worker=worker, workers=workers, heuristic=heuristic,
+        restarts=restarts, seed=seed, seconds=time.perf_counter() - start,
+        decisions=solver.decisions, conflicts=solver.conflicts,
+        exported=exchange.exported, imported=exchange.imported))
+
+"""
+    Solves the clauses with a portfolio of worker processes, one per CPU
+    unless told otherwise, and returns the result of the first to finish.
+    The heuristic and restart policy, if given, replace those of the first
+    worker; the others are taken from CONFIGURATIONS.
+"""
+def solvePortfolio(arena: ClauseArena, workers: int = None, seed: int = None,
+                   heuristic: str = None, restarts: str = None, phaseSaving: bool = True,
+                   maxLearnts: int = None, maxLearntBytes: int = None,
+                   shareLength: int = DEFAULT_SHARE_LENGTH,
+                   capacity: int = DEFAULT_CAPACITY) -> PortfolioResult:
+    workers = workers or os.cpu_count() or 1
+    context = multiprocessing.get_context()
+    exchange = ClauseExchange(capacity, shareLength, context)
+    results = context.Queue()
+    options = {"phaseSaving": phaseSaving, "maxLearnts": maxLearnts, "maxLearntBytes": maxLearntBytes}
+    processes = []
+    for worker in range(workers):
+        workerHeuristic, workerRestarts = CONFIGURATIONS[worker % len(CONFIGURATIONS)]
+        if worker == 0:
+            workerHeuristic = heuristic or workerHeuristic
+            workerRestarts = restarts or workerRestarts
+        process = context.Process(
+            target=_runWorker, daemon=True,
+            args=(worker, workers, arena, workerHeuristic, workerRestarts, (seed or 0) + worker,
+                  options, exchange, results))
+        process.start()
+        processes.append(process)
+
+    try:
+        while True:
+            try:
+                return results.get(timeout=0.1)
+            except queue.Empty:
+                if not any(process.is_alive() for process in processes):
+                    try:
+                        return results.get(timeout=0.1)
+                    except queue.Empty:
+                        raise RuntimeError("every portfolio worker exited without a result")
+    finally:
+        exchange.stop.set()
+        deadline = time.monotonic() + GRACE_PERIOD
+        for process in processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+                process.join()
@@ -0,0 +1,352 @@
+import time
+from typing import Iterable, List, Set
+from arena import ClauseArena
+from probing import Prober, equivalentLiterals, probeBudget
+from propagation import Propagator
+
+# CNF Preprocessor:
+# Simplifies a formula once before search with root level unit propagation,
+# backward subsumption, self-subsuming resolution (strengthening), merging of
+# equivalent literals, failed literal probing and bounded variable
+# elimination. Eliminated variables and the clauses they appeared in are
+# pushed onto a reconstruction stack, which extendModel replays in reverse to
+# turn a model of the simplified formula into one of the original formula. A
+# merged variable is recorded the same way, with the two binary clauses
+# making it equivalent to its representative.
+#
+# Like the propagator, literal indexed tables have 2 * numVars + 1 entries so
+# that -v wraps around to the end of the list.
+
+# Variables with more occurrences than this (in either polarity) are not
+# considered for elimination, which bounds the resolvents tried per variable
+DEFAULT_OCCURRENCE_LIMIT = 10
+# Resolvents longer than this block the elimination of a variable
+DEFAULT_RESOLVENT_LIMIT = 20
+# Clauses that a subsumption check may visit through one literal
+SUBSUMPTION_LIMIT = 1000
+
+class PreprocessStats:
+    __slots__ = ("clausesBefore", "clausesAfter", "varsBefore", "varsAfter", "units",
+                 "subsumed", "strengthened", "eliminated", "seconds")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def __repr__(self):
+        return (f"preprocess: clauses {self.clausesBefore} -> {self.clausesAfter}, "
+                f"variables {self.varsBefore} -> {self.varsAfter} "
+                f"({self.units} fixed, {self.eliminated} eliminated, {self.subsumed} subsumed, "
+                f"{self.strengthened} strengthened) in {self.seconds:.3f}s")
+
+class Preprocessor:
+    def __init__(self, arena: ClauseArena, frozen: Iterable[int] = (),
+                 occurrenceLimit: int = DEFAULT_OCCURRENCE_LIMIT,
+                 resolventLimit: int = DEFAULT_RESOLVENT_LIMIT,
+                 probeSeconds: float = None):
+        numVars = arena.numVars
+        self.numVars = numVars
+        self.occurrenceLimit = occurrenceLimit
+        self.resolventLimit = resolventLimit
+        # Time allowed for failed literal probing, by default scaled with the
+        # size of the formula; 0 skips it and merging
+        self.probeSeconds = probeBudget(len(arena.lits)) if probeSeconds is None else probeSeconds
+        # ProbeStats of the probing step, once it has run
+        self.probeStats = None
+        # Variables that must survive, e.g. because later calls assume them
+        self.frozen = bytearray(numVars + 1)
+        for var in frozen:
+            self.frozen[abs(var)] = 1
+        # Clause sets by index, None once a clause is removed
+        self.clauses: List[Set[int]] = []
+        self.occurrences = [set() for _ in range(2 * numVars + 1)]
+        # Root level value of each literal: 1 true, -1 false, 0 unknown
+        self.value = [0] * (2 * numVars + 1)
+        self.units: List[int] = []
+        self.eliminated = bytearray(numVars + 1)
+        # Variables of the original formula, which extendModel assigns,
+        # along with the frozen ones
+        self.occurred = bytearray(self.frozen)
+        # (variable, clauses it was eliminated with), in elimination order
+        self.reconstruction = []
+        # Position in self.units of the next unit to propagate
+        self.propagated = 0
+        self.ok = True
+        self.stats = PreprocessStats()
+
+        self.stats.clausesBefore = len(arena)
+        seen = set()
+        for clause in arena:
+            clause = frozenset(clause)
+            for lit in clause:
+                self.occurred[abs(lit)] = 1
+            if clause in seen or any(-lit in clause for lit in clause):
+                continue
+            seen.add(clause)
+            self._addClause(set(clause))
+        self.stats.varsBefore = self._countVars()
+
+    def _countVars(self) -> int:
+        occurrences = self.occurrences
+        return sum(1 for var in range(1, self.numVars + 1) if occurrences[var] or occurrences[-var])
+
+    def _addClause(self, clause: Set[int]) -> int:
+        if not clause:
+            self.ok = False
+            return -1
+        if len(clause) == 1:
+            self._enqueue(next(iter(clause)))
+        index = len(self.clauses)
+        self.clauses.append(clause)
+        for lit in clause:
+            self.occurrences[lit].add(index)
+        return index
+
+    def _removeClause(self, index: int):
+        for lit in self.clauses[index]:
+            self.occurrences[lit].discard(index)
+        self.clauses[index] = None
+
+    def _enqueue(self, lit: int):
+        if self.value[lit] == -1:
+            self.ok = False
+        elif self.value[lit] == 0:
+            self.value[lit] = 1
+            self.value[-lit] = -1
+            self.units.append(lit)
+
+    # Removes every clause satisfied by a unit and strips the falsified literal
+    def _propagateUnits(self):
+        while self.ok and self.propagated < len(self.units):
+            lit = self.units[self.propagated]
+            self.propagated += 1
+            for index in list(self.occurrences[lit]):
+                self._removeClause(index)
+            for index in list(self.occurrences[-lit]):
+                self._strengthen(index, -lit)
+
+    def _strengthen(self, index: int, lit: int):
+        clause = self.clauses[index]
+        clause.discard(lit)
+        self.occurrences[lit].discard(index)
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            self._enqueue(next(iter(clause)))
+
+    """
+        Uses the clause at index to remove every clause it subsumes, and to
+        strengthen every clause it can resolve against on one literal
+        without leaving anything behind.
+    """
+    def _backwardSubsume(self, index: int, queue: List[int]):
+        clause = self.clauses[index]
+        occurrences = self.occurrences
+        best = min(clause, key=lambda lit: len(occurrences[lit]) + len(occurrences[-lit]))
+        candidates = occurrences[best] | occurrences[-best]
+        if len(candidates) > SUBSUMPTION_LIMIT:
+            return
+        for other in candidates:
+            if other == index or self.clauses[other] is None or self.clauses[index] is None:
+                continue
+            target = self.clauses[other]
+            if len(target) < len(clause):
+                continue
+            flipped = 0
+            for lit in clause:
+                if lit in target:
+                    continue
+                if flipped == 0 and -lit in target:
+                    flipped = -lit
+                    continue
+                break
+            else:
+                if flipped == 0:
+                    self._removeClause(other)
+                    self.stats.subsumed += 1
+                else:
+                    self._strengthen(other, flipped)
+                    self.stats.strengthened += 1
+                    queue.append(other)
+
+    def _subsumeAll(self, queue: List[int]):
+        queue.sort(key=lambda index: len(self.clauses[index]) if self.clauses[index] else 0,
+                   reverse=True)
+        while self.ok and queue:
+            index = queue.pop()
+            if self.clauses[index] is not None:
+                self._backwardSubsume(index, queue)
+            self._propagateUnits()
+
+    # Replaces var by the literal head it is equivalent to in every clause
+    def _substitute(self, var: int, head: int, queue: List[int]):
+        for lit, replacement in ((var, head), (-var, -head)):
+            for index in list(self.occurrences[lit]):
+                clause = self.clauses[index]
+                self._removeClause(index)
+                clause.discard(lit)
+                if -replacement in clause:
+                    continue
+                clause.add(replacement)
+                index = self._addClause(clause)
+                if index >= 0:
+                    queue.append(index)
+        self.reconstruction.append((var, [[var, -head], [-var, head]]))
+        self.eliminated[var] = 1
+
+    """
+        Merges the variables that the binary clauses make equivalent into
+        the representative of their class, then probes the remaining ones
+        for failed literals and adds the units that turns up. Hyper-binary
+        resolvents are left to probing during search, as here they would
+        only make the formula bigger.
+    """
+    def _probe(self, queue: List[int]):
+        start = time.perf_counter()
+        prober = Prober()
+        self.probeStats = prober.stats
+        binaries = [tuple(clause) for clause in self.clauses if clause is not None and len(clause) == 2]
+        representative = equivalentLiterals(self.numVars, binaries)
+        if representative is None:
+            self.ok = False
+            return
+        for var in range(1, self.numVars + 1):
+            head = representative[var]
+            if head != var and not self.frozen[var] and self.value[var] == 0 and self.value[head] == 0:
+                self._substitute(var, head, queue)
+                prober.stats.merged += 1
+        self._propagateUnits()
+        if not self.ok:
+            return
+        propagator = Propagator(self.toArena())
+        prober.probe(propagator, self.probeSeconds - (time.perf_counter() - start),
+                     representative, hyperBinary=False)
+        if not propagator.ok:
+            self.ok = False
+            return
+        for lit in propagator.trail:
+            self._enqueue(lit)
+        self._subsumeAll(queue)
+
+    """
+        Eliminates var by replacing the clauses that contain it with all of
+        their non-tautological resolvents, provided that does not increase
+        the number of clauses or produce an over-long resolvent.
+    """
+    def _tryEliminate(self, var: int, queue: List[int]) -> bool:
+        positive = self.occurrences[var]
+        negative = self.occurrences[-var]
+        if len(positive) > self.occurrenceLimit or len(negative) > self.occurrenceLimit:
+            return False
+        budget = len(positive) + len(negative)
+        resolvents = []
+        for p in positive:
+            left = self.clauses[p]
+            for n in negative:
+                right = self.clauses[n]
+                resolvent = set(left)
+                resolvent.discard(var)
+                tautology = False
+                for lit in right:
+                    if lit == -var:
+                        continue
+                    if -lit in resolvent:
+                        tautology = True
+                        break
+                    resolvent.add(lit)
+                if tautology:
+                    continue
+                if len(resolvent) > self.resolventLimit or len(resolvents) >= budget:
+                    return False
+                resolvents.append(resolvent)
+
+        removed = [sorted(self.clauses[index], key=lambda lit: abs(lit) != var)
+                   for index in positive | negative]
+        for index in list(positive | negative):
+            self._removeClause(index)
+        self.reconstruction.append((var, removed))
+        self.eliminated[var] = 1
+        self.stats.eliminated += 1
+        for resolvent in resolvents:
+            index = self._addClause(resolvent)
+            if index >= 0:
+                queue.append(index)
+        return True
+
+    """
+        Runs the simplifications until nothing changes. Returns False if
+        the formula was found to be unsatisfiable.
+    """
+    def run(self, rounds: int = 3) -> bool:
+        start = time.perf_counter()
+        self._propagateUnits()
+        queue = [index for index in range(len(self.clauses)) if self.clauses[index] is not None]
+        self._subsumeAll(queue)
+        if self.ok and self.probeSeconds:
+            self._probe(queue)
+
+        for round in range(rounds):
+            if not self.ok:
+                break
+            changed = False
+            occurrences = self.occurrences
+            candidates = [var for var in range(1, self.numVars + 1)
+                          if not self.frozen[var] and not self.eliminated[var]
+                          and self.value[var] == 0 and (occurrences[var] or occurrences[-var])]
+            candidates.sort(key=lambda var: len(occurrences[var]) * len(occurrences[-var]))
+            for var in candidates:
+                if not self.ok:
+                    break
+                if self.value[var] == 0 and self._tryEliminate(var, queue):
+                    changed = True
+                    self._subsumeAll(queue)
+            self._propagateUnits()
+            if not changed:
+                break
+
+        stats = self.stats
+        stats.units = len(self.units)
+        if self.ok:
+            stats.clausesAfter = sum(1 for clause in self.clauses if clause is not None) + len(self.units)
+            stats.varsAfter = self._countVars()
+        else:
+            # Everything collapses to the empty clause
+            stats.clausesAfter = 1
+            stats.varsAfter = 0
+        stats.seconds = time.perf_counter() - start
+        return self.ok
+
+    """
+        The simplified formula, including the units found at the root.
+    """
+    def toArena(self) -> ClauseArena:
+        arena = ClauseArena(self.numVars)
+        if not self.ok:
+            arena.addClause([])
+            return arena
+        for lit in self.units:
+            arena.addClause([lit])
+        for clause in self.clauses:
+            if clause is not None:
+                arena.addClause(sorted(clause, key=abs))
+        return arena
+
+    """
+        Extends a model of the simplified formula to the original one. Any
+        variable left unassigned is set to true, as completeSolve would, and
+        eliminated variables are then given the value their clauses need.
+    """
+    def extendModel(self, model: Iterable[int]) -> List[int]:
+        value = [True] * (self.numVars + 1)
+        for lit in model:
+            value[abs(lit)] = lit > 0
+        for lit in self.units:
+            value[abs(lit)] = lit > 0
+        for var, clauses in reversed(self.reconstruction):
+            value[var] = False
+            for clause in clauses:
+                if not any(value[abs(lit)] == (lit > 0) for lit in clause):
+                    value[var] = not value[var]
+                    break
+        occurred = self.occurred
+        return [var if value[var] else -var for var in range(1, self.numVars + 1) if occurred[var]]
@@ -0,0 +1,246 @@
+import time
+from typing import Iterable, List, Set, Tuple
+from propagation import NO_REASON, UNASSIGNED, Propagator
+
+# Failed Literal Probing:
+# Tentatively assigns a literal at a fresh decision level and propagates it.
+# A conflict means the literal is failed: its negation holds in every model
+# and becomes a unit at level 0. Otherwise the literals it implied are kept;
+# any implied by both polarities of a variable is a unit as well (lifting),
+# and any implied through a clause longer than two gives the hyper-binary
+# resolvent (-probe, implied), a binary clause short-cutting that step.
+#
+# The binary clauses form an implication graph, where (a, b) gives the edges
+# -a -> b and -b -> a. The literals of one strongly connected component are
+# equivalent, so only one per component needs probing, and the preprocessor
+# replaces every variable by the representative of its component. A literal
+# in the same component as its negation makes the formula unsatisfiable.
+#
+# Probing runs against a deadline and resumes where the last round stopped,
+# so a series of short rounds between restarts covers every variable in turn.
+
+# Seconds the preprocessor spends probing at most by default, and per
+# literal of the formula, so small formulas are probed in a few milliseconds
+DEFAULT_PROBE_SECONDS = 0.1
+PROBE_SECONDS_PER_LITERAL = 1e-5
+# Seconds of each round of probing between restarts
+DEFAULT_ROUND_SECONDS = 0.05
+# Restarts before the first round between restarts, doubled after each round
+DEFAULT_PROBE_INTERVAL = 4
+# Hyper-binary resolvents learned from a single probe at most
+HYPER_BINARY_LIMIT = 16
+
+"""
+    Default time the preprocessor spends probing a formula of numLiterals
+    literals.
+"""
+def probeBudget(numLiterals: int) -> float:
+    return min(DEFAULT_PROBE_SECONDS, numLiterals * PROBE_SECONDS_PER_LITERAL)
+
+class ProbeStats:
+    __slots__ = ("rounds", "probes", "failed", "lifted", "hyperBinary", "merged", "seconds")
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def __repr__(self):
+        return (f"probe: {self.failed + self.lifted} fixed ({self.failed} failed, "
+                f"{self.lifted} lifted), {self.merged} merged, {self.hyperBinary} hyper-binary, "
+                f"{self.probes} probes in {self.rounds} rounds, {self.seconds:.3f}s")
+
+"""
+    Literal indexed table mapping each literal to the representative of its
+    strongly connected component in the implication graph of the binary
+    clauses: the literal of the smallest variable in the component, so the
+    negation of a literal always maps to the negated representative.
+    Returns None if a literal is equivalent to its negation.
+"""
+def equivalentLiterals(numVars: int, binaries: Iterable[Tuple[int, int]]) -> List[int]:
+    size = 2 * numVars + 1
+    graph = [[] for _ in range(size)]
+    for a, b in binaries:
+        graph[-a].append(b)
+        graph[-b].append(a)
+    representative = list(range(numVars + 1)) + list(range(-numVars, 0))
+    # Tarjan's algorithm on an explicit stack of (literal, next edge)
+    index = [0] * size
+    low = [0] * size
+    onStack = bytearray(size)
+    stack = []
+    counter = 1
+    for root in range(-numVars, numVars + 1):
+        if root == 0 or index[root] or not graph[root]:
+            continue
+        work = [(root, 0)]
+        while work:
+            node, edge = work[-1]
+            if edge == 0 and not index[node]:
+                index[node] = low[node] = counter
+                counter += 1
+                stack.append(node)
+                onStack[node] = 1
+            edges = graph[node]
+            if edge < len(edges):
+                work[-1] = (node, edge + 1)
+                successor = edges[edge]
+                if not index[successor]:
+                    work.append((successor, 0))
+                elif onStack[successor] and index[successor] < low[node]:
+                    low[node] = index[successor]
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                if low[node] < low[parent]:
+                    low[parent] = low[node]
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    lit = stack.pop()
+                    onStack[lit] = 0
+                    component.append(lit)
+                    if lit == node:
+                        break
+                if len(component) > 1:
+                    head = min(component, key=abs)
+                    if -head in component:
+                        return None
+                    for lit in component:
+                        representative[lit] = head
+    return representative
+
+"""
+    The binary clauses of propagator as pairs of literals.
+"""
+def binaryClauses(propagator: Propagator) -> List[Tuple[int, int]]:
+    lits = propagator.clauses.lits
+    offsets = propagator.clauses.offsets
+    return [(lits[offsets[i]], lits[offsets[i] + 1]) for i in range(len(propagator.clauses))
+            if offsets[i + 1] - offsets[i] == 2]
+
+class Prober:
+    def __init__(self, seconds: float = DEFAULT_ROUND_SECONDS,
+                 interval: int = DEFAULT_PROBE_INTERVAL):
+        self.seconds = seconds
+        self.interval = interval
+        self.nextRestart = interval
+        # Variable the next round starts from
+        self.position = 1
+        self.stats = ProbeStats()
+
+    """
+        Whether a round of probing is due after this many restarts. The
+        rounds get further apart as the search goes on.
+    """
+    def due(self, restarts: int) -> bool:
+        if restarts < self.nextRestart:
+            return False
+        self.interval *= 2
+        self.nextRestart = restarts + self.interval
+        return True
+
+    # Assigns lit at level 0 and propagates it, False on a conflict
+    @staticmethod
+    def _fix(propagator: Propagator, lit: int) -> bool:
+        value = propagator.value[lit]
+        if value == UNASSIGNED:
+            propagator.assign(lit, NO_REASON)
+            if propagator.propagate() != NO_REASON:
+                propagator.ok = False
+        elif value != 1:
+            propagator.ok = False
+        return propagator.ok
+
+    """
+        Propagates lit on a level of its own and takes the level back.
+        Returns the implied literals, or None if lit failed, and adds the
+        hyper-binary resolvents found to resolvents unless it is None.
+    """
+    def _probeLiteral(self, propagator: Propagator, lit: int, resolvents: Set[Tuple[int, int]]):
+        self.stats.probes += 1
+        trail = propagator.trail
+        start = len(trail)
+        propagator.newDecisionLevel()
+        propagator.assign(lit, NO_REASON)
+        implied = None
+        if propagator.propagate() == NO_REASON:
+            implied = trail[start + 1:]
+        if implied is not None and resolvents is not None:
+            offsets = propagator.clauses.offsets
+            reason = propagator.reason
+            found = 0
+            for other in implied:
+                ci = reason[abs(other)]
+                if offsets[ci + 1] - offsets[ci] > 2 and found < HYPER_BINARY_LIMIT:
+                    resolvents.add((-lit, other))
+                    found += 1
+        # The propagator's own cancelUntil, which leaves the heuristic,
+        # saved phases and counters of a search untouched
+        Propagator.cancelUntil(propagator, 0)
+        return implied
+
+    """
+        Probes the variables of the binary clauses at level 0 until they
+        are all done or seconds (by default the round length) have passed.
+        Units found are assigned on propagator, which is left with ok False
+        if the formula turns out unsatisfiable. Returns the hyper-binary
+        resolvents, for the caller to add as it sees fit, unless
+        hyperBinary is False. A caller that has just computed the
+        equivalentLiterals of the binary clauses may pass them as
+        representative.
+    """
+    def probe(self, propagator: Propagator, seconds: float = None,
+              representative: List[int] = None, hyperBinary: bool = True) -> List[List[int]]:
+        start = time.perf_counter()
+        deadline = start + (self.seconds if seconds is None else seconds)
+        if not propagator.ok:
+            return []
+        stats = self.stats
+        stats.rounds += 1
+        resolvents: Set[Tuple[int, int]] = set() if hyperBinary else None
+        if propagator.trailLim:
+            Propagator.cancelUntil(propagator, 0)
+        if propagator.propagate() != NO_REASON:
+            propagator.ok = False
+        binaries = binaryClauses(propagator)
+        if representative is None:
+            representative = equivalentLiterals(propagator.numVars, binaries)
+        if representative is None:
+            propagator.ok = False
+        value = propagator.value
+        candidates = sorted({abs(lit) for clause in binaries for lit in clause})
+        # Resume after the variable the last round got to
+        split = next((i for i, var in enumerate(candidates) if var >= self.position), 0)
+        candidates = candidates[split:] + candidates[:split]
+        for var in candidates:
+            if not propagator.ok:
+                break
+            if time.perf_counter() >= deadline:
+                self.position = var
+                break
+            if value[var] != UNASSIGNED or representative[var] != var:
+                continue
+            positive = self._probeLiteral(propagator, var, resolvents)
+            if positive is None:
+                stats.failed += 1
+                self._fix(propagator, -var)
+                continue
+            negative = self._probeLiteral(propagator, -var, resolvents)
+            if negative is None:
+                stats.failed += 1
+                self._fix(propagator, var)
+                continue
+            for lit in set(positive).intersection(negative):
+                if value[lit] == UNASSIGNED:
+                    stats.lifted += 1
+                    if not self._fix(propagator, lit):
+                        break
+        else:
+            self.position = 1
+        # Resolvents touched by a unit found later are implied at level 0
+        learned = [list(clause) for clause in resolvents or ()
+                   if value[clause[0]] == UNASSIGNED and value[clause[1]] == UNASSIGNED]
+        stats.hyperBinary += len(learned)
+        stats.seconds += time.perf_counter() - start
+        return learned
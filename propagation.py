@@ -0,0 +1,204 @@
+from typing import Iterable, List
+from arena import ClauseArena
+
+# Unit Propagation Engine:
+# Each clause of two or more literals watches its first two literals. When a
+# literal becomes false only the clauses watching it are visited, either
+# finding a new literal to watch or, if none is left, forcing the other
+# watched literal (a unit) or reporting the clause as a conflict.
+#
+# Literal indexed tables (value, watches) have 2 * numVars + 1 entries so that
+# a literal can index them directly: +v lands on v and -v wraps around to the
+# end of the list through Python's negative indexing.
+
+# Values of a literal in the value table
+TRUE = 1
+FALSE = -1
+UNASSIGNED = 0
+
+# Reason of a variable that was decided (or assumed) rather than implied
+NO_REASON = -1
+
+class Propagator:
+    def __init__(self, arena: ClauseArena):
+        numVars = arena.numVars
+        self.numVars = numVars
+        self.value = [UNASSIGNED] * (2 * numVars + 1)
+        self.level = [0] * (numVars + 1)
+        self.reason = [NO_REASON] * (numVars + 1)
+        self.watches = [[] for _ in range(2 * numVars + 1)]
+        # Assigned literals in order, with trailLim[d] the trail position of
+        # the decision that opened level d + 1
+        self.trail = []
+        self.trailLim = []
+        # Trail position of the next literal to propagate
+        self.qhead = 0
+        # Literals taken off the trail and propagated, over all calls
+        self.propagations = 0
+        # Clauses of two or more literals, with the watched literals first
+        self.clauses = ClauseArena(numVars)
+        # Variables that occur in at least one clause
+        self.occurs = bytearray(numVars + 1)
+        # False once the clauses are known to be unsatisfiable
+        self.ok = True
+        # Not self.addClause, which subclasses extend for later additions
+        for clause in arena:
+            Propagator.addClause(self, clause)
+
+    """
+        Makes room for variables up to numVars in every variable and
+        literal indexed table.
+    """
+    def growVariables(self, numVars: int):
+        old = self.numVars
+        if numVars <= old:
+            return
+        extra = numVars - old
+        # The negative literals sit at the end of the literal indexed tables,
+        # so the new entries go in between the two halves
+        self.value[old + 1:old + 1] = [UNASSIGNED] * (2 * extra)
+        self.watches[old + 1:old + 1] = [[] for _ in range(2 * extra)]
+        self.level.extend([0] * extra)
+        self.reason.extend([NO_REASON] * extra)
+        self.occurs.extend(bytes(extra))
+        self.numVars = numVars
+        self.clauses.numVars = max(self.clauses.numVars, numVars)
+
+    def decisionLevel(self) -> int:
+        return len(self.trailLim)
+
+    def litValue(self, lit: int) -> int:
+        return self.value[lit]
+
+    """
+        Adds a clause at decision level 0, dropping duplicate literals and
+        tautologies. Empty clauses make the formula unsatisfiable and unit
+        clauses are assigned straight away.
+    """
+    def addClause(self, lits: Iterable[int]) -> bool:
+        clause = list(dict.fromkeys(lits))
+        for lit in clause:
+            self.occurs[abs(lit)] = 1
+            if -lit in clause:
+                return self.ok
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            lit = clause[0]
+            if self.value[lit] == FALSE:
+                self.ok = False
+            elif self.value[lit] == UNASSIGNED:
+                self.assign(lit, NO_REASON)
+        else:
+            self.attachClause(clause)
+        return self.ok
+
+    """
+        Stores a clause of two or more literals and watches its first two.
+    """
+    def attachClause(self, clause: List[int]) -> int:
+        position = self.clauses.addClause(clause)
+        self.watches[clause[0]].append(position)
+        self.watches[clause[1]].append(position)
+        return position
+
+    def assign(self, lit: int, reason: int):
+        self.value[lit] = TRUE
+        self.value[-lit] = FALSE
+        var = abs(lit)
+        self.level[var] = len(self.trailLim)
+        self.reason[var] = reason
+        self.trail.append(lit)
+
+    def newDecisionLevel(self):
+        self.trailLim.append(len(self.trail))
+
+    """
+        Undoes every assignment made above the given decision level.
+    """
+    def cancelUntil(self, level: int):
+        if len(self.trailLim) <= level:
+            return
+        value = self.value
+        reason = self.reason
+        start = self.trailLim[level]
+        trail = self.trail
+        for i in range(start, len(trail)):
+            lit = trail[i]
+            value[lit] = UNASSIGNED
+            value[-lit] = UNASSIGNED
+            reason[abs(lit)] = NO_REASON
+        del trail[start:]
+        del self.trailLim[level:]
+        self.qhead = start
+
+    """
+        Propagates every pending assignment on the trail to fixpoint.
+        Returns the position of a conflicting clause, or NO_REASON if there is none.
+    """
+    def propagate(self) -> int:
+        lits = self.clauses.lits
+        offsets = self.clauses.offsets
+        value = self.value
+        watches = self.watches
+        level = self.level
+        reason = self.reason
+        trail = self.trail
+        currentLevel = len(self.trailLim)
+        head = self.qhead
+
+        while self.qhead < len(trail):
+            falseLit = -trail[self.qhead]
+            self.qhead += 1
+            watchList = watches[falseLit]
+            i = j = 0
+            end = len(watchList)
+            while i < end:
+                ci = watchList[i]
+                i += 1
+                start = offsets[ci]
+                # Keep the falsified watch in the second slot
+                other = lits[start]
+                if other == falseLit:
+                    other = lits[start + 1]
+                    lits[start] = other
+                    lits[start + 1] = falseLit
+                # Clause already satisfied by the other watch
+                if value[other] == TRUE:
+                    watchList[j] = ci
+                    j += 1
+                    continue
+                # Look for a replacement watch that is not false
+                k = start + 2
+                stop = offsets[ci + 1]
+                while k < stop:
+                    lit = lits[k]
+                    if value[lit] != FALSE:
+                        lits[start + 1] = lit
+                        lits[k] = falseLit
+                        watches[lit].append(ci)
+                        break
+                    k += 1
+                else:
+                    watchList[j] = ci
+                    j += 1
+                    if value[other] == FALSE:
+                        # Conflict: keep the remaining watches and stop
+                        while i < end:
+                            watchList[j] = watchList[i]
+                            j += 1
+                            i += 1
+                        del watchList[j:]
+                        self.propagations += self.qhead - head
+                        self.qhead = len(trail)
+                        return ci
+                    # Unit: the other watch is forced
+                    value[other] = TRUE
+                    value[-other] = FALSE
+                    var = other if other > 0 else -other
+                    level[var] = currentLevel
+                    reason[var] = ci
+                    trail.append(other)
+            del watchList[j:]
+        self.propagations += self.qhead - head
+        return NO_REASON
@@ -0,0 +1,112 @@
+from array import array
+from typing import List
+
+# Incremental Pure Literal Detection:
+# For every literal, the number of original clauses containing it that are
+# not yet satisfied, with per-literal occurrence lists and a count of true
+# literals per clause. The counts follow the solver's trail lazily, like the
+# propagation queue: update walks the literals assigned since the last call,
+# and undo walks them back when the search backtracks. A clause's
+# occurrences are only touched when its first literal becomes true or its
+# last true literal is unassigned, so each assignment costs the size of the
+# clauses it newly satisfies.
+#
+# When the count of a literal drops to zero its negation may have become
+# pure, and is pushed as a candidate; candidates are checked when popped, so
+# finding a pure literal is O(1) amortised rather than a scan of the formula.
+
+class PureLiteralTracker:
+    def __init__(self, solver):
+        numVars = solver.numVars
+        self.value = solver.value
+        self.trail = solver.trail
+        clauses = solver.clauses
+        lits = clauses.lits
+        offsets = clauses.offsets
+        self.lits = lits
+        self.offsets = offsets
+        # Unsatisfied original clauses containing each literal
+        self.count = array("i", bytes(4 * (2 * numVars + 1)))
+        self.occurrences: List[List[int]] = [[] for _ in range(2 * numVars + 1)]
+        for index in range(solver.numOriginal):
+            for k in range(offsets[index], offsets[index + 1]):
+                lit = lits[k]
+                self.count[lit] += 1
+                self.occurrences[lit].append(index)
+        # True literals of each original clause
+        self.numTrue = array("i", bytes(4 * solver.numOriginal))
+        # Trail position up to which assignments have been counted
+        self.head = 0
+        self.candidates: List[int] = []
+        for var in range(1, numVars + 1):
+            self._offer(var)
+            self._offer(-var)
+        self.update()
+
+    # Queues lit if it looks pure right now
+    def _offer(self, lit: int):
+        if self.count[-lit] == 0 and self.count[lit] > 0:
+            self.candidates.append(lit)
+
+    """
+        Counts the assignments made since the last call.
+    """
+    def update(self):
+        trail = self.trail
+        count = self.count
+        numTrue = self.numTrue
+        lits = self.lits
+        offsets = self.offsets
+        candidates = self.candidates
+        for i in range(self.head, len(trail)):
+            for index in self.occurrences[trail[i]]:
+                numTrue[index] += 1
+                if numTrue[index] == 1:
+                    # Newly satisfied: its literals no longer need a value
+                    for k in range(offsets[index], offsets[index + 1]):
+                        lit = lits[k]
+                        count[lit] -= 1
+                        if count[lit] == 0 and count[-lit] > 0:
+                            candidates.append(-lit)
+        self.head = len(trail)
+
+    """
+        Uncounts the assignments from trail position start on, before the
+        solver unassigns them.
+    """
+    def undo(self, start: int):
+        trail = self.trail
+        count = self.count
+        numTrue = self.numTrue
+        lits = self.lits
+        offsets = self.offsets
+        candidates = self.candidates
+        for i in range(self.head - 1, start - 1, -1):
+            lit = trail[i]
+            for index in self.occurrences[lit]:
+                numTrue[index] -= 1
+                if numTrue[index] == 0:
+                    for k in range(offsets[index], offsets[index + 1]):
+                        other = lits[k]
+                        count[other] += 1
+                        if count[other] == 1 and count[-other] == 0:
+                            candidates.append(other)
+            # The variable is free again and may be pure as it stands
+            self._offer(lit)
+            self._offer(-lit)
+        self.head = min(self.head, start)
+
+    """
+        An unassigned literal whose negation occurs in no unsatisfied
+        clause, or 0 if there is none.
+    """
+    def pick(self) -> int:
+        self.update()
+        value = self.value
+        count = self.count
+        candidates = self.candidates
+        while candidates:
+            lit = candidates.pop()
+            if value[lit] == 0 and count[-lit] == 0 and count[lit] > 0:
+                return lit
+        return 0
@@ -0,0 +1,137 @@
+from collections import deque
+
+# Restart Policies:
+# After every conflict the solver reports the LBD (number of distinct decision
+# levels) of the learned clause and the current trail size, then asks the
+# policy before each decision whether to restart. A restart only cancels the
+# trail back to level 0; learned clauses, activities and saved phases are kept.
+
+class RestartPolicy:
+    name = None
+
+    def onConflict(self, lbd: int, trailSize: int):
+        pass
+
+    def shouldRestart(self) -> bool:
+        return False
+
+    def onRestart(self):
+        pass
+
+class NoRestarts(RestartPolicy):
+    name = "none"
+
+"""
+    The i-th element (from 1) of the Luby sequence 1 1 2 1 1 2 4 1 1 2 ...
+"""
+def luby(i: int) -> int:
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while i != (1 << k) - 1:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+# Restart after unit * luby(i) conflicts in the i-th run
+class LubyRestarts(RestartPolicy):
+    name = "luby"
+
+    def __init__(self, unit: int = 100):
+        self.unit = unit
+        self.run = 1
+        self.conflicts = 0
+        self.limit = unit * luby(1)
+
+    def onConflict(self, lbd: int, trailSize: int):
+        self.conflicts += 1
+
+    def shouldRestart(self) -> bool:
+        return self.conflicts >= self.limit
+
+    def onRestart(self):
+        self.run += 1
+        self.conflicts = 0
+        self.limit = self.unit * luby(self.run)
+
+# Restart after first, first * factor, first * factor^2, ... conflicts
+class GeometricRestarts(RestartPolicy):
+    name = "geometric"
+
+    def __init__(self, first: int = 100, factor: float = 1.5):
+        self.factor = factor
+        self.conflicts = 0
+        self.limit = float(first)
+
+    def onConflict(self, lbd: int, trailSize: int):
+        self.conflicts += 1
+
+    def shouldRestart(self) -> bool:
+        return self.conflicts >= self.limit
+
+    def onRestart(self):
+        self.conflicts = 0
+        self.limit *= self.factor
+
+# Glucose style dynamic restarts: restart while the LBDs of the recent learned
+# clauses are worse than the long run average, and postpone restarting when the
+# trail is much larger than usual, since the solver may be close to a model.
+class GlucoseRestarts(RestartPolicy):
+    name = "glucose"
+
+    def __init__(self, margin: float = 0.8, blockMargin: float = 1.4, lbdWindow: int = 50,
+                 trailWindow: int = 5000, blockAfter: int = 10000):
+        self.margin = margin
+        self.blockMargin = blockMargin
+        self.blockAfter = blockAfter
+        self.recentLbd = deque(maxlen=lbdWindow)
+        self.recentLbdSum = 0
+        self.recentTrail = deque(maxlen=trailWindow)
+        self.recentTrailSum = 0
+        self.totalLbd = 0
+        self.conflicts = 0
+        self.blocked = 0
+
+    def onConflict(self, lbd: int, trailSize: int):
+        self.conflicts += 1
+        self.totalLbd += lbd
+
+        if len(self.recentTrail) == self.recentTrail.maxlen:
+            self.recentTrailSum -= self.recentTrail[0]
+        self.recentTrail.append(trailSize)
+        self.recentTrailSum += trailSize
+
+        if (self.conflicts > self.blockAfter and len(self.recentLbd) == self.recentLbd.maxlen
+                and len(self.recentTrail) == self.recentTrail.maxlen
+                and trailSize > self.blockMargin * self.recentTrailSum / len(self.recentTrail)):
+            self.recentLbd.clear()
+            self.recentLbdSum = 0
+            self.blocked += 1
+
+        if len(self.recentLbd) == self.recentLbd.maxlen:
+            self.recentLbdSum -= self.recentLbd[0]
+        self.recentLbd.append(lbd)
+        self.recentLbdSum += lbd
+
+    def shouldRestart(self) -> bool:
+        if len(self.recentLbd) < self.recentLbd.maxlen:
+            return False
+        recentAverage = self.recentLbdSum / len(self.recentLbd)
+        return recentAverage * self.margin > self.totalLbd / self.conflicts
+
+    def onRestart(self):
+        self.recentLbd.clear()
+        self.recentLbdSum = 0
+
+RESTART_POLICIES = {policy.name: policy for policy in
+                    (LubyRestarts, GeometricRestarts, GlucoseRestarts, NoRestarts)}
+
+"""
+    Builds a restart policy from its name.
+"""
+def makeRestartPolicy(name: str) -> RestartPolicy:
+    if name not in RESTART_POLICIES:
+        raise ValueError(f"unknown restart policy {name!r}, expected one of {tuple(RESTART_POLICIES)}")
+    return RESTART_POLICIES[name]()
@@ -0,0 +1,155 @@
+import hashlib
+import os
+import sqlite3
+import time
+from array import array
+from typing import List, Optional, Tuple
+from arena import ClauseArena
+from verify import unsatisfiedClauses
+
+# Persistent Result Cache:
+# Remembers the answer for every formula solved, keyed by a fingerprint that
+# ignores the order of the clauses, the order of the literals in a clause and
+# repeated clauses or literals: the SHA-256 of the distinct clauses, each
+# sorted, in sorted order. The entries live in an SQLite database, which
+# serialises concurrent writers from several solver processes with its own
+# file locking, and hold the status and the model. Entries are evicted least
+# recently used first once the total size of the stored models exceeds the
+# cap. Hit and miss counts are kept in the database too, so the rates cover
+# every process sharing it.
+#
+# A cached model is checked against the formula before it is returned; one
+# that does not satisfy it is dropped and counts as a miss. Unsatisfiable
+# answers cannot be checked cheaply and are trusted.
+
+DEFAULT_PATH = os.path.join(os.path.expanduser("~"), ".cache", "sat-solver", "results.sqlite")
+DEFAULT_MAX_BYTES = 256 << 20
+# Seconds a process waits for another one holding the database lock
+LOCK_TIMEOUT = 30.0
+# Fixed bytes charged to every entry besides its model
+ENTRY_OVERHEAD = 128
+
+SAT = "SAT"
+UNSAT = "UNSAT"
+
+"""
+    Hex digest identifying a formula up to clause order, literal order and
+    duplicate clauses or literals.
+"""
+def fingerprint(arena: ClauseArena) -> str:
+    clauses = sorted({tuple(sorted(set(clause))) for clause in arena})
+    flat = array("i")
+    for clause in clauses:
+        flat.extend(clause)
+        flat.append(0)
+    return hashlib.sha256(flat.tobytes()).hexdigest()
+
+class ResultCache:
+    def __init__(self, path: str = DEFAULT_PATH, maxBytes: int = DEFAULT_MAX_BYTES):
+        self.path = path
+        self.maxBytes = maxBytes
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        # Autocommit, with explicit immediate transactions around updates
+        self.connection = sqlite3.connect(path, timeout=LOCK_TIMEOUT, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS results (fingerprint TEXT PRIMARY KEY, status TEXT NOT NULL, "
+            "model BLOB, size INTEGER NOT NULL, used REAL NOT NULL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS resultsUsed ON results (used)")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        # Counts of this process only
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception):
+        self.close()
+
+    def _count(self, name: str):
+        self.connection.execute(
+            "INSERT INTO counters VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET value = value + 1",
+            (name,))
+
+    """
+        The cached (isSat, model) of arena, or None on a miss. The model is
+        a list of literals and has been checked against arena.
+    """
+    def lookup(self, arena: ClauseArena, key: str = None) -> Optional[Tuple[bool, List[int]]]:
+        key = key or fingerprint(arena)
+        row = self.connection.execute(
+            "SELECT status, model FROM results WHERE fingerprint = ?", (key,)).fetchone()
+        result = None
+        if row is not None:
+            status, blob = row
+            model = list(array("i", blob)) if blob is not None else None
+            if status == UNSAT:
+                result = (False, None)
+            elif model is not None and not unsatisfiedClauses(arena, model):
+                result = (True, model)
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            if result is not None:
+                self.connection.execute("UPDATE results SET used = ? WHERE fingerprint = ?",
+                                        (time.time(), key))
+                self._count("hits")
+            else:
+                if row is not None:
+                    # A model that no longer checks out is worse than none
+                    self.connection.execute("DELETE FROM results WHERE fingerprint = ?", (key,))
+                self._count("misses")
+        if result is not None:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return result
+
+    """
+        Records the answer for arena, then evicts the least recently used
+        entries until the cache fits its size cap again.
+    """
+    def store(self, arena: ClauseArena, isSat: bool, model: List[int] = None, key: str = None):
+        key = key or fingerprint(arena)
+        blob = array("i", model).tobytes() if isSat else None
+        size = ENTRY_OVERHEAD + (len(blob) if blob is not None else 0)
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            self.connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?)",
+                (key, SAT if isSat else UNSAT, blob, size, time.time()))
+            total = self.connection.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total > self.maxBytes:
+                rows = self.connection.execute(
+                    "SELECT fingerprint, size FROM results ORDER BY used").fetchall()
+                evicted = []
+                for oldKey, oldSize in rows:
+                    if total <= self.maxBytes:
+                        break
+                    evicted.append((oldKey,))
+                    total -= oldSize
+                self.connection.executemany("DELETE FROM results WHERE fingerprint = ?", evicted)
+
+    """
+        Number of entries, their total size in bytes, and the hits and
+        misses of every process that used the cache.
+    """
+    def statistics(self) -> dict:
+        entries, size = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        counters = dict(self.connection.execute("SELECT name, value FROM counters").fetchall())
+        return {"entries": entries, "bytes": size, "hits": counters.get("hits", 0),
+                "misses": counters.get("misses", 0)}
+
+    def __repr__(self):
+        stats = self.statistics()
+        lookups = stats["hits"] + stats["misses"]
+        rate = 100.0 * stats["hits"] / lookups if lookups else 0.0
+        return (f"result cache: {'hit' if self.hits else 'miss' if self.misses else 'unused'}, "
+                f"{stats['hits']} hits {stats['misses']} misses overall ({rate:.1f}% hit rate), "
+                f"{stats['entries']} entries, {stats['bytes']} bytes")
@@ -0,0 +1,592 @@
+from typing import Iterable, List
+from arena import ClauseArena
+from clausedb import ClauseDatabase
+from gauss import GaussEngine
+from heuristics import makeHeuristic
+from propagation import FALSE, NO_REASON, TRUE, Propagator
+from purity import PureLiteralTracker
+from restarts import makeRestartPolicy
+
+# Search modes: plain DPLL with chronological backtracking, or conflict driven
+# clause learning with non-chronological backjumping
+DPLL = "dpll"
+CDCL = "cdcl"
+MODES = (CDCL, DPLL)
+
+# Branching heuristic used by each mode unless another one is asked for
+DEFAULT_HEURISTIC = {CDCL: "vsids", DPLL: "jw"}
+# Restart policy used by CDCL unless another one is asked for; DPLL never
+# restarts since it does not learn the clauses that keep restarting complete
+DEFAULT_RESTARTS = "luby"
+
+# Iterative Search:
+# All branching happens in place on the propagator's assignment trail. Each
+# decision opens a new decision level, and backtracking cancels the trail back
+# to a level marker, so no clause or solution set is ever copied and the depth
+# of the search is bounded by the number of variables rather than the
+# recursion limit.
+class Solver(Propagator):
+    def __init__(self, arena: ClauseArena = None, mode: str = CDCL, heuristic: str = None,
+                 seed: int = None, restarts: str = DEFAULT_RESTARTS, phaseSaving: bool = True,
+                 maxLearnts: int = None, maxLearntBytes: int = None, pureLiterals: bool = None):
+        if mode not in MODES:
+            raise ValueError(f"unknown search mode {mode!r}, expected one of {MODES}")
+        super().__init__(arena if arena is not None else ClauseArena())
+        self.mode = mode
+        # The satisfying assignment (list of literals) found by the last solve
+        self.model = None
+        # Assumptions of the current solve, each decided on its own level
+        self.assumptions: List[int] = []
+        # Subset of the assumptions that the last unsatisfiable solve refuted
+        self.failedAssumptions: List[int] = []
+        # Clauses added after learning started, waiting to join the originals
+        self.pendingClauses: List[List[int]] = []
+        # Clauses at positions from here on in self.clauses were learned
+        self.numOriginal = len(self.clauses)
+        # Scratch marks used by conflict analysis
+        self.seen = bytearray(self.numVars + 1)
+        self.decisions = 0
+        self.conflicts = 0
+        self.restarts = 0
+        self.backtracks = 0
+        self.pureAssignments = 0
+        # Whether pure literals are set before branching, by default only in
+        # DPLL, whose chronological backtracking gains the most from them
+        self.pureLiterals = mode == DPLL if pureLiterals is None else pureLiterals
+        # Occurrence counts of the current solve when pureLiterals is set
+        self.purity = None
+        # Preferred polarity of each variable when it is branched on, with
+        # phase saving this is the value it had when it was last unassigned
+        self.polarity = bytearray(b"\x01") * (self.numVars + 1)
+        self.phaseSaving = phaseSaving
+        self.heuristic = makeHeuristic(heuristic or DEFAULT_HEURISTIC[mode], seed)
+        self.heuristic.attach(self)
+        self.restartPolicy = makeRestartPolicy(restarts if mode == CDCL else "none")
+        self.clauseDb = ClauseDatabase(maxLearnts=maxLearnts, maxBytes=maxLearntBytes)
+        # Optional channel to other solvers working on the same clauses: it
+        # is offered every learned clause and collects theirs at restarts
+        self.exchange = None
+        # Optional Budget limiting each call to solve
+        self.budget = None
+        # Optional Prober run at level 0 between restarts when it is due
+        self.prober = None
+        # XOR constraints on top of the clauses, as lists of literals an odd
+        # number of which must be true, and the engine built from them
+        self.xors: List[List[int]] = []
+        self.gauss = None
+
+    """
+        Select an unassigned variable of the formula to branch on,
+        returning 0 once every variable is assigned.
+    """
+    def pickBranchLit(self) -> int:
+        return self.heuristic.pick()
+
+    def cancelUntil(self, level: int):
+        if len(self.trailLim) > level:
+            self.backtracks += 1
+            start = self.trailLim[level]
+            if self.phaseSaving:
+                polarity = self.polarity
+                trail = self.trail
+                for i in range(start, len(trail)):
+                    lit = trail[i]
+                    if lit > 0:
+                        polarity[lit] = 1
+                    else:
+                        polarity[-lit] = 0
+            self.heuristic.onBacktrack(self.trail, start)
+            if self.purity is not None:
+                self.purity.undo(start)
+            if self.gauss is not None:
+                self.gauss.undo(start)
+            super().cancelUntil(level)
+
+    def growVariables(self, numVars: int):
+        extra = numVars - self.numVars
+        if extra <= 0:
+            return
+        super().growVariables(numVars)
+        self.seen.extend(bytes(extra))
+        self.polarity.extend(b"\x01" * extra)
+        self.heuristic.grow(numVars)
+
+    """
+        Adds a clause between calls to solve. Literals already false at
+        level 0 are dropped and clauses already satisfied there are skipped.
+        Learned clauses, activities and saved phases are all kept.
+    """
+    def addClause(self, lits: Iterable[int]) -> bool:
+        clause = list(dict.fromkeys(lits))
+        if not clause:
+            self.ok = False
+            return False
+        self.cancelUntil(0)
+        self.growVariables(max(abs(lit) for lit in clause))
+        value = self.value
+        simplified = []
+        for lit in clause:
+            if value[lit] == TRUE or -lit in clause:
+                return self.ok
+            if value[lit] != FALSE:
+                simplified.append(lit)
+        occurs = self.occurs
+        for lit in clause:
+            var = abs(lit)
+            if not occurs[var]:
+                occurs[var] = 1
+                self.heuristic.addVariable(var)
+        if len(simplified) < 2:
+            super().addClause(simplified)
+        elif len(self.clauses) == self.numOriginal:
+            self.attachClause(simplified)
+            self.numOriginal += 1
+        else:
+            # Original clauses must stay in front of the learned ones, so
+            # these are moved in all at once when the next solve starts
+            self.pendingClauses.append(simplified)
+        return self.ok
+
+    """
+        Adds a clause implied by the clauses of the solver, such as one
+        learned by another solver on the same formula, at level 0. It is
+        stored as a learned clause, so later reductions may delete it.
+    """
+    def addLearntClause(self, lits: Iterable[int], lbd: int) -> bool:
+        self.cancelUntil(0)
+        value = self.value
+        clause = []
+        for lit in lits:
+            if value[lit] == TRUE:
+                return self.ok
+            if value[lit] != FALSE:
+                clause.append(lit)
+        if len(clause) < 2:
+            return Propagator.addClause(self, clause)
+        self.attachClause(clause)
+        self.clauseDb.onLearnt(len(clause), min(lbd, len(clause)))
+        return True
+
+    """
+        Adds XOR constraints, each a list of literals an odd number of
+        which must be true, to be solved by Gaussian elimination alongside
+        the clauses. Only CDCL can learn from the clauses the elimination
+        derives, and pure literals are not pure with respect to an XOR.
+    """
+    def addXors(self, xors: Iterable[Iterable[int]]):
+        if self.mode != CDCL:
+            raise ValueError("XOR constraints need the cdcl search mode")
+        if self.pureLiterals:
+            raise ValueError("XOR constraints cannot be combined with pure literals")
+        self.cancelUntil(0)
+        self.xors.extend(list(lits) for lits in xors)
+        # Rebuilt with every XOR when the next solve starts
+        self.gauss = None
+
+    def _flushPendingClauses(self):
+        if not self.pendingClauses:
+            return
+        clauses = self.clauses
+        numOriginal = self.numOriginal
+        numPending = len(self.pendingClauses)
+        merged = ClauseArena(self.numVars)
+        offsets = clauses.offsets
+        merged.lits.extend(clauses.lits[:offsets[numOriginal]])
+        merged.offsets = offsets[:numOriginal + 1]
+        for clause in self.pendingClauses:
+            merged.addClause(clause)
+        shift = merged.offsets[-1] - offsets[numOriginal]
+        merged.lits.extend(clauses.lits[offsets[numOriginal]:])
+        merged.offsets.extend(offset + shift for offset in offsets[numOriginal + 1:])
+        self.clauses = merged
+        self.numOriginal = numOriginal + numPending
+        self.pendingClauses = []
+        self._rebuildWatches()
+        reason = self.reason
+        for lit in self.trail:
+            var = abs(lit)
+            if reason[var] >= numOriginal:
+                reason[var] += numPending
+
+    """
+        Determines whether the clauses are satisfiable with every literal in
+        assumptions true, storing the assignment in self.model if they are.
+        When they are not because of the assumptions, failedAssumptions
+        holds the assumptions that together cannot be satisfied and the
+        solver stays usable; otherwise the clauses themselves are
+        unsatisfiable, failedAssumptions is empty and ok is False. A refuted
+        set of assumptions says nothing about the clauses on their own,
+        which may or may not be satisfiable. Returns None, with the solver
+        still usable, if self.budget runs out first.
+    """
+    def solve(self, assumptions: Iterable[int] = ()) -> bool:
+        self.model = None
+        self.failedAssumptions = []
+        self.assumptions = list(assumptions)
+        if not self.ok:
+            return False
+        if self.assumptions:
+            self.growVariables(max(abs(lit) for lit in self.assumptions))
+        self._flushPendingClauses()
+        if self.xors and self.gauss is None:
+            self.gauss = GaussEngine(self, self.xors)
+            if not self.gauss.ok:
+                self.ok = False
+                return False
+        if self.budget is not None:
+            self.budget.start(self)
+        if self.pureLiterals:
+            self.purity = PureLiteralTracker(self)
+        isSat = self._searchCdcl() if self.mode == CDCL else self._searchDpll()
+        if isSat:
+            self.model = list(self.trail)
+        elif isSat is not None and not self.failedAssumptions:
+            self.ok = False
+        self.cancelUntil(0)
+        self.purity = None
+        return isSat
+
+    """
+        A pure literal to set before branching, or 0 if there is none or
+        pure literals are not tracked. Setting one keeps the formula
+        satisfiable if it was, so its negation never needs to be tried.
+    """
+    def _pickPureLit(self) -> int:
+        if self.purity is None:
+            return 0
+        lit = self.purity.pick()
+        if lit != 0:
+            self.pureAssignments += 1
+        return lit
+
+    """
+        Opens decision levels for the assumptions that are not yet assigned,
+        up to the first one that has to be decided. Returns that literal, or
+        0 if there is none left; if an assumption is already false, the
+        failed assumptions are recorded instead.
+    """
+    def _nextAssumption(self) -> int:
+        assumptions = self.assumptions
+        value = self.value
+        while len(self.trailLim) < len(assumptions):
+            lit = assumptions[len(self.trailLim)]
+            if value[lit] == TRUE:
+                # Already implied, the level stays empty
+                self.newDecisionLevel()
+            elif value[lit] == FALSE:
+                self.failedAssumptions = self.analyzeFinal(lit)
+                return 0
+            else:
+                return lit
+        return 0
+
+    # Chronological backtracking: on a conflict the most recent decision whose
+    # negation has not been tried yet is flipped.
+    def _searchDpll(self) -> bool:
+        # Whether the decision of each level is already the second branch,
+        # and whether it is a pure literal
+        flipped: List[bool] = []
+        pure: List[bool] = []
+        # Assumption levels that some conflict depended on
+        usedLevels = set()
+        trail = self.trail
+        budget = self.budget
+        while True:
+            if budget is not None and budget.exhausted(self):
+                return None
+            conflict = self.propagate()
+            if conflict != NO_REASON:
+                self.conflicts += 1
+                self.bumpClauseVars(conflict)
+                if self.assumptions:
+                    self._markAssumptionLevels(conflict, pure, usedLevels)
+                level = len(flipped)
+                while level > 0 and flipped[level - 1]:
+                    level -= 1
+                if level == 0:
+                    # Every branch below the assumptions has been tried. The
+                    # assumptions are to blame only as far as the conflicts
+                    # depended on them, with none the clauses are refuted
+                    self.failedAssumptions = [self.assumptions[assumptionLevel - 1]
+                                              for assumptionLevel in sorted(usedLevels)]
+                    return False
+                decision = trail[self.trailLim[level - 1]]
+                self.cancelUntil(level - 1)
+                del flipped[level - 1:]
+                del pure[level - 1:]
+                self.newDecisionLevel()
+                self.assign(-decision, NO_REASON)
+                flipped.append(True)
+                pure.append(False)
+                continue
+
+            nextLit = self._nextAssumption()
+            if self.failedAssumptions:
+                return False
+            # Assumptions are never flipped, as if both branches were tried
+            pure.extend([False] * (len(self.trailLim) - len(flipped)))
+            flipped.extend([True] * (len(self.trailLim) - len(flipped)))
+            # Neither assumptions nor pure literals are ever flipped
+            isForced = nextLit != 0
+            isPure = False
+            if not isForced:
+                nextLit = self._pickPureLit()
+                isForced = isPure = nextLit != 0
+            if not isForced:
+                nextLit = self.pickBranchLit()
+                if nextLit == 0:
+                    return True
+                self.decisions += 1
+            self.newDecisionLevel()
+            self.assign(nextLit, NO_REASON)
+            flipped.append(isForced)
+            pure.append(isPure)
+
+    """
+        Adds to usedLevels the assumption levels that a DPLL conflict
+        depends on, found by following the reasons back from the
+        conflicting clause. A pure literal is pure given everything below
+        it, so reaching one depends on every assumption level. Second
+        branches need no following: their first branch's conflicts have
+        already been marked.
+    """
+    def _markAssumptionLevels(self, conflict: int, pure: List[bool], usedLevels: set):
+        lits = self.clauses.lits
+        offsets = self.clauses.offsets
+        level = self.level
+        reason = self.reason
+        seen = self.seen
+        numAssumptionLevels = min(len(self.assumptions), len(self.trailLim))
+        marked = []
+        stack = [conflict]
+        while stack:
+            clauseIndex = stack.pop()
+            for k in range(offsets[clauseIndex], offsets[clauseIndex + 1]):
+                var = abs(lits[k])
+                if seen[var] or level[var] == 0:
+                    continue
+                seen[var] = 1
+                marked.append(var)
+                if level[var] <= numAssumptionLevels:
+                    usedLevels.add(level[var])
+                if reason[var] != NO_REASON:
+                    stack.append(reason[var])
+                elif pure[level[var] - 1]:
+                    usedLevels.update(range(1, numAssumptionLevels + 1))
+        for var in marked:
+            seen[var] = 0
+
+    # Conflict driven clause learning: every conflict is analysed into a
+    # learned clause that becomes unit after backjumping to its asserting level.
+    def _searchCdcl(self) -> bool:
+        restartPolicy = self.restartPolicy
+        clauseDb = self.clauseDb
+        exchange = self.exchange
+        budget = self.budget
+        gauss = self.gauss
+        while True:
+            if budget is not None and budget.exhausted(self):
+                return None
+            conflict = self.propagate()
+            if conflict == NO_REASON and gauss is not None:
+                conflict = gauss.propagate()
+                if conflict == NO_REASON and self.qhead < len(self.trail):
+                    # Propagate what the XORs implied through the clauses
+                    continue
+            if conflict != NO_REASON:
+                self.conflicts += 1
+                if not self.trailLim:
+                    return False
+                learnt, backtrackLevel = self.analyze(conflict)
+                self.heuristic.decay()
+                clauseDb.decay()
+                lbd = self.computeLbd(learnt)
+                restartPolicy.onConflict(lbd, len(self.trail))
+                self.cancelUntil(backtrackLevel)
+                if len(learnt) == 1:
+                    self.assign(learnt[0], NO_REASON)
+                else:
+                    self.assign(learnt[0], self.attachClause(learnt))
+                    clauseDb.onLearnt(len(learnt), lbd)
+                if exchange is not None:
+                    exchange.export(learnt, lbd)
+                if clauseDb.shouldReduce(self.conflicts):
+                    clauseDb.reduce(self)
+                continue
+
+            if self.trailLim and restartPolicy.shouldRestart():
+                self.restarts += 1
+                restartPolicy.onRestart()
+                self.cancelUntil(0)
+                if exchange is not None:
+                    for lits, lbd in exchange.collect():
+                        if not self.addLearntClause(lits, lbd):
+                            return False
+                if self.prober is not None and self.prober.due(self.restarts):
+                    for resolvent in self.prober.probe(self):
+                        self.addLearntClause(resolvent, 2)
+                    if not self.ok:
+                        return False
+                continue
+
+            nextLit = self._nextAssumption()
+            if self.failedAssumptions:
+                return False
+            if nextLit == 0:
+                nextLit = self._pickPureLit()
+            if nextLit == 0:
+                nextLit = self.pickBranchLit()
+                if nextLit == 0:
+                    return True
+                self.decisions += 1
+            self.newDecisionLevel()
+            self.assign(nextLit, NO_REASON)
+
+    """
+        Removes the clauses whose entry in keep is 0 from the clause arena,
+        then rebuilds the watches and remaps the reasons on the trail.
+    """
+    def compactClauses(self, keep):
+        remap = self.clauses.compact(keep)
+        self._rebuildWatches()
+        reason = self.reason
+        for lit in self.trail:
+            var = abs(lit)
+            if reason[var] != NO_REASON:
+                reason[var] = remap[reason[var]]
+
+    def _rebuildWatches(self):
+        lits = self.clauses.lits
+        offsets = self.clauses.offsets
+        watches = [[] for _ in range(len(self.watches))]
+        for position in range(len(self.clauses)):
+            start = offsets[position]
+            watches[lits[start]].append(position)
+            watches[lits[start + 1]].append(position)
+        self.watches = watches
+
+    """
+        Literal block distance: the number of distinct decision levels
+        among the literals of a clause.
+    """
+    def computeLbd(self, clause: List[int]) -> int:
+        level = self.level
+        return len({level[abs(lit)] for lit in clause})
+
+    # Without conflict analysis the variables of the falsified clause
+    # are the ones credited with the conflict
+    def bumpClauseVars(self, clauseIndex: int):
+        bump = self.heuristic.bump
+        for lit in self.clauses.clause(clauseIndex):
+            bump(abs(lit))
+        self.heuristic.decay()
+
+    """
+        Walks the implication graph back from a conflicting clause to the
+        first unique implication point of the current decision level.
+        Returns the learned clause, with the asserting literal first and a
+        literal of the backjump level second, and the level to backjump to.
+    """
+    def analyze(self, conflict: int) -> (List[int], int):
+        lits = self.clauses.lits
+        offsets = self.clauses.offsets
+        level = self.level
+        reason = self.reason
+        trail = self.trail
+        seen = self.seen
+        bump = self.heuristic.bump
+        numOriginal = self.numOriginal
+        currentLevel = len(self.trailLim)
+
+        learnt = [0]
+        pathCount = 0
+        p = 0
+        index = len(trail) - 1
+        clauseIndex = conflict
+        while True:
+            if clauseIndex >= numOriginal:
+                self.clauseDb.bump(clauseIndex - numOriginal)
+            # The implied literal of a reason clause sits in its first slot
+            start = offsets[clauseIndex] + (0 if p == 0 else 1)
+            for k in range(start, offsets[clauseIndex + 1]):
+                q = lits[k]
+                var = abs(q)
+                if not seen[var] and level[var] > 0:
+                    seen[var] = 1
+                    bump(var)
+                    if level[var] >= currentLevel:
+                        pathCount += 1
+                    else:
+                        learnt.append(q)
+            # Next marked literal of the current level on the trail
+            while not seen[abs(trail[index])]:
+                index -= 1
+            p = trail[index]
+            index -= 1
+            var = abs(p)
+            clauseIndex = reason[var]
+            seen[var] = 0
+            pathCount -= 1
+            if pathCount == 0:
+                break
+        learnt[0] = -p
+
+        # Drop literals implied by the rest of the clause through their reasons
+        kept = [learnt[0]]
+        for q in learnt[1:]:
+            clauseIndex = reason[abs(q)]
+            if clauseIndex == NO_REASON:
+                kept.append(q)
+                continue
+            for k in range(offsets[clauseIndex] + 1, offsets[clauseIndex + 1]):
+                var = abs(lits[k])
+                if not seen[var] and level[var] > 0:
+                    kept.append(q)
+                    break
+        for q in learnt[1:]:
+            seen[abs(q)] = 0
+        learnt = kept
+
+        # Backjump to the highest level among the remaining literals
+        backtrackLevel = 0
+        if len(learnt) > 1:
+            best = 1
+            for k in range(2, len(learnt)):
+                if level[abs(learnt[k])] > level[abs(learnt[best])]:
+                    best = k
+            learnt[1], learnt[best] = learnt[best], learnt[1]
+            backtrackLevel = level[abs(learnt[1])]
+        return learnt, backtrackLevel
+
+    """
+        Explains why the assumption lit is false: walks the trail back from
+        its negation through the reasons of the marked literals, collecting
+        the decisions reached. Below the assumptions every decision is an
+        assumption, so the result is lit plus the assumptions implying -lit.
+    """
+    def analyzeFinal(self, lit: int) -> List[int]:
+        failed = [lit]
+        if not self.trailLim:
+            return failed
+        lits = self.clauses.lits
+        offsets = self.clauses.offsets
+        level = self.level
+        reason = self.reason
+        trail = self.trail
+        seen = self.seen
+        seen[abs(lit)] = 1
+        for i in range(len(trail) - 1, self.trailLim[0] - 1, -1):
+            var = abs(trail[i])
+            if not seen[var]:
+                continue
+            clauseIndex = reason[var]
+            if clauseIndex == NO_REASON:
+                failed.append(trail[i])
+            else:
+                for k in range(offsets[clauseIndex] + 1, offsets[clauseIndex + 1]):
+                    other = abs(lits[k])
+                    if level[other] > 0:
+                        seen[other] = 1
+            seen[var] = 0
+        seen[abs(lit)] = 0
+        return failed
@@ -0,0 +1,406 @@
+#!/bin/python3
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import sys
+import time
+from collections import Counter
+from typing import List
+from budget import Budget
+from client import DEFAULT_SOCKET
+from dimacs import parseDimacs
+from heuristics import HEURISTICS
+from preprocess import Preprocessor
+from restarts import RESTART_POLICIES
+from search import CDCL, DEFAULT_RESTARTS, MODES, Solver
+from solver import completeSolve, variableNames
+
+# Solver Service:
+# A long running process answering solve requests, so the interpreter starts
+# and the modules load once rather than once per query. An asyncio front end
+# reads JSON line requests from a Unix socket or from stdin, and hands each
+# one to a pool of worker processes started up front. Each response is a JSON
+# line holding the request's id and the DIMACS 's'/'v' lines solver.py would
+# print, written as soon as that request finishes, so answers on a connection
+# may come back in a different order than the requests went in.
+#
+# A request's timeout is enforced twice: the worker's search gets a Budget of
+# the time left after parsing and answers 's UNKNOWN' when it runs out, and a
+# worker that still has not answered KILL_GRACE seconds later (stuck in
+# parsing or preprocessing) is killed and replaced. Requests beyond the
+# pending limit are turned away at once rather than queued without bound.
+#
+# The socket is created in a directory only the service's user may enter,
+# and is itself readable and writable by that user alone. Reading a formula
+# from a "path" is off unless the service is started with --allow-paths,
+# and errors while reading a formula are reported without their details,
+# which could quote the file back to the requester.
+
+# Statuses of a response
+SAT = "SAT"
+UNSAT = "UNSAT"
+TIMEOUT = "TIMEOUT"
+BUSY = "BUSY"
+ERROR = "ERROR"
+
+# Requests accepted but not answered yet, over all connections
+DEFAULT_MAX_PENDING = 64
+# Seconds a worker may overrun a request's timeout before it is killed
+KILL_GRACE = 2.0
+# Longest request line, which holds the whole formula when sent inline
+MAX_REQUEST_BYTES = 256 << 20
+
+"""
+    Solves a DIMACS formula, given as its contents or a path, the way
+    solver.py does and returns the response fields: status, output (the
+    's' and 'v' lines) and stats. The search gives up once timeout seconds
+    have passed since the call.
+"""
+def solvePayload(cnf, timeout: float = None, mode: str = CDCL, heuristic: str = None,
+                 seed: int = None, restarts: str = DEFAULT_RESTARTS, preprocess: bool = True) -> dict:
+    start = time.perf_counter()
+    try:
+        arena = parseDimacs(cnf)
+    except Exception as error:
+        print(f"c could not read a formula: {type(error).__name__}: {error}",
+              file=sys.stderr, flush=True)
+        return {"status": ERROR, "error": "could not read the formula", "output": ""}
+    try:
+        preprocessor = None
+        searchClauses = arena
+        if preprocess:
+            preprocessor = Preprocessor(arena)
+            preprocessor.run()
+            searchClauses = preprocessor.toArena()
+        solver = Solver(searchClauses, mode, heuristic, seed, restarts)
+        if timeout is not None:
+            solver.budget = Budget(max(0.0, timeout - (time.perf_counter() - start)))
+        isSat = solver.solve()
+    except Exception as error:
+        print(f"c solving failed: {type(error).__name__}: {error}", file=sys.stderr, flush=True)
+        return {"status": ERROR, "error": f"{type(error).__name__} while solving", "output": ""}
+    if isSat is None:
+        response = {"status": TIMEOUT, "output": "s UNKNOWN\n"}
+    elif isSat:
+        model = solver.model if preprocessor is None else preprocessor.extendModel(solver.model)
+        model = sorted(map(int, completeSolve(variableNames(arena), set(map(str, model)))), key=abs)
+        response = {"status": SAT,
+                    "output": f"s SATISFIABLE\nv {' '.join(map(str, model))} 0\n"}
+    else:
+        response = {"status": UNSAT, "output": "s UNSATISFIABLE\n"}
+    response["stats"] = {"variables": arena.numVars, "clauses": len(arena),
+                         "decisions": solver.decisions, "conflicts": solver.conflicts}
+    return response
+
+def _workerLoop(connection, options: dict):
+    # Interrupting the service is its own business, not the workers'
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    while True:
+        task = connection.recv()
+        if task is None:
+            break
+        cnf, timeout = task
+        connection.send(solvePayload(cnf, timeout, **options))
+
+class _Worker:
+    def __init__(self, context, options: dict):
+        self.connection, workerEnd = context.Pipe()
+        self.process = context.Process(target=_workerLoop, args=(workerEnd, options), daemon=True)
+        self.process.start()
+        workerEnd.close()
+
+    """
+        Solves one formula in the worker, waiting without blocking the
+        event loop: the formula and the answer, which may be megabytes,
+        are copied through the pipe on executor threads, and the wait in
+        between watches the pipe from the loop. Raises EOFError if the
+        worker dies and asyncio.TimeoutError if it overruns limit seconds.
+    """
+    async def solve(self, cnf, timeout: float, limit: float) -> dict:
+        loop = asyncio.get_running_loop()
+        connection = self.connection
+        fd = connection.fileno()
+
+        async def exchange():
+            await loop.run_in_executor(None, connection.send, (cnf, timeout))
+            readable = loop.create_future()
+
+            def ready():
+                loop.remove_reader(fd)
+                if not readable.done():
+                    readable.set_result(None)
+
+            loop.add_reader(fd, ready)
+            try:
+                await readable
+            finally:
+                loop.remove_reader(fd)
+            return await loop.run_in_executor(None, connection.recv)
+
+        return await asyncio.wait_for(exchange(), limit)
+
+    def stop(self):
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join(1.0)
+        self.kill()
+
+    def kill(self):
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.connection.close()
+
+class SolverService:
+    """
+        workers solve at the same time, maxPending requests may be accepted
+        and unanswered at once, and timeout is the default limit of a
+        request, which a request may lower but not raise above maxTimeout.
+        Requests may name a file under "path" only if allowPaths is set.
+        The remaining options configure the search, as in batch.solveFile.
+    """
+    def __init__(self, workers: int = None, maxPending: int = DEFAULT_MAX_PENDING,
+                 timeout: float = None, maxTimeout: float = None, allowPaths: bool = False,
+                 **options):
+        self.numWorkers = max(1, workers or os.cpu_count() or 1)
+        self.maxPending = max(self.numWorkers, maxPending)
+        self.timeout = timeout
+        self.maxTimeout = maxTimeout
+        self.allowPaths = allowPaths
+        self.options = options
+        self.context = multiprocessing.get_context()
+        self.workers: List[_Worker] = []
+        self.idle = None
+        self.pending = 0
+        self.ids = itertools.count(1)
+        # Responses sent with each status
+        self.served = Counter()
+
+    # Starts the worker processes, warm before the first request arrives
+    async def start(self):
+        self.idle = asyncio.Queue()
+        for _ in range(self.numWorkers):
+            worker = _Worker(self.context, self.options)
+            self.workers.append(worker)
+            self.idle.put_nowait(worker)
+
+    def close(self):
+        for worker in self.workers:
+            worker.stop()
+        self.workers = []
+
+    def _replace(self, worker: _Worker) -> _Worker:
+        worker.kill()
+        fresh = _Worker(self.context, self.options)
+        self.workers[self.workers.index(worker)] = fresh
+        return fresh
+
+    def _requestTimeout(self, request: dict) -> float:
+        timeout = request.get("timeout", self.timeout)
+        if timeout is not None:
+            timeout = float(timeout)
+        if self.maxTimeout is not None:
+            timeout = self.maxTimeout if timeout is None else min(timeout, self.maxTimeout)
+        return timeout
+
+    """
+        Answers one request, a dict with an optional id and timeout and
+        either the formula text under "cnf" or, if allowPaths is set, a
+        file under "path".
+    """
+    async def handle(self, request: dict) -> dict:
+        start = time.perf_counter()
+        requestId = request.get("id")
+        if requestId is None:
+            requestId = next(self.ids)
+        if self.pending >= self.maxPending:
+            response = {"status": BUSY, "error": f"{self.pending} requests pending", "output": ""}
+        elif ("cnf" in request) == ("path" in request):
+            response = {"status": ERROR, "error": "a request needs one of 'cnf' or 'path'",
+                        "output": ""}
+        elif "path" in request and not self.allowPaths:
+            response = {"status": ERROR, "error": "'path' requests are not allowed by this service",
+                        "output": ""}
+        else:
+            self.pending += 1
+            try:
+                response = await self._solve(request)
+            finally:
+                self.pending -= 1
+        self.served[response["status"]] += 1
+        response["id"] = requestId
+        response["seconds"] = round(time.perf_counter() - start, 6)
+        return response
+
+    async def _solve(self, request: dict) -> dict:
+        try:
+            timeout = self._requestTimeout(request)
+        except (TypeError, ValueError):
+            return {"status": ERROR, "error": f"bad timeout {request['timeout']!r}", "output": ""}
+        cnf = request["cnf"].encode() if "cnf" in request else request["path"]
+        worker = await self.idle.get()
+        try:
+            return await worker.solve(cnf, timeout, None if timeout is None else timeout + KILL_GRACE)
+        except asyncio.TimeoutError:
+            worker = self._replace(worker)
+            return {"status": TIMEOUT, "output": "s UNKNOWN\n"}
+        except (EOFError, OSError):
+            worker = self._replace(worker)
+            return {"status": ERROR, "error": "worker exited", "output": ""}
+        finally:
+            self.idle.put_nowait(worker)
+
+    async def _answer(self, line: bytes, write):
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("a request is a JSON object")
+        except ValueError as error:
+            self.served[ERROR] += 1
+            response = {"id": None, "status": ERROR, "error": f"bad request: {error}", "output": ""}
+        else:
+            response = await self.handle(request)
+        await write(json.dumps(response).encode() + b"\n")
+
+    """
+        Answers every request line read from reader, each as soon as it is
+        solved, until the end of the stream and all of its answers.
+    """
+    async def serveStream(self, reader: asyncio.StreamReader, write):
+        tasks = set()
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if line.strip():
+                task = asyncio.ensure_future(self._answer(line, write))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def _serveConnection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        async def write(data: bytes):
+            writer.write(data)
+            await writer.drain()
+
+        try:
+            await self.serveStream(reader, write)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    """
+        Serves connections on a Unix socket until stopped is set. The
+        socket's directory is created private to the user if it is missing,
+        and the socket is created accessible to the user alone.
+    """
+    async def serveSocket(self, path: str, stopped: asyncio.Event):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), mode=0o700, exist_ok=True)
+        if os.path.exists(path):
+            probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try:
+                probe.connect(path)
+            except OSError:
+                # Left behind by a service that did not shut down cleanly
+                os.unlink(path)
+            else:
+                raise OSError(f"a service is already listening on {path}")
+            finally:
+                probe.close()
+        # Without group or other permissions from the moment it is bound
+        oldMask = os.umask(0o177)
+        try:
+            server = await asyncio.start_unix_server(self._serveConnection, path,
+                                                     limit=MAX_REQUEST_BYTES)
+        finally:
+            os.umask(oldMask)
+        os.chmod(path, 0o600)
+        try:
+            await stopped.wait()
+        finally:
+            server.close()
+            await server.wait_closed()
+            os.unlink(path)
+
+    # Serves the requests read from stdin, answering on stdout
+    async def serveStdio(self):
+        loop = asyncio.get_running_loop()
+        reader = asyncio.StreamReader(limit=MAX_REQUEST_BYTES)
+        await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+        output = sys.stdout.buffer
+
+        async def write(data: bytes):
+            output.write(data)
+            output.flush()
+
+        await self.serveStream(reader, write)
+
+    def __repr__(self):
+        summary = ", ".join(f"{count} {status}" for status, count in sorted(self.served.items()))
+        return f"service: {self.numWorkers} workers, {sum(self.served.values())} requests ({summary})"
+
+async def _main(arguments: argparse.Namespace):
+    service = SolverService(arguments.workers, arguments.maxPending, arguments.timeout,
+                            arguments.maxTimeout, arguments.allowPaths, mode=arguments.mode,
+                            heuristic=arguments.heuristic, seed=arguments.seed,
+                            restarts=arguments.restarts, preprocess=arguments.preprocess)
+    await service.start()
+    try:
+        if arguments.stdio:
+            await service.serveStdio()
+        else:
+            stopped = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            for signalNumber in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(signalNumber, stopped.set)
+            print(f"c listening on {arguments.socket}", file=sys.stderr, flush=True)
+            await service.serveSocket(arguments.socket, stopped)
+    finally:
+        service.close()
+        print("c", service, file=sys.stderr)
+
+def parseArguments(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Answer solve requests from a pool of warm workers.")
+    transport = parser.add_mutually_exclusive_group()
+    transport.add_argument("--socket", default=DEFAULT_SOCKET,
+                           help="Unix socket to listen on (default: %(default)s)")
+    transport.add_argument("--stdio", action="store_true",
+                           help="read requests from stdin and answer on stdout instead")
+    parser.add_argument("--allow-paths", dest="allowPaths", action="store_true",
+                        help="also take requests naming a file under 'path', which the service "
+                             "reads with its own permissions")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--max-pending", dest="maxPending", type=int, default=DEFAULT_MAX_PENDING,
+                        help="requests accepted at once, the rest are answered BUSY "
+                             "(default: %(default)s)")
+    parser.add_argument("--timeout", type=float,
+                        help="seconds allowed per request that does not set its own")
+    parser.add_argument("--max-timeout", dest="maxTimeout", type=float,
+                        help="upper bound on the seconds any request is allowed")
+    parser.add_argument("--mode", choices=MODES, default=CDCL,
+                        help="search algorithm (default: %(default)s)")
+    parser.add_argument("--heuristic", choices=tuple(HEURISTICS),
+                        help="branching heuristic (default: vsids for cdcl, jw for dpll)")
+    parser.add_argument("--seed", type=int, help="random seed, for reproducible runs")
+    parser.add_argument("--restarts", choices=tuple(RESTART_POLICIES), default=DEFAULT_RESTARTS,
+                        help="restart policy of cdcl mode (default: %(default)s)")
+    parser.add_argument("--no-preprocess", dest="preprocess", action="store_false",
+                        help="skip subsumption and variable elimination before search")
+    arguments = parser.parse_args(argv)
+    for option, value in (("--workers", arguments.workers), ("--max-pending", arguments.maxPending),
+                          ("--timeout", arguments.timeout), ("--max-timeout", arguments.maxTimeout)):
+        if value is not None and value <= 0:
+            parser.error(f"{option} needs a positive number")
+    return arguments
+
+if __name__ == "__main__":
+    asyncio.run(_main(parseArguments(sys.argv[1:])))
@@ -1,8 +1,32 @@
 #!/bin/python3
+import argparse
+import signal
 import sys
-from copy import copy, deepcopy
 import random
-from typing import List, Set
+from array import array
+from typing import List, Set, Union
+from arena import ClauseArena
+from budget import Budget
+from cnfcache import parseCached
+from counting import DEFAULT_CACHE_BYTES, ModelCounter
+from cubes import DEFAULT_DEPTH, solveCubes
+from dimacs import ParseStats, parseDimacs
+from gauss import detectXors, xorSatisfied
+from heuristics import HEURISTICS
+from localsearch import ALGORITHMS, PROBSAT, LocalSearch
+from portfolio import solvePortfolio
+from preprocess import Preprocessor
+from probing import DEFAULT_PROBE_SECONDS, DEFAULT_ROUND_SECONDS, Prober
+from resultcache import DEFAULT_MAX_BYTES, DEFAULT_PATH, ResultCache, fingerprint
+from restarts import RESTART_POLICIES
+from search import CDCL, DEFAULT_RESTARTS, MODES, Solver
+from stats import SearchStats
+from verify import unsatisfiedClauses
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # Feel free to change the provided types and parsing code to match
 # your preferred representation of formulas, clauses, and literals.
@@ -12,7 +36,11 @@ from typing import List, Set
 # IO Implementation to handle the File Input (Provided by Assignment):
 
 # Class representing a Literal:
+# (A thin view kept for the existing API, the solver itself works on the
+# signed integer literals stored in a ClauseArena)
 class Literal:
+    __slots__ = ("name", "sign", "value")
+
     def __init__(self, name, sign):
         self.name = name  # integer
         self.sign = sign  # boolean
@@ -32,6 +60,8 @@ class Literal:
 
 # Class representing a Clause:
 class Clause:
+    __slots__ = ("id", "literalSet")
+
     def __init__(self, id, literalSet):
         self.id = id
         self.literalSet = literalSet
@@ -44,29 +74,46 @@ class Clause:
             return False
         return (self.id == other.id) and (self.literalSet == other.literalSet)
 
+# A formula is either the compact ClauseArena or a list of Clause views
+Formula = Union[ClauseArena, List[Clause]]
 
 # Read and parse a cnf file, returning the variable set and clause set
+# (Compatibility wrapper around the streaming parser in dimacs.py)
 def readInput(cnfFile):
+    arena = parseDimacs(cnfFile)
+    return variableNames(arena), fromArena(arena)
+
+# Lists the variables of a formula in order of first appearance
+def variableNames(arena: ClauseArena) -> List[str]:
+    seen = bytearray(arena.numVars + 1)
     variableSet = []
+    for lit in arena.lits:
+        variable = abs(lit)
+        if not seen[variable]:
+            seen[variable] = 1
+            variableSet.append(str(variable))
+    return variableSet
+
+# Packs a list of Clause views into a ClauseArena
+def toArena(formula: List[Clause]) -> ClauseArena:
+    return ClauseArena.fromLists(
+        ([int(eachSymbol.value) for eachSymbol in eachClause.literalSet] for eachClause in formula),
+        [eachClause.id for eachClause in formula])
+
+# Expands a ClauseArena back into a list of Clause views
+def fromArena(arena: ClauseArena) -> List[Clause]:
     clauseSet = []
-    nextCID = 0
-    with open(cnfFile, "r") as f:
-        for line in f.readlines():
-            tokens = line.strip().split()
-            if tokens and tokens[0] != "p" and tokens[0] != "c":
-                literalSet = []
-                for lit in tokens[:-1]:
-                    sign = lit[0] != "-"
-                    variable = lit.strip("-")
-
-                    literalSet.append(Literal(variable, sign))
-                    if variable not in variableSet:
-                        variableSet.append(variable)
-
-                clauseSet.append(Clause(nextCID, literalSet))
-                nextCID += 1
-    
-    return variableSet, clauseSet
+    for i in range(len(arena)):
+        literalSet = [Literal(str(abs(lit)), lit > 0) for lit in arena.clause(i)]
+        clauseSet.append(Clause(arena.clauseId(i), literalSet))
+    return clauseSet
+
+# Runs an arena implementation on either representation of a formula,
+# handing back the result in the representation it was given
+def _onArena(formula: Formula, arenaFunction, *args):
+    if isinstance(formula, ClauseArena):
+        return arenaFunction(formula, *args)
+    return fromArena(arenaFunction(toArena(formula), *args))
 
 
 # Print the result in DIMACS format
@@ -86,12 +133,12 @@ def printOutput(assignment):
 """
     Finds all Unit Clauses within a given formula.
 """ 
-def findUnitClause(formula: List[Clause]) -> List[Clause]:
-    unitClauseList = []
-    for eachClause in formula:
-        if len(eachClause.literalSet) == 1 :
-            unitClauseList.append(eachClause)
-    return unitClauseList        
+def findUnitClause(formula: Formula) -> Formula:
+    return _onArena(formula, _findUnitClause)
+
+def _findUnitClause(arena: ClauseArena) -> ClauseArena:
+    offsets = arena.offsets
+    return arena.select([i for i in range(len(arena)) if offsets[i + 1] - offsets[i] == 1])
 
 """
     Performs Unit Elimination on the Given Formula:
@@ -100,70 +147,77 @@ def findUnitClause(formula: List[Clause]) -> List[Clause]:
     2. Remove all instances of the converse of the Unit Clause
     3. Assign the Unit Clause to the solution set.
 """ 
-def unitElim(formula: List[Clause], solutions: Set[str]) -> List[Clause]:
-    # Copy the Formula to avoid Mutability Issues
-    formulaCopy = formula.copy()
+def unitElim(formula: Formula, solutions: Set[str]) -> Formula:
+    return _onArena(formula, _unitElim, solutions)
 
-    # Finds the list of Unit Clauses
-    unitClauseList = findUnitClause(formulaCopy)
+def _unitElim(arena: ClauseArena, solutions: Set[str]) -> ClauseArena:
+    lits = arena.lits
+    offsets = arena.offsets
+    numClauses = len(arena)
 
+    # Finds the list of Unit Clauses
+    unitList = [lits[offsets[i]] for i in range(numClauses) if offsets[i + 1] - offsets[i] == 1]
+    if not unitList:
+        return arena.select(range(numClauses))
+
+    # Clauses containing each unit literal, found in a single pass
+    unitSet = set(unitList)
+    occurrences = {lit: [] for lit in unitSet}
+    for i in range(numClauses):
+        clause = lits[offsets[i]:offsets[i + 1]]
+        if not unitSet.isdisjoint(clause):
+            for lit in unitSet.intersection(clause):
+                occurrences[lit].append(i)
+
+    alive = bytearray(b"\x01") * numClauses
+    # Literals (negations of the unit literals) removed from every clause
+    removed = set()
     # For each Unit Clause in the list:
-    for eachUnitClause in unitClauseList:
-        # Occurs when a Unit Clause and its Converse both exist as
-        # individual clauses, the one that comes after the first will be
-        # removed.
-        if len(eachUnitClause.literalSet) == 0:
-            continue
-        else:
-            # Specified Value (ex. Unit Clause of +x -> +x)
-            specified = eachUnitClause.literalSet[0]
-            # (ex. If specified is +x, opposite is -x)
-            oppoSpecified = str(int(specified.value) * -1)
-
+    for specified in unitList:
+        # Once the converse has been eliminated no clause contains the
+        # literal anymore, so only its negation is left to record.
+        if specified not in removed:
             # Remove the non-unit-Clauses containing the unit clause
-            formulaCopy = list(filter(lambda eachClause:
-                (specified not in eachClause.literalSet)
-                or (eachClause in unitClauseList), formulaCopy))
-
-            # Remove instances of the negation of the unit cluase
-            # in all Clauses
-            for i in range(0, len(formulaCopy)):
-                ecId = formulaCopy[i].id
-                ecClause = formulaCopy[i].literalSet
-                formulaCopy[i] = Clause(ecId, list(filter(lambda eachSymbol:
-                eachSymbol.value != oppoSpecified, ecClause)))
-            
-            # Add the Specified Value to the Solution
-            solutions.add(specified.value)
-    return formulaCopy
+            for i in occurrences[specified]:
+                if offsets[i + 1] - offsets[i] != 1:
+                    alive[i] = 0
+        # Remove instances of the negation of the unit clause in all Clauses
+        removed.add(-specified)
+        # Add the Specified Value to the Solution
+        solutions.add(str(specified))
+
+    result = ClauseArena(arena.numVars, ids=array("q"))
+    for i in range(numClauses):
+        if alive[i]:
+            clause = lits[offsets[i]:offsets[i + 1]]
+            if removed.isdisjoint(clause):
+                result.lits.extend(clause)
+            else:
+                result.lits.extend([lit for lit in clause if lit not in removed])
+            result.offsets.append(len(result.lits))
+            result.ids.append(arena.clauseId(i))
+    return result
 
 """
     Finds all Pure Clauses in a given formula.
 """ 
-def findPure(formula: List[Clause]) -> Set[str]:
-    pureSet = set()
-    seam = set()
-
-    for eachClause in formula:
-        for eachSymbol in eachClause.literalSet:
-            seam.add(eachSymbol.value)
-    
-    for eachVal in seam:
-        if eachVal in seam and str(-1 * int(eachVal)) not in seam:
-            pureSet.add(eachVal)
-    
-    return pureSet
+def findPure(formula: Formula) -> Set[str]:
+    arena = formula if isinstance(formula, ClauseArena) else toArena(formula)
+    seam = set(arena.lits)
+    return {str(eachVal) for eachVal in seam if -eachVal not in seam}
 
 """
     Removes all clauses containing a given value (+x or -x)
 """ 
-def removeVal(formula: List[Clause], elt: str) -> List[Clause]:
-    formulaCopy = formula.copy()
-    # print("Formula Before", formulaCopy)
-    formulaCopy = list(filter(lambda eachClause:
-        elt not in map(lambda elt: elt.value, eachClause.literalSet), formulaCopy))
-    # print("Formula After", formulaCopy)
-    return formulaCopy
+def removeVal(formula: Formula, elt: str) -> Formula:
+    return _onArena(formula, _removeVals, {int(elt)})
+
+# Removes all clauses containing any of the given literals in one pass
+def _removeVals(arena: ClauseArena, values: Set[int]) -> ClauseArena:
+    lits = arena.lits
+    offsets = arena.offsets
+    return arena.select([i for i in range(len(arena))
+                         if values.isdisjoint(lits[offsets[i]:offsets[i + 1]])])
 
 """
     Performs Pure Elimination on the Formula:
@@ -171,83 +225,48 @@ def removeVal(formula: List[Clause], elt: str) -> List[Clause]:
     1. Eliminate all Clauses containing the Pure Clause
     2. Add the Pure Clause to the Solution
 """ 
-def pureElim(formula: List[Clause], solutions: Set[str]) -> List[Clause]:
-    # Make a copy of the Formula to avoid Mutability Issues
-    formulaCopy = formula.copy()
-    # Find the set of Pure Clauses
-    pureSet = findPure(formulaCopy)
+def pureElim(formula: Formula, solutions: Set[str]) -> Formula:
+    return _onArena(formula, _pureElim, solutions)
 
-    # For each Pure Clause:
-    for eachPure in pureSet:
-        # Eliminate all Clauses containing it
-        formulaCopy = removeVal(formulaCopy, eachPure)
-        # Add it to the solution
-        solutions.add(eachPure)
-    
-    return formulaCopy
+def _pureElim(arena: ClauseArena, solutions: Set[str]) -> ClauseArena:
+    # Find the set of Pure Clauses
+    pureSet = findPure(arena)
+    # Add them to the solution
+    solutions.update(pureSet)
+    # Eliminate all Clauses containing them
+    return _removeVals(arena, {int(eachPure) for eachPure in pureSet})
 
 """
     Checks if the Formula has an empty clause.
 """ 
-def hasEmptyClause(formula: List[Clause]) -> bool:
-    cond = False
-    for eachClause in formula:
-        if (len(eachClause.literalSet) == 0):
-            cond = True
-            break
-    return cond
+def hasEmptyClause(formula: Formula) -> bool:
+    if not isinstance(formula, ClauseArena):
+        return any(len(eachClause.literalSet) == 0 for eachClause in formula)
+    offsets = formula.offsets
+    return any(offsets[i] == offsets[i + 1] for i in range(len(offsets) - 1))
 
 """
     Select a Literal in the Formula to recur on.
 """ 
-def pickVar(formula: List[Clause]) -> str:
-    eltSet = set()
-    for eachClause in formula:
-        for eachSymbol in eachClause.literalSet:
-            eltSet.add(eachSymbol.name)
+def pickVar(formula: Formula) -> str:
+    arena = formula if isinstance(formula, ClauseArena) else toArena(formula)
+    eltSet = set(map(abs, arena.lits))
     # The implementation choice here is to randomly pick a literal.
-    return random.choice(tuple(eltSet))
-    
+    return str(random.choice(tuple(eltSet)))
+
 """
     Given a formula and a solution set (initially empty),
     either returns the solution that satisfies the formula or
     determine the formula to be unsat.
 """ 
-def solve(formula: List[Clause], solution: Set[str]) -> (Set[str], bool):
-    # Performs Unit Elimination on the Formula
-    unitElimFormula = unitElim(formula, solution)
-    # Performs Pure Elimination on the Formula
-    currentFormula = pureElim(unitElimFormula, solution)
-
-    # If the Formula has an empty clauses - no solution
-    if hasEmptyClause(currentFormula):
+def solve(formula: Formula, solution: Set[str], mode: str = CDCL, heuristic: str = None,
+          seed: int = None, restarts: str = DEFAULT_RESTARTS) -> (Set[str], bool):
+    arena = formula if isinstance(formula, ClauseArena) else toArena(formula)
+    solver = Solver(arena, mode, heuristic, seed, restarts)
+    if not solver.solve():
         return (set(), False)
-    # If the Formula itself is empty, we found a solution!
-    if len(currentFormula) == 0:
-        return (solution.copy(), True)
-
-    # Chooses the next Literal
-    nextLit = pickVar(currentFormula)
-
-    # Constructs the Positive Formula
-    posFormula = currentFormula.copy()
-    posFormula.append(Clause(len(currentFormula), [Literal(nextLit, True)]))
-    posSolution = solution.copy()
-    posSolution.add(nextLit)
-
-    posResult = solve(posFormula, posSolution)
-    # If positive Formula is SAT, returns the answer
-    if posResult[1]:
-        return posResult
-    # Else, recur on the negative case
-    else:
-        # Constructs the Negative Formula
-        negFormula = currentFormula.copy()
-        negFormula.append(Clause(len(currentFormula), [Literal(nextLit, False)]))
-        negSolution = solution.copy()
-        negSolution.add("-" + nextLit)
-
-        return solve(negFormula, negSolution)
+    solution.update(map(str, solver.model))
+    return (solution.copy(), True)
 
 """
     Completes the Incomplete Solution given in
@@ -257,24 +276,288 @@ def completeSolve(varbset : List[str], incompleteSol: Set[str]) -> List[str]:
     completeSolution = set(incompleteSol).union(set(varbset) - set(unsignedSolution))
     return list(completeSolution)
 
+# Command line options of the solver
+def parseArguments(argv: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Solve a DIMACS CNF file.")
+    parser.add_argument("inputFile", help="the DIMACS CNF file to solve, optionally gzip, bzip2 "
+                                          "or xz compressed")
+    parser.add_argument("--cache", nargs="?", const="", metavar="DIR",
+                        help="load the formula from a binary cache, written on first use next "
+                             "to the input file or in DIR, and rebuilt when the input changes")
+    parser.add_argument("--mode", choices=MODES, default=CDCL,
+                        help="search algorithm (default: %(default)s)")
+    parser.add_argument("--heuristic", choices=tuple(HEURISTICS),
+                        help="branching heuristic (default: vsids for cdcl, jw for dpll)")
+    parser.add_argument("--seed", type=int,
+                        help="random seed, for reproducible runs")
+    parser.add_argument("--restarts", choices=tuple(RESTART_POLICIES), default=DEFAULT_RESTARTS,
+                        help="restart policy of cdcl mode (default: %(default)s)")
+    parser.add_argument("--no-phase-saving", dest="phaseSaving", action="store_false",
+                        help="always branch positive instead of on the last saved phase")
+    parser.add_argument("--pure-literals", dest="pureLiterals", action=argparse.BooleanOptionalAction,
+                        help="set pure literals before branching (default: on for dpll only)")
+    parser.add_argument("--max-learnts", dest="maxLearnts", type=int,
+                        help="cap on the number of learned clauses kept")
+    parser.add_argument("--max-learnt-mb", dest="maxLearntMb", type=float,
+                        help="cap on the memory taken by learned clauses, in megabytes")
+    parser.add_argument("--no-preprocess", dest="preprocess", action="store_false",
+                        help="skip subsumption and variable elimination before search")
+    parser.add_argument("--probe-seconds", dest="probeSeconds", type=float,
+                        help="time preprocessing may spend merging equivalent literals and "
+                             "probing for failed ones, 0 to skip it (default: scaled with the "
+                             f"formula, at most {DEFAULT_PROBE_SECONDS})")
+    parser.add_argument("--inprocess-probe", dest="inprocessProbe", type=float, nargs="?",
+                        const=DEFAULT_ROUND_SECONDS, metavar="SECONDS",
+                        help="also probe for failed literals between restarts, for SECONDS per "
+                             "round (default: %(const)s)")
+    parser.add_argument("--no-xor", dest="xor", action="store_false",
+                        help="expand XOR lines into clauses instead of solving them, and those "
+                             "found among the clauses, by Gaussian elimination")
+    parser.add_argument("--portfolio", type=int, nargs="?", const=0, metavar="WORKERS",
+                        help="race differently configured cdcl workers that share short "
+                             "learned clauses, one per CPU unless WORKERS is given")
+    parser.add_argument("--cubes", type=int, nargs="?", const=DEFAULT_DEPTH, metavar="DEPTH",
+                        help="split the formula into cubes with DEPTH lookahead splits "
+                             f"(default: {DEFAULT_DEPTH}) and solve them on a process pool")
+    parser.add_argument("--jobs", type=int,
+                        help="worker processes solving cubes (default: one per CPU)")
+    parser.add_argument("--result-cache", dest="resultCache", nargs="?", const=DEFAULT_PATH,
+                        metavar="PATH",
+                        help="reuse answers for formulas solved before, up to clause and literal "
+                             f"order (default database: {DEFAULT_PATH})")
+    parser.add_argument("--result-cache-mb", dest="resultCacheMb", type=float,
+                        default=DEFAULT_MAX_BYTES / (1 << 20),
+                        help="size cap of the result cache (default: %(default)s)")
+    parser.add_argument("--count", action="store_true",
+                        help="count the models over every variable of the header instead of "
+                             "finding one")
+    parser.add_argument("--count-cache-mb", dest="countCacheMb", type=float,
+                        default=DEFAULT_CACHE_BYTES / (1 << 20),
+                        help="memory for cached component counts (default: %(default)s)")
+    parser.add_argument("--local-search", dest="localSearch", choices=ALGORITHMS, nargs="?",
+                        const=PROBSAT, metavar="ALGORITHM",
+                        help="look for a model with local search first, falling back to the "
+                             f"complete search if none is found ({', '.join(ALGORITHMS)}, "
+                             f"default: {PROBSAT})")
+    parser.add_argument("--max-flips", dest="maxFlips", type=int,
+                        help="flips allowed to local search (default: unlimited)")
+    parser.add_argument("--local-seconds", dest="localSeconds", type=float,
+                        help="seconds allowed to local search (default: unlimited)")
+    parser.add_argument("--time-limit", dest="timeLimit", type=float, metavar="SECONDS",
+                        help="give up with 's UNKNOWN' after SECONDS of search")
+    parser.add_argument("--max-conflicts", dest="maxConflicts", type=int,
+                        help="give up with 's UNKNOWN' after this many conflicts")
+    parser.add_argument("--max-decisions", dest="maxDecisions", type=int,
+                        help="give up with 's UNKNOWN' after this many decisions")
+    parser.add_argument("--max-propagations", dest="maxPropagations", type=int,
+                        help="give up with 's UNKNOWN' after this many propagations")
+    parser.add_argument("--max-memory-mb", dest="maxMemoryMb", type=float,
+                        help="give up with 's UNKNOWN' once the process uses this many megabytes")
+    parser.add_argument("--stats", action="store_true",
+                        help="time the phases of the search and report them with memory use")
+    parser.add_argument("--progress", type=float, metavar="SECONDS",
+                        help="print a progress line every SECONDS while searching")
+    parser.add_argument("--verify", action="store_true",
+                        help="check the model against every input clause before printing it")
+    arguments = parser.parse_args(argv)
+    for option, value in (("--portfolio", arguments.portfolio), ("--cubes", arguments.cubes)):
+        if value is not None:
+            if value < 0:
+                parser.error(f"{option} needs a non-negative number")
+            if arguments.mode != CDCL:
+                parser.error(f"{option} only runs cdcl workers")
+    if arguments.portfolio is not None and arguments.cubes is not None:
+        parser.error("--portfolio and --cubes cannot be combined")
+    if arguments.jobs is not None:
+        if arguments.cubes is None:
+            parser.error("--jobs needs --cubes")
+        if arguments.jobs < 1:
+            parser.error("--jobs needs a positive number of workers")
+    if arguments.localSearch is not None and arguments.maxFlips is None \
+            and arguments.localSeconds is None:
+        parser.error("--local-search needs a budget, --max-flips or --local-seconds")
+    limits = (("--time-limit", arguments.timeLimit), ("--max-conflicts", arguments.maxConflicts),
+              ("--max-decisions", arguments.maxDecisions),
+              ("--max-propagations", arguments.maxPropagations),
+              ("--max-memory-mb", arguments.maxMemoryMb))
+    for option, value in limits:
+        if value is not None:
+            if value < 0:
+                parser.error(f"{option} needs a non-negative number")
+            if arguments.portfolio is not None or arguments.cubes is not None:
+                parser.error(f"{option} only limits the single solver")
+    if arguments.progress is not None and arguments.progress <= 0:
+        parser.error("--progress needs a positive number of seconds")
+    if arguments.probeSeconds is not None and arguments.probeSeconds < 0:
+        parser.error("--probe-seconds needs a non-negative number")
+    if arguments.inprocessProbe is not None:
+        if arguments.inprocessProbe <= 0:
+            parser.error("--inprocess-probe needs a positive number of seconds")
+        if arguments.mode != CDCL or arguments.portfolio is not None or arguments.cubes is not None:
+            parser.error("--inprocess-probe runs between the restarts of the single cdcl solver")
+    return arguments
+
 # The Main Method to execute:
 if __name__ == "__main__":
-    inputFile = sys.argv[1]
-    varbset, clauseSet = readInput(inputFile)
+    arguments = parseArguments(sys.argv[1:])
+    inputFile = arguments.inputFile
+    # XORs are solved natively by the single cdcl solver only, everything
+    # else sees them as clauses
+    nativeXors = arguments.xor and np is not None and arguments.mode == CDCL \
+        and not arguments.pureLiterals and not arguments.count \
+        and arguments.resultCache is None and arguments.localSearch is None \
+        and arguments.portfolio is None and arguments.cubes is None
+    xors = []
+    parseStats = ParseStats()
+    if arguments.cache is not None:
+        # The cache keeps the clauses the XOR lines expand to, the XORs are
+        # found again among them. The formula is only ever read, so its
+        # buffers stay memory mapped rather than copied in.
+        clauseSet = parseCached(inputFile, arguments.cache or None, stats=parseStats, mapped=True)
+    else:
+        clauseSet = parseDimacs(inputFile, stats=parseStats, xors=xors if nativeXors else None)
+    print("c", parseStats)
+    if nativeXors:
+        detected = detectXors(clauseSet)
+        print(f"c xor: {len(xors)} parsed, {len(detected)} detected")
+        xors.extend(detected)
+    varbset = variableNames(clauseSet)
 
     # TODO: find a satisfying instance (or return unsat) and print it out
     print("c solving", inputFile)
-    # Constructs the Initial Empty Set of Solution
-    preSolution = set()
+    # Counting runs on the formula as given, since preprocessing keeps
+    # satisfiability but not the number of models
+    if arguments.count:
+        counter = ModelCounter(clauseSet, int(arguments.countCacheMb * (1 << 20)))
+        numModels = counter.count()
+        print("c", counter)
+        print(f"s {'SATISFIABLE' if numModels else 'UNSATISFIABLE'}")
+        print("c s type mc")
+        print(f"c s exact arb int {numModels}")
+        sys.exit(0)
+    # A formula answered before is printed straight from the result cache
+    resultCache = None
+    if arguments.resultCache is not None:
+        resultCache = ResultCache(arguments.resultCache, int(arguments.resultCacheMb * (1 << 20)))
+        formulaKey = fingerprint(clauseSet)
+        cached = resultCache.lookup(clauseSet, formulaKey)
+        if cached is not None:
+            print("c", resultCache)
+            isSat, model = cached
+            printOutput(completeSolve(varbset, set(map(str, model))) if isSat else None)
+            sys.exit(0)
+    # Simplifies the formula before search, keeping what is needed to
+    # rebuild a model of the original formula
+    stats = None
+    if arguments.stats or arguments.progress is not None:
+        stats = SearchStats(arguments.progress)
+    preprocessor = None
+    searchClauses = clauseSet
+    if arguments.preprocess:
+        # Variables of the XORs must keep their meaning in the clauses
+        preprocessor = Preprocessor(clauseSet, {abs(lit) for lits in xors for lit in lits},
+                                    probeSeconds=arguments.probeSeconds)
+        if stats is not None:
+            with stats.phase("preprocess"):
+                preprocessor.run()
+        else:
+            preprocessor.run()
+        print("c", preprocessor.stats)
+        if preprocessor.probeStats is not None:
+            print("c", preprocessor.probeStats)
+        searchClauses = preprocessor.toArena()
+
     # Retrieves the Result from the Solver
-    (solution, isSat) = solve(clauseSet, preSolution)
+    maxLearntBytes = None if arguments.maxLearntMb is None else int(arguments.maxLearntMb * (1 << 20))
+    localResult = None
+    if arguments.localSearch is not None:
+        localResult = LocalSearch(searchClauses, arguments.localSearch, arguments.seed).solve(
+            arguments.maxFlips, arguments.localSeconds)
+        print("c", localResult)
+    if localResult is not None and localResult.isSat:
+        isSat = True
+        model = localResult.model
+    elif arguments.portfolio is not None:
+        result = solvePortfolio(searchClauses, arguments.portfolio, arguments.seed,
+                                arguments.heuristic, arguments.restarts, arguments.phaseSaving,
+                                arguments.maxLearnts, maxLearntBytes)
+        print("c", result)
+        isSat = result.isSat
+        model = result.model
+    elif arguments.cubes is not None:
+        result = solveCubes(searchClauses, arguments.cubes, arguments.jobs,
+                            heuristic=arguments.heuristic, seed=arguments.seed,
+                            restarts=arguments.restarts, phaseSaving=arguments.phaseSaving)
+        for cubeResult in result.solved:
+            print("c", cubeResult)
+        print("c", result)
+        isSat = result.isSat
+        model = result.model
+    else:
+        solver = Solver(searchClauses, arguments.mode, arguments.heuristic, arguments.seed,
+                        arguments.restarts, arguments.phaseSaving, arguments.maxLearnts, maxLearntBytes,
+                        arguments.pureLiterals)
+        maxMemory = None if arguments.maxMemoryMb is None else int(arguments.maxMemoryMb * (1 << 20))
+        if arguments.inprocessProbe is not None:
+            solver.prober = Prober(arguments.inprocessProbe)
+        if xors:
+            solver.addXors(xors)
+        solver.budget = Budget(arguments.timeLimit, arguments.maxConflicts, arguments.maxDecisions,
+                               arguments.maxPropagations, maxMemory)
+        # Interrupting the search still reports what it got through
+        for signalNumber in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signalNumber, lambda number, frame: solver.budget.cancel())
+        if stats is not None:
+            stats.attach(solver)
+        isSat = solver.solve()
+        if stats is not None:
+            stats.detach()
+        if isSat is None:
+            print("c", solver.budget)
+        print(f"c decisions {solver.decisions} conflicts {solver.conflicts} restarts {solver.restarts} "
+              f"propagations {solver.propagations} backtracks {solver.backtracks} "
+              f"pure {solver.pureAssignments}")
+        print(f"c learnts {len(solver.clauseDb)} deleted {solver.clauseDb.deleted} "
+              f"reductions {solver.clauseDb.reductions}")
+        if solver.prober is not None:
+            print("c", solver.prober.stats)
+        if solver.gauss is not None:
+            print("c", solver.gauss.stats)
+        if arguments.stats:
+            print("c", stats)
+            print("c memory", " ".join(f"{name} {value}" for name, value
+                                       in stats.snapshot()["memory"].items()))
+        model = solver.model
 
     # If the solution is SAT, there is a possibility that the solution set
     # does not contain all literals. This is because some literals, regardless
     # of what their value is assigned, is entirely irrelevant to the outcome of
     # satisfiability. These Literals are default assigned with true.
     if isSat:
-        printOutput(completeSolve(varbset, solution))
+        if preprocessor is not None:
+            model = preprocessor.extendModel(model)
+        completeSolution = completeSolve(varbset, set(map(str, model)))
+        if resultCache is not None:
+            resultCache.store(clauseSet, True, list(map(int, completeSolution)), formulaKey)
+            print("c", resultCache)
+        # Models found with XOR reasoning are always checked, against the
+        # clauses as given and every XOR
+        if arguments.verify or xors:
+            unsatisfied = unsatisfiedClauses(clauseSet, completeSolution)
+            if unsatisfied:
+                sys.exit(f"c model check failed, clauses {unsatisfied[:10]} are unsatisfied")
+            model = list(map(int, completeSolution))
+            violated = [i for i, lits in enumerate(xors) if not xorSatisfied(lits, model)]
+            if violated:
+                sys.exit(f"c model check failed, xors {violated[:10]} are unsatisfied")
+            print("c model verified")
+        printOutput(completeSolution)
+    # A search that ran out of budget knows neither way
+    elif isSat is None:
+        print("s UNKNOWN")
     # If the solution is UNSAT, pass None to the printOutput
     else:
+        if resultCache is not None:
+            resultCache.store(clauseSet, False, key=formulaKey)
+            print("c", resultCache)
         printOutput(None)
\ No newline at end of file
@@ -0,0 +1,221 @@
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, TextIO
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Search Statistics:
+# The solver always keeps plain integer counters (decisions, propagations,
+# conflicts, backtracks, restarts), which cost one addition each. Timing the
+# phases of the search, progress lines and monitoring callbacks are only paid
+# for once a SearchStats is attached to a solver: attach wraps the solver's
+# propagate, analyze, pickBranchLit and clause database reduce methods on that
+# one instance, and detach puts the originals back, so a solver without
+# statistics runs exactly the code it always did.
+#
+# The phases of the original recursive solver map onto the search as follows:
+# unitElim and hasEmptyClause are unit propagation, which finds the empty
+# clause as a conflict; pickVar is pickBranchLit; pureElim and the other
+# simplifications run in the preprocessor, timed with the phase context.
+
+# Phases timed by an attached SearchStats
+PHASES = ("preprocess", "propagate", "analyze", "pick", "reduce")
+
+# Peak resident set size of this process in bytes, if the platform tells
+def peakRss() -> int:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+# Current resident set size of this process in bytes, where /proc has it
+def currentRss() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+class SearchStats:
+    """
+        progressInterval is the number of seconds between progress lines
+        written to output, None for no progress lines.
+    """
+    def __init__(self, progressInterval: float = None, output: TextIO = None):
+        self.progressInterval = progressInterval
+        self.output = output if output is not None else sys.stdout
+        self.times: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.calls: Dict[str, int] = dict.fromkeys(PHASES, 0)
+        self.solver = None
+        self.start = time.perf_counter()
+        # Time detach was called, which freezes the elapsed time
+        self.end = None
+        # [callback, interval, next sample time] of every registered hook
+        self.callbacks: List[list] = []
+        self.nextProgress = None
+        self.nextSample = float("inf")
+        self._originals = {}
+
+    """
+        Registers callback to be called with a snapshot every interval
+        seconds while the attached solver runs, and once more at the end.
+    """
+    def addCallback(self, callback: Callable[[dict], None], interval: float = 1.0):
+        self.callbacks.append([callback, interval, time.perf_counter() + interval])
+        self._schedule()
+
+    def removeCallback(self, callback: Callable[[dict], None]):
+        self.callbacks = [hook for hook in self.callbacks if hook[0] != callback]
+        self._schedule()
+
+    # Earliest time at which a progress line or a callback is due
+    def _schedule(self):
+        due = [hook[2] for hook in self.callbacks]
+        if self.nextProgress is not None:
+            due.append(self.nextProgress)
+        self.nextSample = min(due, default=float("inf"))
+
+    # Wraps method so that its running time is added to phase
+    def _timed(self, phase: str, method: Callable) -> Callable:
+        times = self.times
+        calls = self.calls
+        clock = time.perf_counter
+
+        def timed(*args):
+            before = clock()
+            try:
+                return method(*args)
+            finally:
+                times[phase] += clock() - before
+                calls[phase] += 1
+        return timed
+
+    """
+        Instruments solver until detach is called. Progress lines and
+        callbacks are checked after every propagation.
+    """
+    def attach(self, solver):
+        self.detach()
+        self.solver = solver
+        self.start = time.perf_counter()
+        self.end = None
+        if self.progressInterval:
+            self.nextProgress = self.start + self.progressInterval
+        for hook in self.callbacks:
+            hook[2] = self.start + hook[1]
+        self._schedule()
+
+        propagate = self._timed("propagate", solver.propagate)
+        clock = time.perf_counter
+
+        def propagateAndSample():
+            conflict = propagate()
+            if clock() >= self.nextSample:
+                self._sample()
+            return conflict
+
+        self._originals = {(solver, name): getattr(solver, name)
+                           for name in ("propagate", "analyze", "pickBranchLit")}
+        self._originals[(solver.clauseDb, "reduce")] = solver.clauseDb.reduce
+        solver.propagate = propagateAndSample
+        solver.analyze = self._timed("analyze", solver.analyze)
+        solver.pickBranchLit = self._timed("pick", solver.pickBranchLit)
+        solver.clauseDb.reduce = self._timed("reduce", solver.clauseDb.reduce)
+
+    """
+        Restores the solver's own methods and calls every callback with the
+        final snapshot. The counters of the solver stay readable.
+    """
+    def detach(self):
+        if not self._originals:
+            return
+        self.end = time.perf_counter()
+        for owner, name in self._originals:
+            # The originals were bound methods of the class, so dropping the
+            # instance attribute brings them back
+            owner.__dict__.pop(name, None)
+        self._originals = {}
+        snapshot = self.snapshot()
+        for hook in self.callbacks:
+            hook[0](snapshot)
+
+    # Writes a progress line and runs the callbacks that are due
+    def _sample(self):
+        now = time.perf_counter()
+        snapshot = self.snapshot()
+        if self.nextProgress is not None and now >= self.nextProgress:
+            print("c progress", self.progressLine(snapshot), file=self.output, flush=True)
+            self.nextProgress = now + self.progressInterval
+        for hook in self.callbacks:
+            if now >= hook[2]:
+                hook[0](snapshot)
+                hook[2] = now + hook[1]
+        self._schedule()
+
+    """
+        Times the body of a with statement as the given phase, for work
+        done outside the solver such as preprocessing.
+    """
+    @contextmanager
+    def phase(self, name: str):
+        before = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.times[name] = self.times.get(name, 0.0) + time.perf_counter() - before
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    """
+        Counters, phase times and memory use at this moment, as a dict of
+        plain values. Memory is in bytes; any figure the platform cannot
+        provide is None.
+    """
+    def snapshot(self) -> dict:
+        solver = self.solver
+        end = self.end if self.end is not None else time.perf_counter()
+        snapshot = {"seconds": end - self.start}
+        if solver is not None:
+            snapshot.update(
+                decisions=solver.decisions, propagations=solver.propagations,
+                conflicts=solver.conflicts, backtracks=solver.backtracks,
+                restarts=solver.restarts, learnts=len(solver.clauseDb),
+                deleted=solver.clauseDb.deleted, trail=len(solver.trail),
+                level=solver.decisionLevel())
+        snapshot["times"] = dict(self.times)
+        snapshot["calls"] = dict(self.calls)
+        snapshot["memory"] = {
+            "arena": solver.clauses.nbytes() if solver is not None else None,
+            "learnts": solver.clauseDb.learntBytes if solver is not None else None,
+            "rss": currentRss(), "peakRss": peakRss()}
+        return snapshot
+
+    """
+        The counters of a snapshot on one line, with the rates per second.
+    """
+    @staticmethod
+    def progressLine(snapshot: dict) -> str:
+        seconds = max(snapshot["seconds"], 1e-9)
+        rss = snapshot["memory"]["rss"] or snapshot["memory"]["peakRss"]
+        memory = f" rss {rss / (1 << 20):.1f}MB" if rss else ""
+        return (f"{snapshot['seconds']:.1f}s decisions {snapshot.get('decisions', 0)} "
+                f"conflicts {snapshot.get('conflicts', 0)} "
+                f"({snapshot.get('conflicts', 0) / seconds:.0f}/s) "
+                f"propagations {snapshot.get('propagations', 0)} "
+                f"({snapshot.get('propagations', 0) / seconds:.0f}/s) "
+                f"restarts {snapshot.get('restarts', 0)} learnts {snapshot.get('learnts', 0)}"
+                f"{memory}")
+
+    def __repr__(self):
+        snapshot = self.snapshot()
+        phases = " ".join(f"{name} {seconds:.3f}s" for name, seconds in self.times.items()
+                          if self.calls.get(name))
+        return (f"stats: {snapshot.get('decisions', 0)} decisions, "
+                f"{snapshot.get('propagations', 0)} propagations, "
+                f"{snapshot.get('conflicts', 0)} conflicts, "
+                f"{snapshot.get('backtracks', 0)} backtracks, "
+                f"{snapshot.get('restarts', 0)} restarts; time {phases or 'none'}")
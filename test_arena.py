@@ -0,0 +1,80 @@
+import unittest
+from arena import ClauseArena
+from solver import *
+from formula_constructor import constructFormula
+
+# Testing for the Compact Clause Arena and the Solver functions running on it
+# Run tests using 'python test_arena.py'
+
+class clauseArenaTest(unittest.TestCase):
+    def test_from_lists(self):
+        arena = ClauseArena.fromLists([[1, -3], [], [2, 3, -1]])
+        self.assertEqual(len(arena), 3)
+        self.assertEqual(arena.numVars, 3)
+        self.assertEqual(list(arena.clause(2)), [2, 3, -1])
+        self.assertEqual(arena.clauseLength(1), 0)
+        self.assertEqual([arena.clauseId(i) for i in range(3)], [0, 1, 2])
+
+    def test_select_keeps_ids(self):
+        arena = ClauseArena.fromLists([[1], [2], [3], [4]])
+        selected = arena.select([1, 3])
+        self.assertEqual(selected.toLists(), [[2], [4]])
+        self.assertEqual([selected.clauseId(i) for i in range(2)], [1, 3])
+
+    def test_add_clause(self):
+        arena = ClauseArena.fromLists([[1, 2]])
+        position = arena.addClause([-7], 5)
+        self.assertEqual(position, 1)
+        self.assertEqual(arena.clauseId(1), 5)
+        self.assertEqual(arena.numVars, 7)
+
+    def test_copy_is_independent(self):
+        arena = ClauseArena.fromLists([[1, 2]])
+        copied = arena.copy()
+        copied.addClause([3])
+        self.assertEqual(len(arena), 1)
+        self.assertEqual(len(copied), 2)
+
+    def test_compact(self):
+        arena = ClauseArena.fromLists([[1], [2, 3], [4], [5, 6, 7]])
+        remap = arena.compact(bytearray([1, 0, 1, 0]))
+        self.assertEqual(arena.toLists(), [[1], [4]])
+        self.assertEqual(list(remap), [0, -1, 1, -1])
+
+    def test_nbytes(self):
+        arena = ClauseArena.fromLists([[1, 2, 3], [4]])
+        self.assertEqual(arena.nbytes(), 4 * 4 + 8 * 3)
+
+class arenaRoundTripTest(unittest.TestCase):
+    def test_round_trip(self):
+        formula = constructFormula({3: [1, -2], 7: [], 9: [5]})
+        self.assertEqual(fromArena(toArena(formula)), formula)
+
+class solverOnArenaTest(unittest.TestCase):
+    def test_unit_elim(self):
+        arena = ClauseArena.fromLists([[1, 9, 8, 3], [3], [-1, -3], [-10], [4, -10, 6, 3], [1, 2, 10]])
+        solution = set()
+        result = unitElim(arena, solution)
+        self.assertEqual(result.toLists(), [[3], [-1], [-10], [1, 2]])
+        self.assertEqual([result.clauseId(i) for i in range(4)], [1, 2, 3, 5])
+        self.assertEqual(solution, {'3', '-10'})
+
+    def test_pure_elim(self):
+        arena = ClauseArena.fromLists([[1, 4, -8], [3, 1, 5], [8, -4]])
+        solution = set()
+        result = pureElim(arena, solution)
+        self.assertEqual(result.toLists(), [[8, -4]])
+        self.assertEqual(solution, {'1', '3', '5'})
+
+    def test_has_empty(self):
+        self.assertTrue(hasEmptyClause(ClauseArena.fromLists([[1], []])))
+        self.assertFalse(hasEmptyClause(ClauseArena.fromLists([[1], [2]])))
+
+    def test_solve(self):
+        arena = ClauseArena.fromLists([[1], [-1, 3]])
+        (solution, isSat) = solve(arena, set())
+        self.assertTrue(isSat)
+        self.assertEqual(solution, {'1', '3'})
+
+if __name__ == "__main__":
+    unittest.main()
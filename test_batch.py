@@ -0,0 +1,70 @@
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from batch import ERROR, SAT, TIMEOUT, UNSAT, collectFiles, modelHash, runBatch, solveFile
+from generators import pigeonhole
+
+# Testing for Batch Solving
+# Run tests using 'python test_batch.py'
+
+def writeCnf(path: str, clauses):
+    numVars = max((abs(lit) for clause in clauses for lit in clause), default=0)
+    with open(path, "w") as f:
+        f.write(f"p cnf {numVars} {len(clauses)}\n")
+        for clause in clauses:
+            f.write(" ".join(map(str, clause)) + " 0\n")
+
+class batchTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.directory, "nested"))
+        self.sat = os.path.join(self.directory, "sat.cnf")
+        self.unsat = os.path.join(self.directory, "nested", "unsat.cnf")
+        writeCnf(self.sat, [[1, 2], [-1], [2, 3]])
+        writeCnf(self.unsat, [[1], [-1]])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_collect_files(self):
+        self.assertEqual(collectFiles([self.directory]), [self.sat, self.unsat])
+        self.assertEqual(collectFiles([os.path.join(self.directory, "*.cnf")]), [self.sat])
+        self.assertEqual(collectFiles([os.path.join(self.directory, "**", "*.cnf")]),
+                         [self.unsat, self.sat])
+
+    def test_solve_file(self):
+        record = solveFile(self.sat, models=True)
+        self.assertEqual(record["status"], SAT)
+        self.assertEqual(record["model"], [-1, 2, 3])
+        self.assertEqual(solveFile(self.sat)["modelHash"], modelHash([-1, 2, 3]))
+        record = solveFile(self.unsat)
+        self.assertEqual(record["status"], UNSAT)
+        self.assertNotIn("modelHash", record)
+        self.assertEqual(record["stats"]["clauses"], 2)
+
+    def test_error_record(self):
+        record = solveFile(os.path.join(self.directory, "missing.cnf"))
+        self.assertEqual(record["status"], ERROR)
+        self.assertIn("FileNotFoundError", record["error"])
+
+    def test_run_batch(self):
+        output = io.StringIO()
+        statuses = runBatch(collectFiles([self.directory]), output, jobs=2)
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(sorted(record["file"] for record in records), [self.unsat, self.sat])
+        self.assertEqual(statuses, {SAT: 1, UNSAT: 1})
+
+    def test_timeout(self):
+        hard = os.path.join(self.directory, "hard.cnf")
+        writeCnf(hard, pigeonhole(9))
+        output = io.StringIO()
+        statuses = runBatch([hard, self.sat], output, jobs=1, timeout=0.3)
+        records = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([record["status"] for record in records], [TIMEOUT, SAT])
+        self.assertEqual(statuses[TIMEOUT], 1)
+
+if __name__ == "__main__":
+    unittest.main()
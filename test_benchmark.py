@@ -0,0 +1,61 @@
+import unittest
+from benchmark import compareResults, measure, parseArguments, runSuite
+from generators import pigeonhole
+
+# Testing for the Benchmark Harness
+# Run tests using 'python test_benchmark.py'
+
+def results(**instances):
+    return {"instances": instances}
+
+class benchmarkTest(unittest.TestCase):
+    def test_heuristic_choices(self):
+        self.assertEqual(parseArguments(["run", "--heuristic", "jw"]).heuristic, "jw")
+        with self.assertRaises(SystemExit):
+            parseArguments(["run", "--heuristic", "vsdis"])
+
+    def test_measure(self):
+        record = measure(pigeonhole(4), repeats=2)
+        self.assertEqual(record["status"], "UNSAT")
+        self.assertGreater(record["conflicts"], 0)
+        self.assertGreater(record["seconds"], 0)
+        self.assertIn("peakRss", record)
+
+    def test_measure_records_dead_runs(self):
+        # The worker raises on the unknown mode before it can answer
+        record = measure(pigeonhole(3), mode="unknown")
+        self.assertEqual(record["status"], "ERROR")
+        self.assertIsNone(record["seconds"])
+        self.assertNotEqual(record["exitCode"], 0)
+
+    def test_run_suite(self):
+        suite = runSuite(["parity-sat-20"])
+        self.assertEqual(list(suite["instances"]), ["parity-sat-20"])
+        self.assertEqual(suite["instances"]["parity-sat-20"]["status"], "SAT")
+
+    def test_compare_flags_slowdowns(self):
+        baseline = results(a={"status": "SAT", "seconds": 1.0, "peakRss": 100},
+                           b={"status": "SAT", "seconds": 0.01},
+                           c={"status": "UNSAT", "seconds": 1.0})
+        current = results(a={"status": "SAT", "seconds": 1.5, "peakRss": 110},
+                          b={"status": "SAT", "seconds": 0.03},
+                          c={"status": "SAT", "seconds": 1.0})
+        flagged = {(c.name, c.metric) for c in compareResults(baseline, current) if c.regressed}
+        # b triples but stays within the noise floor
+        self.assertEqual(flagged, {("a", "seconds"), ("c", "status")})
+
+    def test_compare_skips_errored_runs(self):
+        baseline = results(a={"status": "SAT", "seconds": 1.0, "peakRss": 100})
+        current = results(a={"status": "ERROR", "seconds": None, "peakRss": None})
+        comparisons = compareResults(baseline, current)
+        self.assertEqual([(c.metric, c.regressed) for c in comparisons], [("status", True)])
+
+    def test_compare_flags_memory(self):
+        baseline = results(a={"status": "SAT", "seconds": 1.0, "peakRss": 100})
+        current = results(a={"status": "SAT", "seconds": 1.0, "peakRss": 200})
+        comparisons = compareResults(baseline, current, threshold=0.5)
+        self.assertEqual([c.metric for c in comparisons if c.regressed], ["peakRss"])
+        self.assertEqual(comparisons[-1].ratio, 2.0)
+
+if __name__ == "__main__":
+    unittest.main()
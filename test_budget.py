@@ -0,0 +1,98 @@
+import multiprocessing
+import threading
+import time
+import unittest
+import budget as budgetModule
+from budget import CANCELLED, CONFLICTS, DECISIONS, MEMORY, PROPAGATIONS, TIME, Budget
+from generators import pigeonhole, randomKSat
+from search import DPLL, Solver
+
+# Testing for the Resource Budgets
+# Run tests using 'python test_budget.py'
+
+class budgetTest(unittest.TestCase):
+    def solveWith(self, budget: Budget, arena=None, mode="cdcl") -> Solver:
+        solver = Solver(arena or pigeonhole(7), mode)
+        solver.budget = budget
+        self.assertIsNone(solver.solve())
+        return solver
+
+    def test_conflict_limit(self):
+        budget = Budget(conflicts=50)
+        solver = self.solveWith(budget)
+        self.assertEqual(solver.conflicts, 50)
+        self.assertEqual(budget.reason, CONFLICTS)
+        self.assertIsNone(solver.model)
+        self.assertTrue(solver.ok)
+
+    def test_decision_and_propagation_limits(self):
+        budget = Budget(decisions=30)
+        self.assertEqual(self.solveWith(budget).decisions, 30)
+        self.assertEqual(budget.reason, DECISIONS)
+        budget = Budget(propagations=200)
+        self.assertGreaterEqual(self.solveWith(budget).propagations, 200)
+        self.assertEqual(budget.reason, PROPAGATIONS)
+
+    def test_dpll(self):
+        budget = Budget(conflicts=20)
+        self.assertEqual(self.solveWith(budget, mode=DPLL).conflicts, 20)
+
+    def test_time_limit(self):
+        budget = Budget(seconds=0.1)
+        start = time.monotonic()
+        self.solveWith(budget)
+        self.assertLess(time.monotonic() - start, 2.0)
+        self.assertEqual(budget.reason, TIME)
+        self.assertIn("stopped by time", repr(budget))
+
+    def test_memory_limit(self):
+        budget = Budget(memory=1)
+        self.solveWith(budget)
+        self.assertEqual(budget.reason, MEMORY)
+
+    def test_limits_are_per_solve(self):
+        solver = Solver(pigeonhole(5))
+        solver.budget = Budget(conflicts=10)
+        self.assertIsNone(solver.solve())
+        self.assertIsNone(solver.solve())
+        self.assertEqual(solver.conflicts, 20)
+        solver.budget = None
+        self.assertFalse(solver.solve())
+
+    def test_answers_within_budget(self):
+        for seed in range(5):
+            arena = randomKSat(40, seed=seed)
+            solver = Solver(arena, seed=seed)
+            solver.budget = Budget(seconds=60, conflicts=10 ** 6)
+            self.assertEqual(solver.solve(), Solver(arena, seed=seed).solve())
+            self.assertIsNone(solver.budget.reason)
+
+    def test_cancel_from_thread(self):
+        budget = Budget()
+        timer = threading.Timer(0.1, budget.cancel)
+        timer.start()
+        try:
+            self.solveWith(budget)
+        finally:
+            timer.cancel()
+        self.assertEqual(budget.reason, CANCELLED)
+
+    def test_cancel_event_from_process(self):
+        event = multiprocessing.get_context().Event()
+        event.set()
+        budget = Budget(cancelEvent=event)
+        self.solveWith(budget)
+        self.assertEqual(budget.reason, CANCELLED)
+        self.assertTrue(budget.cancelled())
+
+    def test_expensive_checks_are_spaced(self):
+        budget = Budget(seconds=0)
+        budget.start(Solver(pigeonhole(2)))
+        solver = Solver(pigeonhole(2))
+        self.assertTrue(budget.exhausted(solver))
+        for _ in range(budgetModule.CHECK_INTERVAL - 1):
+            self.assertFalse(budget.exhausted(solver))
+        self.assertTrue(budget.exhausted(solver))
+
+if __name__ == "__main__":
+    unittest.main()
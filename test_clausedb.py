@@ -0,0 +1,109 @@
+import random
+import unittest
+from arena import ClauseArena
+from clausedb import ClauseDatabase
+from generators import pigeonhole
+from search import CDCL, Solver
+from test_search import bruteForceSat, satisfies
+
+# Testing for the Learned Clause Database
+# Run tests using 'python test_clausedb.py'
+
+def learntSolver(**options):
+    # Three learned clauses on top of one original clause
+    solver = Solver(ClauseArena.fromLists([[1, 2, 3]], numVars=9), CDCL, **options)
+    for clause, lbd in (([4, 5, 6], 3), ([-4, 5, 7], 2), ([6, -7, 8, 9], 4)):
+        solver.attachClause(clause)
+        solver.clauseDb.onLearnt(len(clause), lbd)
+    return solver
+
+class clauseDatabaseTest(unittest.TestCase):
+    def test_reduce_keeps_glue(self):
+        solver = learntSolver()
+        solver.clauseDb.reduce(solver)
+        # Half of the three learned clauses goes, worst LBD first
+        self.assertEqual(solver.clauses.toLists(), [[1, 2, 3], [4, 5, 6], [-4, 5, 7]])
+        self.assertEqual(solver.clauseDb.lbd, [3, 2])
+        self.assertEqual(solver.clauseDb.deleted, 1)
+
+    def test_reduce_keeps_reasons(self):
+        solver = learntSolver()
+        solver.newDecisionLevel()
+        for lit in (-6, 7, -8):
+            solver.assign(lit, -1)
+        self.assertEqual(solver.propagate(), -1)
+        # [6, -7, 8, 9] forces 9 and has the worst LBD, but is locked
+        solver.clauseDb.reduce(solver)
+        self.assertEqual(solver.clauseDb.deleted, 1)
+        reason = solver.reason[9]
+        self.assertEqual(solver.clauses.clause(reason)[0], 9)
+        self.assertEqual(sorted(solver.clauses.clause(reason)), [-7, 6, 8, 9])
+
+    def test_watches_rebuilt(self):
+        solver = learntSolver()
+        solver.clauseDb.reduce(solver)
+        for position in range(len(solver.clauses)):
+            clause = solver.clauses.clause(position)
+            self.assertIn(position, solver.watches[clause[0]])
+            self.assertIn(position, solver.watches[clause[1]])
+
+    def test_cap_overrides_glue(self):
+        solver = learntSolver(maxLearnts=1)
+        self.assertTrue(solver.clauseDb.overCap())
+        solver.clauseDb.reduce(solver)
+        self.assertLessEqual(len(solver.clauseDb), 1)
+        self.assertEqual(len(solver.clauses), 1 + len(solver.clauseDb))
+
+    def test_reason_clauses_go_first(self):
+        solver = learntSolver()
+        for clause in ([1, -4, -5], [2, -6, 7]):
+            solver.attachClause(clause)
+            solver.clauseDb.onReason(len(clause))
+        self.assertEqual(len(solver.clauseDb), 3)
+        self.assertEqual(solver.clauseDb.learntBytes, 10 * 4 + 3 * 8)
+        solver.newDecisionLevel()
+        for lit in (4, 5):
+            solver.assign(lit, -1)
+        solver.assign(1, len(solver.clauses) - 2)
+        solver.clauseDb.reduce(solver)
+        # The unlocked reason clause goes on top of the worst learned clause
+        self.assertEqual(solver.clauses.toLists(),
+                         [[1, 2, 3], [4, 5, 6], [-4, 5, 7], [1, -4, -5]])
+        self.assertEqual(solver.clauseDb.deleted, 1)
+        self.assertEqual(len(solver.clauseDb), 2)
+        self.assertEqual(solver.clauseDb.reasonBytes, 3 * 4 + 8)
+
+    def test_byte_accounting(self):
+        database = ClauseDatabase(maxBytes=30)
+        database.onLearnt(3, 2)
+        self.assertEqual(database.learntBytes, 3 * 4 + 8)
+        self.assertFalse(database.overCap())
+        database.onLearnt(3, 2)
+        self.assertTrue(database.overCap())
+
+class boundedSolveTest(unittest.TestCase):
+    def test_cap_enforced_during_search(self):
+        solver = Solver(pigeonhole(6), CDCL, maxLearnts=50)
+        self.assertFalse(solver.solve())
+        self.assertGreater(solver.clauseDb.reductions, 0)
+        self.assertLessEqual(len(solver.clauseDb), 51)
+
+    def test_byte_cap_enforced_during_search(self):
+        solver = Solver(pigeonhole(6), CDCL, maxLearntBytes=2000)
+        self.assertFalse(solver.solve())
+        self.assertLessEqual(solver.clauseDb.learntBytes, 2000 + 8 + 4 * solver.numVars)
+
+    def test_random_with_tiny_cap(self):
+        rng = random.Random(13)
+        for i in range(60):
+            numVars = 10
+            clauses = [[rng.choice((1, -1)) * v for v in rng.sample(range(1, numVars + 1), 3)]
+                       for k in range(rng.randint(30, 50))]
+            solver = Solver(ClauseArena.fromLists(clauses), CDCL, maxLearnts=2)
+            isSat = solver.solve()
+            self.assertEqual(isSat, bruteForceSat(numVars, clauses))
+            if isSat:
+                self.assertTrue(satisfies(solver.model, clauses))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import shutil
+import tempfile
+import unittest
+from cnfcache import cachePath, loadCache, parseCached, writeCache
+from dimacs import ParseStats, parseDimacs
+from generators import randomKSat, writeDimacs
+from gauss import detectXors
+from preprocess import Preprocessor
+from resultcache import fingerprint
+from search import Solver
+from solver import variableNames
+from verify import unsatisfiedClauses
+
+# Testing for the Binary CNF Cache
+# Run tests using 'python test_cnfcache.py'
+
+class cnfCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.source = os.path.join(self.directory, "formula.cnf")
+        with open(self.source, "w") as f:
+            writeDimacs(randomKSat(50, seed=1), f)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_round_trip(self):
+        arena = parseDimacs(self.source)
+        path = os.path.join(self.directory, "copy.cnfb")
+        writeCache(arena, path, self.source)
+        for mapped in (False, True):
+            loaded = loadCache(path, self.source, mapped)
+            self.assertEqual(loaded.numVars, arena.numVars)
+            self.assertEqual(loaded.toLists(), arena.toLists())
+
+    def test_written_on_first_use(self):
+        stats = ParseStats()
+        first = parseCached(self.source, stats=stats)
+        self.assertTrue(os.path.exists(cachePath(self.source)))
+        self.assertGreater(stats.numLiterals, 0)
+        second = parseCached(self.source, stats=stats)
+        self.assertEqual(second.toLists(), first.toLists())
+        self.assertEqual(stats.numBytes, os.path.getsize(cachePath(self.source)))
+
+    def test_cache_directory(self):
+        cacheDir = os.path.join(self.directory, "cache")
+        parseCached(self.source, cacheDir)
+        self.assertEqual(os.listdir(cacheDir), [os.path.basename(cachePath(self.source, cacheDir))])
+        self.assertIsNotNone(loadCache(cachePath(self.source, cacheDir), self.source))
+
+    def test_invalidated_by_source_change(self):
+        parseCached(self.source)
+        with open(self.source, "w") as f:
+            f.write("p cnf 2 1\n1 -2 0\n")
+        os.utime(self.source, ns=(1, 1))
+        self.assertIsNone(loadCache(cachePath(self.source), self.source))
+        self.assertEqual(parseCached(self.source).toLists(), [[1, -2]])
+        self.assertIsNotNone(loadCache(cachePath(self.source), self.source))
+
+    def test_corrupt_cache_ignored(self):
+        path = cachePath(self.source)
+        for content in (b"", b"CNFB", b"x" * 100):
+            with open(path, "wb") as f:
+                f.write(content)
+            self.assertIsNone(loadCache(path, self.source))
+        self.assertEqual(parseCached(self.source).toLists(), parseDimacs(self.source).toLists())
+
+    def test_mapped_arena_solves(self):
+        parseCached(self.source)
+        arena = parseCached(self.source, mapped=True)
+        self.assertIsInstance(arena.lits, memoryview)
+        solver = Solver(arena, seed=0)
+        self.assertEqual(solver.solve(), Solver(parseDimacs(self.source), seed=0).solve())
+
+    # Everything solver.py does with a formula loaded with --cache
+    def test_mapped_arena_in_the_pipeline(self):
+        parsed = parseDimacs(self.source)
+        parseCached(self.source)
+        arena = parseCached(self.source, mapped=True)
+        self.assertEqual(variableNames(arena), variableNames(parsed))
+        self.assertEqual(fingerprint(arena), fingerprint(parsed))
+        self.assertEqual(detectXors(arena), detectXors(parsed))
+        preprocessor = Preprocessor(arena)
+        preprocessor.run()
+        solver = Solver(preprocessor.toArena())
+        if solver.solve():
+            model = preprocessor.extendModel(solver.model)
+            self.assertEqual(unsatisfiedClauses(arena, model), [])
+
+if __name__ == "__main__":
+    unittest.main()
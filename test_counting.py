@@ -0,0 +1,70 @@
+import itertools
+import random
+import unittest
+from arena import ClauseArena
+from counting import ModelCounter, countModels
+from generators import pigeonhole, randomKSat
+
+# Testing for the Model Counter
+# Run tests using 'python test_counting.py'
+
+# Number of models found by trying every assignment
+def bruteForceCount(arena: ClauseArena) -> int:
+    clauses = arena.toLists()
+    count = 0
+    for values in itertools.product((False, True), repeat=arena.numVars):
+        if all(any(values[abs(lit) - 1] == (lit > 0) for lit in clause) for clause in clauses):
+            count += 1
+    return count
+
+class modelCounterTest(unittest.TestCase):
+    def test_small(self):
+        self.assertEqual(countModels(ClauseArena.fromLists([[1, 2]])), 3)
+        self.assertEqual(countModels(ClauseArena.fromLists([[1], [-1]])), 0)
+        self.assertEqual(countModels(ClauseArena.fromLists([[1, 2], []])), 0)
+        self.assertEqual(countModels(ClauseArena.fromLists([[1, -1], [2, 2]])), 2)
+
+    def test_free_variables(self):
+        # Variables in no clause, or only in tautologies, double the count
+        self.assertEqual(countModels(ClauseArena(numVars=100)), 2 ** 100)
+        arena = ClauseArena.fromLists([[1, 2], [3, -3]], numVars=70)
+        self.assertEqual(countModels(arena), 3 * 2 ** 68)
+
+    def test_independent_components_multiply(self):
+        blocks = [[[3 * b + 1, 3 * b + 2], [-(3 * b + 2), 3 * b + 3]] for b in range(20)]
+        arena = ClauseArena.fromLists(itertools.chain.from_iterable(blocks))
+        counter = ModelCounter(arena)
+        self.assertEqual(counter.count(), 4 ** 20)
+        self.assertLessEqual(counter.decisions, 40)
+
+    def test_unsatisfiable(self):
+        self.assertEqual(countModels(pigeonhole(4)), 0)
+
+    def test_against_brute_force(self):
+        rng = random.Random(5)
+        for _ in range(150):
+            numVars = rng.randint(1, 10)
+            clauses = [[rng.choice((1, -1)) * rng.randint(1, numVars)
+                        for _ in range(rng.randint(1, 3))] for _ in range(rng.randint(0, 25))]
+            arena = ClauseArena.fromLists(clauses, numVars=numVars)
+            self.assertEqual(countModels(arena), bruteForceCount(arena), clauses)
+
+    def test_cache_hits_and_eviction(self):
+        arena = randomKSat(14, ratio=2.0, seed=3)
+        expected = bruteForceCount(arena)
+        counter = ModelCounter(arena)
+        self.assertEqual(counter.count(), expected)
+        self.assertGreater(counter.cacheHits, 0)
+        tiny = ModelCounter(arena, cacheBytes=1000)
+        self.assertEqual(tiny.count(), expected)
+        self.assertGreater(tiny.evictions, 0)
+        self.assertLessEqual(len(tiny.cache), 6)
+
+    def test_deep_chain(self):
+        # x1 -> x2 -> ... -> xn has n + 1 models, found hundreds of levels deep
+        n = 300
+        arena = ClauseArena.fromLists([[-i, i + 1] for i in range(1, n)])
+        self.assertEqual(countModels(arena), n + 1)
+
+if __name__ == "__main__":
+    unittest.main()
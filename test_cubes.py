@@ -0,0 +1,51 @@
+import random
+import unittest
+from arena import ClauseArena
+from cubes import CubeGenerator, solveCubes
+from generators import pigeonhole
+from test_search import bruteForceSat, satisfies
+
+# Testing for Cube and Conquer
+# Run tests using 'python test_cubes.py'
+
+class cubeGeneratorTest(unittest.TestCase):
+    def test_depth_bounds_cubes(self):
+        generator = CubeGenerator(pigeonhole(4), depth=3)
+        cubes = generator.generate()
+        self.assertLessEqual(len(cubes) + generator.refuted, 8)
+        self.assertTrue(all(cube for cube in cubes))
+
+    def test_depth_zero(self):
+        generator = CubeGenerator(ClauseArena.fromLists([[1, 2], [-1, 2]]), depth=0)
+        self.assertEqual(generator.generate(), [[]])
+
+    def test_refuted_formula(self):
+        generator = CubeGenerator(ClauseArena.fromLists([[1], [-1]]))
+        self.assertEqual(generator.generate(), [])
+
+    def test_cubes_preserve_satisfiability(self):
+        rng = random.Random(3)
+        for i in range(40):
+            numVars = rng.randint(3, 9)
+            clauses = [[rng.choice((1, -1)) * v for v in rng.sample(range(1, numVars + 1), 3)]
+                       for k in range(rng.randint(5, 40))]
+            cubes = CubeGenerator(ClauseArena.fromLists(clauses), depth=3).generate()
+            expected = bruteForceSat(numVars, clauses)
+            found = any(bruteForceSat(numVars, clauses + [[lit] for lit in cube]) for cube in cubes)
+            self.assertEqual(found, expected)
+
+class solveCubesTest(unittest.TestCase):
+    def test_sat(self):
+        clauses = [[1, 2, 3], [-1, -2], [-2, -3], [2, 4], [-4, 5]]
+        result = solveCubes(ClauseArena.fromLists(clauses), depth=2, workers=2)
+        self.assertTrue(result.isSat)
+        self.assertTrue(satisfies(result.model, clauses))
+        self.assertTrue(result.solved[-1].isSat)
+
+    def test_unsat(self):
+        result = solveCubes(pigeonhole(5), depth=3, workers=2)
+        self.assertFalse(result.isSat)
+        self.assertEqual(len(result.solved) + result.refuted, result.cubes)
+
+if __name__ == "__main__":
+    unittest.main()
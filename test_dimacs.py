@@ -0,0 +1,127 @@
+import bz2
+import gzip
+import lzma
+import os
+import tempfile
+import unittest
+from dimacs import ParseStats, parseDimacs
+from solver import readInput
+
+# Testing for the Streaming DIMACS Parser
+# Run tests using 'python test_dimacs.py'
+
+def writeTemp(text: str) -> str:
+    handle, path = tempfile.mkstemp(suffix=".cnf")
+    with os.fdopen(handle, "w") as f:
+        f.write(text)
+    return path
+
+class parseDimacsTest(unittest.TestCase):
+    def tearDown(self):
+        if hasattr(self, "path"):
+            os.remove(self.path)
+
+    def test_simple(self):
+        self.path = writeTemp("c  simple.cnf\nc\np cnf 3 2\n1 -3 0\n2 3 -1 0\n")
+        stats = ParseStats()
+        formula = parseDimacs(self.path, stats=stats)
+        self.assertEqual(formula.numVars, 3)
+        self.assertEqual(formula.toLists(), [[1, -3], [2, 3, -1]])
+        self.assertEqual(stats.numClauses, 2)
+        self.assertEqual(stats.numLiterals, 5)
+
+    def test_clause_spans_lines(self):
+        self.path = writeTemp("p cnf 4 2\n1 2\n3\n0 -4\n-1 0\n")
+        formula = parseDimacs(self.path)
+        self.assertEqual(formula.toLists(), [[1, 2, 3], [-4, -1]])
+
+    def test_clauses_share_line(self):
+        self.path = writeTemp("p cnf 3 3\n1 0 -2 0 3 0\n")
+        formula = parseDimacs(self.path)
+        self.assertEqual(formula.toLists(), [[1], [-2], [3]])
+
+    def test_empty_clause(self):
+        self.path = writeTemp("p cnf 1 2\n0\n1 0\n")
+        formula = parseDimacs(self.path)
+        self.assertEqual(formula.toLists(), [[], [1]])
+
+    def test_missing_final_zero(self):
+        self.path = writeTemp("p cnf 2 2\n1 0\n-1 2")
+        formula = parseDimacs(self.path)
+        self.assertEqual(formula.toLists(), [[1], [-1, 2]])
+
+    def test_header_overcounts(self):
+        self.path = writeTemp("p cnf 2 10\n1 0\n-1 2 0\n")
+        formula = parseDimacs(self.path)
+        self.assertEqual(len(formula), 2)
+
+    def test_variables_beyond_header(self):
+        self.path = writeTemp("p cnf 2 1\n1 15 0\n")
+        formula = parseDimacs(self.path)
+        self.assertEqual(formula.numVars, 15)
+
+    def test_satlib_end_marker(self):
+        self.path = writeTemp("p cnf 2 1\n1 2 0\n%\n0\n")
+        formula = parseDimacs(self.path)
+        self.assertEqual(formula.toLists(), [[1, 2]])
+
+    def test_small_chunks(self):
+        lines = ["c random comment", "p cnf 50 200"]
+        expected = []
+        for i in range(200):
+            clause = [((i * 7 + j * 13) % 50 + 1) * (-1 if (i + j) % 3 == 0 else 1)
+                      for j in range(1 + i % 4)]
+            expected.append(clause)
+            lines.append(" ".join(map(str, clause)) + " 0")
+            if i % 50 == 0:
+                lines.append("c another comment")
+        self.path = writeTemp("\n".join(lines) + "\n")
+        for chunkSize in (1, 7, 64, 1 << 20):
+            formula = parseDimacs(self.path, chunkSize)
+            self.assertEqual(formula.toLists(), expected)
+
+    def test_compressed(self):
+        text = b"c compressed\np cnf 3 2\n1 -3 0\n2 3 -1 0\n"
+        for compress in (gzip.compress, bz2.compress, lzma.compress):
+            # Recognised by content, not by the file name
+            handle, path = tempfile.mkstemp(suffix=".cnf")
+            with os.fdopen(handle, "wb") as f:
+                f.write(compress(text))
+            stats = ParseStats()
+            try:
+                formula = parseDimacs(path, chunkSize=5, stats=stats)
+            finally:
+                os.remove(path)
+            self.assertEqual(formula.toLists(), [[1, -3], [2, 3, -1]])
+            self.assertEqual(stats.numBytes, len(text))
+
+    def test_contents_in_memory(self):
+        text = b"p cnf 3 2\n1 -3 0\n2 3 -1 0\n"
+        for data in (text, gzip.compress(text), bytearray(lzma.compress(text))):
+            self.assertEqual(parseDimacs(data, chunkSize=4).toLists(), [[1, -3], [2, 3, -1]])
+
+    def test_xor_lines(self):
+        text = b"p cnf 6 1\nx1 -2 3 0\n1 4 0\nx 6 5 0\n"
+        xors = []
+        formula = parseDimacs(text, chunkSize=5, xors=xors)
+        self.assertEqual(formula.toLists(), [[1, 4]])
+        self.assertEqual(xors, [[1, -2, 3], [6, 5]])
+        self.assertEqual(formula.numVars, 6)
+        # Without a list to collect them they become clauses
+        expanded = parseDimacs(text).toLists()
+        self.assertEqual(len(expanded), 1 + 4 + 2)
+        self.assertIn([-1, -2, -3], expanded)
+        self.assertIn([6, 5], expanded)
+
+class readInputTest(unittest.TestCase):
+    def test_example(self):
+        path = writeTemp("c\np cnf 3 2\n-2 3 0\n1 -2 0\n")
+        varbset, clauseSet = readInput(path)
+        os.remove(path)
+        self.assertEqual(varbset, ["2", "3", "1"])
+        self.assertEqual([c.id for c in clauseSet], [0, 1])
+        self.assertEqual([l.value for l in clauseSet[0].literalSet], ["-2", "3"])
+        self.assertEqual([l.value for l in clauseSet[1].literalSet], ["1", "-2"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import itertools
+import random
+import unittest
+from arena import ClauseArena
+from dimacs import xorClauses
+from gauss import GaussEngine, detectXors, normalizeXor, xorSatisfied
+from generators import parityChain, randomKSat
+from search import DPLL, Solver
+from test_search import bruteForceSat, satisfies
+
+# Testing for Gaussian Elimination on XOR Constraints
+# Run tests using 'python test_gauss.py'
+
+def randomXors(rng: random.Random, numVars: int, count: int, maxLength: int):
+    return [[rng.choice((1, -1)) * var
+             for var in rng.sample(range(1, numVars + 1), rng.randint(1, min(numVars, maxLength)))]
+            for _ in range(count)]
+
+class xorTest(unittest.TestCase):
+    def test_normalize(self):
+        self.assertEqual(normalizeXor([3, -1, 2]), ([1, 2, 3], False))
+        self.assertEqual(normalizeXor([2, 1, -2]), ([1], False))
+        self.assertEqual(normalizeXor([]), ([], True))
+
+    def test_clauses_match_parity(self):
+        for lits in ([1], [-1], [1, 2, 3], [-1, 2, -3, 4], [1, -2, 1]):
+            clauses = xorClauses(lits)
+            variables = sorted({abs(lit) for lit in lits})
+            for values in itertools.product((False, True), repeat=len(variables)):
+                model = [var if value else -var for var, value in zip(variables, values)]
+                self.assertEqual(satisfies(model, clauses), xorSatisfied(lits, model), (lits, model))
+
+    def test_detect(self):
+        arena = parityChain(10, seed=3)
+        xors = detectXors(arena)
+        # Two chains of 9 XORs each, tied together by an equivalence
+        self.assertEqual(len(xors), 19)
+        clauses = arena.toLists()
+        for lits in xors:
+            self.assertTrue(all(clause in clauses or sorted(clause) in map(sorted, clauses)
+                                for clause in xorClauses(lits)), lits)
+
+    def test_detect_ignores_equivalences_alone(self):
+        self.assertEqual(detectXors(ClauseArena.fromLists([[1, -2], [-1, 2], [2, 3]])), [])
+        self.assertEqual(detectXors(randomKSat(50, seed=1)), [])
+
+class gaussEngineTest(unittest.TestCase):
+    def test_inconsistent_rows(self):
+        solver = Solver(ClauseArena(3))
+        solver.addXors([[1, 2], [2, 3], [1, 3]])
+        self.assertFalse(solver.solve())
+
+    def test_unit_rows_fix_variables(self):
+        solver = Solver(ClauseArena.fromLists([[1, 4]]))
+        solver.addXors([[1, 2, 3], [2, 3]])
+        self.assertTrue(solver.solve())
+        self.assertIn(-1, solver.model)
+        self.assertEqual(solver.level[1], 0)
+        self.assertIn(4, solver.model)
+
+    def test_xor_only_variables_are_assigned(self):
+        solver = Solver(ClauseArena.fromLists([[1, 2]]))
+        solver.addXors([[2, 3, 4]])
+        self.assertTrue(solver.solve())
+        self.assertEqual(sorted(map(abs, solver.model)), [1, 2, 3, 4])
+        self.assertTrue(xorSatisfied([2, 3, 4], solver.model))
+
+    def test_parity_chain(self):
+        for satisfiable in (True, False):
+            arena = parityChain(60, satisfiable, seed=1)
+            solver = Solver(arena)
+            solver.addXors(detectXors(arena))
+            self.assertEqual(solver.solve(), satisfiable)
+            self.assertLess(solver.conflicts, 10)
+            if satisfiable:
+                self.assertTrue(satisfies(solver.model, arena.toLists()))
+
+    def test_needs_cdcl(self):
+        with self.assertRaises(ValueError):
+            Solver(ClauseArena(2), mode=DPLL).addXors([[1, 2]])
+        with self.assertRaises(ValueError):
+            Solver(ClauseArena(2), pureLiterals=True).addXors([[1, 2]])
+
+    def test_random_against_brute_force(self):
+        rng = random.Random(7)
+        for _ in range(300):
+            numVars = rng.randint(2, 8)
+            xors = randomXors(rng, numVars, rng.randint(1, 4), 5)
+            clauses = [[rng.choice((1, -1)) * var
+                        for var in rng.sample(range(1, numVars + 1), rng.randint(1, min(numVars, 3)))]
+                       for _ in range(rng.randint(0, 2 * numVars))]
+            solver = Solver(ClauseArena.fromLists(clauses, numVars=numVars))
+            solver.addXors(xors)
+            isSat = solver.solve()
+            expected = bruteForceSat(numVars, clauses + [c for lits in xors for c in xorClauses(lits)])
+            self.assertEqual(isSat, expected, (clauses, xors))
+            if isSat:
+                self.assertTrue(satisfies(solver.model, clauses))
+                self.assertTrue(all(xorSatisfied(lits, solver.model) for lits in xors))
+
+    def test_incremental_against_clauses(self):
+        rng = random.Random(3)
+        for seed in range(15):
+            numVars = 30
+            xors = randomXors(rng, numVars, rng.randint(5, 25), 4)
+            clauses = randomKSat(numVars, ratio=2.5, seed=seed).toLists()
+            reference = Solver(ClauseArena.fromLists(
+                clauses + [c for lits in xors for c in xorClauses(lits)], numVars=numVars))
+            solver = Solver(ClauseArena.fromLists(clauses, numVars=numVars))
+            solver.addXors(xors)
+            self.assertEqual(solver.solve(), reference.solve())
+            assumptions = [rng.choice((1, -1)) * var for var in rng.sample(range(1, numVars + 1), 3)]
+            isSat = solver.solve(assumptions)
+            self.assertEqual(isSat, reference.solve(assumptions))
+            if isSat:
+                self.assertTrue(all(lit in solver.model for lit in assumptions))
+                self.assertTrue(all(xorSatisfied(lits, solver.model) for lits in xors))
+            else:
+                self.assertTrue(set(solver.failedAssumptions) <= set(assumptions))
+            extra = [rng.choice((1, -1)) * var for var in rng.sample(range(1, numVars + 1), 3)]
+            solver.addClause(extra)
+            reference.addClause(extra)
+            self.assertEqual(solver.solve(), reference.solve())
+
+    def test_stats(self):
+        solver = Solver(ClauseArena.fromLists([[1, 2], [-1, 3]]))
+        solver.addXors([[1, 2, 3, 4]])
+        solver.solve()
+        self.assertIsInstance(solver.gauss, GaussEngine)
+        self.assertTrue(repr(solver.gauss.stats).startswith("gauss: 1 rows over 4 variables"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import io
+import os
+import unittest
+from dimacs import parseDimacs
+from generators import (PHASE_TRANSITION, directedTree, graphColouring, parityChain, pigeonhole,
+                        randomKSat, writeDimacs)
+from search import Solver
+from test_dimacs import writeTemp
+from test_search import bruteForceSat, satisfies
+
+# Testing for the Benchmark Formula Generators
+# Run tests using 'python test_generators.py'
+
+def solve(arena):
+    solver = Solver(arena)
+    isSat = solver.solve()
+    if isSat:
+        assert satisfies(solver.model, arena.toLists())
+    return isSat
+
+class generatorsTest(unittest.TestCase):
+    def test_random_k_sat(self):
+        arena = randomKSat(50, 3, seed=2)
+        self.assertEqual(len(arena), round(50 * PHASE_TRANSITION[3]))
+        self.assertTrue(all(len(set(map(abs, clause))) == 3 for clause in arena))
+        self.assertEqual(arena, randomKSat(50, 3, seed=2))
+        self.assertNotEqual(arena, randomKSat(50, 3, seed=3))
+
+    def test_pigeonhole(self):
+        self.assertFalse(solve(pigeonhole(4)))
+        self.assertEqual(pigeonhole(3).numVars, 12)
+
+    def test_parity_chain(self):
+        for numVars in (2, 5, 8):
+            self.assertTrue(solve(parityChain(numVars, True, seed=numVars)))
+            self.assertFalse(solve(parityChain(numVars, False, seed=numVars)))
+
+    def test_graph_colouring(self):
+        # A triangle needs three colours
+        self.assertTrue(bruteForceSat(9, graphColouring(3, 3, degree=2).toLists()))
+        self.assertFalse(bruteForceSat(6, graphColouring(3, 2, degree=2).toLists()))
+
+    def test_directed_tree(self):
+        self.assertTrue(solve(directedTree(4)))
+        self.assertFalse(solve(directedTree(4, rooted=False)))
+
+    def test_write_dimacs(self):
+        arena = randomKSat(10, 3, seed=1)
+        output = io.StringIO()
+        writeDimacs(arena, output, "random")
+        path = writeTemp(output.getvalue())
+        try:
+            self.assertEqual(parseDimacs(path), arena)
+        finally:
+            os.remove(path)
+
+if __name__ == "__main__":
+    unittest.main()
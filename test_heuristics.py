@@ -0,0 +1,79 @@
+import random
+import unittest
+from arena import ClauseArena
+from generators import pigeonhole
+from heuristics import ActivityHeap, HEURISTICS, makeHeuristic
+from search import CDCL, DPLL, Solver
+from test_search import satisfies
+
+# Testing for the Branching Heuristics
+# Run tests using 'python test_heuristics.py'
+
+class activityHeapTest(unittest.TestCase):
+    def test_pops_in_activity_order(self):
+        rng = random.Random(3)
+        activity = [0.0] + [rng.random() for i in range(100)]
+        heap = ActivityHeap(activity)
+        for var in range(1, 101):
+            heap.insert(var)
+        popped = [heap.pop() for i in range(100)]
+        self.assertEqual(popped, sorted(range(1, 101), key=lambda var: -activity[var]))
+
+    def test_increase(self):
+        activity = [0.0, 1.0, 2.0, 3.0]
+        heap = ActivityHeap(activity)
+        for var in (1, 2, 3):
+            heap.insert(var)
+        activity[1] = 10.0
+        heap.increase(1)
+        self.assertEqual(heap.pop(), 1)
+        self.assertFalse(1 in heap)
+        self.assertTrue(2 in heap)
+
+    def test_insert_twice(self):
+        heap = ActivityHeap([0.0, 1.0])
+        heap.insert(1)
+        heap.insert(1)
+        self.assertEqual(len(heap), 1)
+
+class heuristicTest(unittest.TestCase):
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            makeHeuristic("luby")
+
+    def test_vsids_picks_bumped(self):
+        solver = Solver(ClauseArena.fromLists([[1, 2], [3, 4], [-5, 6]]), CDCL, "vsids")
+        solver.heuristic.bump(5)
+        self.assertEqual(solver.pickBranchLit(), 5)
+
+    def test_jeroslow_wang(self):
+        # -3 is in the two binary clauses and outweighs everything else
+        solver = Solver(ClauseArena.fromLists([[1, 2, 4], [-3, 1], [-3, 2], [3, 4, 5]]), DPLL, "jw")
+        self.assertEqual(solver.pickBranchLit(), -3)
+
+    def test_moms(self):
+        # Only the binary clauses count, where 2 occurs in both polarities
+        solver = Solver(ClauseArena.fromLists([[1, 3, 4], [2, 3], [-2, 4], [1, 5, 6]]), DPLL, "moms")
+        self.assertEqual(solver.pickBranchLit(), 2)
+
+    def test_seed_is_reproducible(self):
+        clauses = pigeonhole(5).toLists()
+        runs = []
+        for i in range(2):
+            solver = Solver(ClauseArena.fromLists(clauses), DPLL, "random", seed=42)
+            solver.solve()
+            runs.append(solver.decisions)
+        self.assertEqual(runs[0], runs[1])
+
+    def test_every_heuristic_solves(self):
+        rng = random.Random(5)
+        clauses = [[rng.choice((1, -1)) * v for v in rng.sample(range(1, 21), 3)] for i in range(60)]
+        for name in HEURISTICS:
+            for mode in (CDCL, DPLL):
+                solver = Solver(ClauseArena.fromLists(clauses), mode, name, seed=1)
+                if solver.solve():
+                    self.assertTrue(satisfies(solver.model, clauses))
+            self.assertFalse(Solver(pigeonhole(4), CDCL, name).solve())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import random
+import unittest
+from arena import ClauseArena
+from generators import pigeonhole, randomKSat
+from localsearch import PROBSAT, WALKSAT, LocalSearch
+from solver import completeSolve, variableNames
+from test_search import satisfies
+
+# Testing for the Local Search Engine
+# Run tests using 'python test_localsearch.py'
+
+class localSearchTest(unittest.TestCase):
+    # Recomputes every counter from scratch and compares it with the
+    # incrementally maintained one
+    def assertCountersConsistent(self, search: LocalSearch):
+        breakCount = [0] * (search.numVars + 1)
+        unsat = set()
+        for index, clause in enumerate(search.clauses):
+            trueVars = [abs(lit) for lit in clause if search.assignment[abs(lit)] == (lit > 0)]
+            self.assertEqual(search.numTrue[index], len(trueVars))
+            if not trueVars:
+                unsat.add(index)
+            elif len(trueVars) == 1:
+                breakCount[trueVars[0]] += 1
+        self.assertEqual(set(search.unsat), unsat)
+        self.assertEqual(len(search.unsat), len(unsat))
+        for position, index in enumerate(search.unsat):
+            self.assertEqual(search.unsatPos[index], position)
+        self.assertEqual(list(search.breakCount), breakCount)
+
+    def test_flip_keeps_counters(self):
+        search = LocalSearch(randomKSat(40, seed=3), seed=1)
+        search._randomise()
+        rng = random.Random(2)
+        for _ in range(300):
+            search.flip(rng.randint(1, 40))
+            self.assertCountersConsistent(search)
+
+    def test_finds_models(self):
+        for algorithm in (PROBSAT, WALKSAT):
+            for seed in range(5):
+                arena = randomKSat(60, ratio=3.5, seed=seed)
+                result = LocalSearch(arena, algorithm, seed).solve(maxFlips=200000)
+                self.assertTrue(result.isSat, f"{algorithm} seed {seed}: {result}")
+                self.assertTrue(satisfies(result.model, arena))
+
+    def test_duplicates_and_tautologies(self):
+        arena = ClauseArena.fromLists([[1, 1, -2], [2, -2, 3], [-1, 2], [2]])
+        result = LocalSearch(arena, seed=0).solve(maxFlips=1000)
+        self.assertTrue(result.isSat)
+        self.assertTrue(satisfies(result.model, arena))
+
+    def test_empty_clause_gives_up(self):
+        result = LocalSearch(ClauseArena.fromLists([[1], []]), seed=0).solve(maxFlips=10)
+        self.assertFalse(result.isSat)
+        self.assertEqual(result.flips, 0)
+
+    def test_flip_budget(self):
+        result = LocalSearch(pigeonhole(4), WALKSAT, seed=0).solve(maxFlips=500)
+        self.assertFalse(result.isSat)
+        self.assertEqual(result.flips, 500)
+        self.assertGreater(result.bestUnsat, 0)
+        self.assertIn("gave up", repr(result))
+
+    def test_tries(self):
+        result = LocalSearch(pigeonhole(4), seed=0).solve(maxFlips=1000, triesFlips=100)
+        self.assertEqual(result.flips, 1000)
+        self.assertEqual(result.tries, 10)
+
+    def test_time_budget(self):
+        result = LocalSearch(pigeonhole(5), seed=0).solve(seconds=0.05)
+        self.assertFalse(result.isSat)
+        self.assertLess(result.seconds, 1.0)
+
+    def test_model_completes(self):
+        # Variable 3 occurs in no clause, completeSolve fills it in
+        arena = ClauseArena.fromLists([[1, -2], [2, 4]], numVars=4)
+        result = LocalSearch(arena, seed=0).solve(maxFlips=100)
+        self.assertEqual(sorted(map(abs, result.model)), [1, 2, 4])
+        completed = completeSolve(variableNames(arena), set(map(str, result.model)))
+        self.assertEqual(len(completed), 3)
+
+    def test_unknown_algorithm(self):
+        with self.assertRaises(ValueError):
+            LocalSearch(ClauseArena(), "gsat")
+
+if __name__ == "__main__":
+    unittest.main()
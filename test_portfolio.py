@@ -0,0 +1,55 @@
+import copy
+import unittest
+from arena import ClauseArena
+from generators import pigeonhole
+from portfolio import Cancelled, ClauseExchange, solvePortfolio
+from test_search import satisfies
+
+# Testing for the Parallel Portfolio and its Clause Exchange
+# Run tests using 'python test_portfolio.py'
+
+def twoWorkers(capacity=8, maxLength=3):
+    first = ClauseExchange(capacity, maxLength)
+    second = copy.copy(first)
+    first.bind(0)
+    second.bind(1)
+    return first, second
+
+class clauseExchangeTest(unittest.TestCase):
+    def test_round_trip(self):
+        first, second = twoWorkers()
+        first.export([1, -2], 2)
+        first.export([1, 2, 3, 4], 3)
+        self.assertEqual(first.collect(), [])
+        self.assertEqual(second.collect(), [([1, -2], 2)])
+        self.assertEqual(second.collect(), [])
+        self.assertEqual((first.exported, second.imported), (1, 1))
+
+    def test_overwritten_clauses_are_skipped(self):
+        first, second = twoWorkers(capacity=4)
+        for var in range(1, 7):
+            first.export([var], 1)
+        first.collect()
+        self.assertEqual([clause for clause, lbd in second.collect()], [[3], [4], [5], [6]])
+
+    def test_stop(self):
+        first, second = twoWorkers()
+        first.stop.set()
+        with self.assertRaises(Cancelled):
+            second.collect()
+
+class solvePortfolioTest(unittest.TestCase):
+    def test_sat(self):
+        clauses = [[1, 2], [-1, 3], [-3, -2], [2, 4]]
+        result = solvePortfolio(ClauseArena.fromLists(clauses), workers=2, seed=1)
+        self.assertTrue(result.isSat)
+        self.assertTrue(satisfies(result.model, clauses))
+        self.assertIn(result.worker, (0, 1))
+
+    def test_unsat(self):
+        result = solvePortfolio(pigeonhole(5), workers=2)
+        self.assertFalse(result.isSat)
+        self.assertIsNone(result.model)
+
+if __name__ == "__main__":
+    unittest.main()
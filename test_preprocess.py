@@ -0,0 +1,78 @@
+import random
+import unittest
+from arena import ClauseArena
+from generators import pigeonhole
+from preprocess import Preprocessor
+from search import Solver
+from test_search import bruteForceSat, satisfies
+
+# Testing for the CNF Preprocessor
+# Run tests using 'python test_preprocess.py'
+
+def preprocessed(clauses, **options):
+    preprocessor = Preprocessor(ClauseArena.fromLists(clauses), **options)
+    preprocessor.run()
+    return preprocessor
+
+class preprocessorTest(unittest.TestCase):
+    def test_subsumption(self):
+        preprocessor = preprocessed([[1, 2], [1, 2, 3], [1, 2, -4], [-1, 5], [-2, 5]],
+                                    occurrenceLimit=0, probeSeconds=0)
+        self.assertEqual(preprocessor.stats.subsumed, 2)
+        self.assertEqual(sorted(map(sorted, preprocessor.toArena().toLists())),
+                         [[-2, 5], [-1, 5], [1, 2]])
+
+    def test_self_subsuming_resolution(self):
+        # [1, 2] resolves with [-1, 2, 3] into [2, 3], which replaces it
+        preprocessor = preprocessed([[1, 2], [-1, 2, 3], [-2, 4], [-3, -4]],
+                                    occurrenceLimit=0, probeSeconds=0)
+        self.assertEqual(preprocessor.stats.strengthened, 1)
+        self.assertIn([2, 3], preprocessor.toArena().toLists())
+
+    def test_units(self):
+        preprocessor = preprocessed([[1], [-1, 2], [-2, 3, 4], [-3, 5]], occurrenceLimit=0)
+        self.assertEqual(preprocessor.units, [1, 2])
+        self.assertEqual(sorted(map(sorted, preprocessor.toArena().toLists())),
+                         [[-3, 5], [1], [2], [3, 4]])
+
+    def test_unsat(self):
+        preprocessor = Preprocessor(ClauseArena.fromLists([[1], [-1, 2], [-2]]))
+        self.assertFalse(preprocessor.run())
+        self.assertEqual(preprocessor.toArena().toLists(), [[]])
+
+    def test_elimination(self):
+        # 2 only links two binary clauses, so eliminating it saves a clause
+        preprocessor = preprocessed([[1, 2], [-2, 3], [-1, -3, 4], [1, 3, -4]])
+        self.assertGreater(preprocessor.stats.eliminated, 0)
+        self.assertLess(preprocessor.stats.clausesAfter, preprocessor.stats.clausesBefore)
+
+    def test_frozen_not_eliminated(self):
+        preprocessor = preprocessed([[1, 2], [-2, 3]], frozen=[1, 3])
+        self.assertEqual(preprocessor.eliminated[2], 1)
+        self.assertEqual(preprocessor.toArena().toLists(), [[1, 3]])
+        preprocessor = preprocessed([[1, 2], [-2, 3]], frozen=[1, 2, 3])
+        self.assertEqual(preprocessor.stats.eliminated, 0)
+
+    def test_pigeonhole_stays_unsat(self):
+        preprocessor = preprocessed(pigeonhole(4).toLists())
+        self.assertFalse(preprocessor.ok and Solver(preprocessor.toArena()).solve())
+
+    def test_random_models_reconstructed(self):
+        rng = random.Random(21)
+        for i in range(200):
+            numVars = rng.randint(1, 10)
+            clauses = [[rng.choice((1, -1)) * rng.randint(1, numVars)
+                        for j in range(rng.randint(1, 4))]
+                       for k in range(rng.randint(1, 35))]
+            preprocessor = preprocessed(clauses)
+            solver = Solver(preprocessor.toArena())
+            isSat = preprocessor.ok and solver.solve()
+            self.assertEqual(isSat, bruteForceSat(numVars, clauses))
+            if isSat:
+                model = preprocessor.extendModel(solver.model)
+                self.assertTrue(satisfies(model, clauses))
+                self.assertEqual(sorted(map(abs, model)),
+                                 sorted({abs(lit) for clause in clauses for lit in clause}))
+
+if __name__ == "__main__":
+    unittest.main()
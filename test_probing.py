@@ -0,0 +1,147 @@
+import random
+import unittest
+from arena import ClauseArena
+from generators import directedTree, randomKSat
+from preprocess import Preprocessor
+from probing import DEFAULT_PROBE_SECONDS, Prober, binaryClauses, equivalentLiterals, probeBudget
+from propagation import Propagator
+from search import Solver
+from test_search import bruteForceSat, satisfies
+
+# Testing for Failed Literal Probing
+# Run tests using 'python test_probing.py'
+
+class equivalentLiteralsTest(unittest.TestCase):
+    def test_cycle(self):
+        # 1 -> 2 -> 3 -> 1, and 4 on its own
+        representative = equivalentLiterals(4, [(-1, 2), (-2, 3), (-3, 1), (4, 1)])
+        self.assertEqual([representative[lit] for lit in (1, 2, 3, 4)], [1, 1, 1, 4])
+        self.assertEqual([representative[lit] for lit in (-1, -2, -3, -4)], [-1, -1, -1, -4])
+
+    def test_contradiction(self):
+        # 1 -> 2 -> -1 -> -2 -> 1
+        self.assertIsNone(equivalentLiterals(2, [(-1, 2), (-2, -1), (1, -2), (2, 1)]))
+
+    def test_long_chain(self):
+        n = 20000
+        binaries = [(-i, i + 1) for i in range(1, n)] + [(-n, 1)]
+        representative = equivalentLiterals(n, binaries)
+        self.assertTrue(all(representative[var] == 1 for var in range(1, n + 1)))
+
+class proberTest(unittest.TestCase):
+    def test_failed_literal(self):
+        # 1 implies both 2 and -2, so -1 holds
+        propagator = Propagator(ClauseArena.fromLists([[-1, 2], [-1, 3], [-2, -3, 4], [-3, -4]]))
+        prober = Prober()
+        prober.probe(propagator, 10.0)
+        self.assertTrue(propagator.ok)
+        self.assertIn(-1, propagator.trail)
+        self.assertEqual(prober.stats.failed, 1)
+
+    def test_lifting(self):
+        # Both 1 and -1 imply 3
+        propagator = Propagator(ClauseArena.fromLists([[-1, 3], [1, 2], [-2, 3], [3, 4, 5]]))
+        prober = Prober()
+        prober.probe(propagator, 10.0)
+        self.assertIn(3, propagator.trail)
+        self.assertEqual(prober.stats.lifted, 1)
+
+    def test_hyper_binary_resolvents(self):
+        propagator = Propagator(ClauseArena.fromLists([[-1, 2], [-1, 3], [-2, -3, 4], [4, 5]]))
+        resolvents = Prober().probe(propagator, 10.0)
+        self.assertIn([-1, 4], resolvents)
+        self.assertEqual(propagator.trail, [])
+
+    def test_unsatisfiable(self):
+        propagator = Propagator(ClauseArena.fromLists([[1, 2], [1, -2], [-1, 2], [-1, -2]]))
+        Prober().probe(propagator, 10.0)
+        self.assertFalse(propagator.ok)
+
+    def test_rounds_resume(self):
+        arena = directedTree(6)
+        prober = Prober()
+        propagator = Propagator(arena)
+        prober.probe(propagator, 0.0)
+        self.assertEqual(prober.stats.probes, 0)
+        prober.probe(propagator, 10.0)
+        self.assertGreater(prober.stats.probes, 0)
+        self.assertEqual(prober.position, 1)
+        self.assertEqual(len(binaryClauses(propagator)),
+                         sum(1 for clause in arena if len(set(clause)) == 2))
+
+    def test_without_hyper_binary(self):
+        propagator = Propagator(ClauseArena.fromLists([[-1, 2], [-1, 3], [-2, -3, 4], [4, 5]]))
+        prober = Prober()
+        self.assertEqual(prober.probe(propagator, 10.0, hyperBinary=False), [])
+        self.assertEqual(prober.stats.hyperBinary, 0)
+
+    def test_budget_scales_with_size(self):
+        self.assertLess(probeBudget(100), probeBudget(1000))
+        self.assertEqual(probeBudget(10 ** 9), DEFAULT_PROBE_SECONDS)
+
+    def test_due_backs_off(self):
+        prober = Prober(interval=2)
+        self.assertEqual([restarts for restarts in range(40) if prober.due(restarts)], [2, 6, 14, 30])
+
+class probingPreprocessTest(unittest.TestCase):
+    def test_merged_variables_are_rebuilt(self):
+        # 1, 2 and 3 are equivalent; 2 and 3 go and come back through extendModel
+        clauses = [[-1, 2], [-2, 3], [-3, 1], [2, 4], [-3, -4, 5], [-5, -1]]
+        preprocessor = Preprocessor(ClauseArena.fromLists(clauses), occurrenceLimit=0)
+        preprocessor.run()
+        self.assertEqual(preprocessor.probeStats.merged, 2)
+        arena = preprocessor.toArena()
+        self.assertTrue(all(abs(lit) not in (2, 3) for clause in arena for lit in clause))
+        solver = Solver(arena)
+        self.assertTrue(solver.solve())
+        self.assertTrue(satisfies(preprocessor.extendModel(solver.model), clauses))
+
+    def test_formula_does_not_grow(self):
+        clauses = [[-1, 2], [-1, 3], [-2, -3, 4], [4, 5], [-4, 6, 7], [-5, -6, 7]]
+        preprocessor = Preprocessor(ClauseArena.fromLists(clauses), occurrenceLimit=0,
+                                    probeSeconds=10.0)
+        preprocessor.run()
+        self.assertGreater(preprocessor.probeStats.probes, 0)
+        self.assertEqual(preprocessor.probeStats.hyperBinary, 0)
+        self.assertLessEqual(preprocessor.stats.clausesAfter, len(clauses))
+
+    def test_frozen_variables_are_kept(self):
+        clauses = [[-1, 2], [-2, 1], [1, 3]]
+        preprocessor = Preprocessor(ClauseArena.fromLists(clauses), frozen=[2], occurrenceLimit=0)
+        preprocessor.run()
+        self.assertEqual(preprocessor.probeStats.merged, 0)
+
+    def test_random_against_brute_force(self):
+        rng = random.Random(11)
+        for _ in range(200):
+            numVars = rng.randint(3, 9)
+            clauses = [[rng.choice((1, -1)) * v
+                        for v in rng.sample(range(1, numVars + 1), rng.choice((2, 2, 2, 3)))]
+                       for _ in range(rng.randint(1, 3 * numVars))]
+            preprocessor = Preprocessor(ClauseArena.fromLists(clauses, numVars=numVars))
+            isSat = preprocessor.run()
+            if isSat:
+                solver = Solver(preprocessor.toArena())
+                isSat = solver.solve()
+                if isSat:
+                    self.assertTrue(satisfies(preprocessor.extendModel(solver.model), clauses),
+                                    clauses)
+            self.assertEqual(isSat, bruteForceSat(numVars, clauses), clauses)
+
+class probingSearchTest(unittest.TestCase):
+    def test_between_restarts(self):
+        rounds = 0
+        for seed in range(6):
+            arena = randomKSat(80, ratio=4.26, seed=seed)
+            expected = Solver(arena).solve()
+            solver = Solver(arena)
+            solver.prober = Prober(interval=0)
+            isSat = solver.solve()
+            rounds += solver.prober.stats.rounds
+            self.assertEqual(isSat, expected)
+            if isSat:
+                self.assertTrue(satisfies(solver.model, arena.toLists()))
+        self.assertGreater(rounds, 0)
+
+if __name__ == "__main__":
+    unittest.main()
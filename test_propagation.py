@@ -0,0 +1,75 @@
+import unittest
+from arena import ClauseArena
+from propagation import FALSE, NO_REASON, TRUE, UNASSIGNED, Propagator
+
+# Testing for the Two-Watched-Literal Propagation Engine
+# Run tests using 'python test_propagation.py'
+
+def makePropagator(clauses):
+    return Propagator(ClauseArena.fromLists(clauses))
+
+class propagatorTest(unittest.TestCase):
+    def test_units_assigned_on_load(self):
+        propagator = makePropagator([[1], [-2], [1, 2, 3]])
+        self.assertEqual(propagator.trail, [1, -2])
+        self.assertEqual(propagator.propagate(), NO_REASON)
+        self.assertEqual(propagator.trail, [1, -2])
+
+    def test_empty_clause(self):
+        self.assertFalse(makePropagator([[1, 2], []]).ok)
+
+    def test_opposite_units(self):
+        self.assertFalse(makePropagator([[1], [-1]]).ok)
+
+    def test_tautology_dropped(self):
+        propagator = makePropagator([[1, -1, 2], [3, 3]])
+        self.assertEqual(len(propagator.clauses), 0)
+        self.assertEqual(propagator.trail, [3])
+
+    def test_chain_to_fixpoint(self):
+        propagator = makePropagator([[1], [-1, 2], [-2, 3], [-3, -1, 4]])
+        self.assertEqual(propagator.propagate(), NO_REASON)
+        self.assertEqual(propagator.trail, [1, 2, 3, 4])
+        self.assertEqual(propagator.reason[1], NO_REASON)
+        self.assertNotEqual(propagator.reason[4], NO_REASON)
+
+    def test_conflict(self):
+        propagator = makePropagator([[-1, 2], [-1, -2], [1, 3]])
+        self.assertEqual(propagator.propagate(), NO_REASON)
+        propagator.newDecisionLevel()
+        propagator.assign(1, NO_REASON)
+        conflict = propagator.propagate()
+        self.assertNotEqual(conflict, NO_REASON)
+        clause = set(propagator.clauses.clause(conflict))
+        self.assertTrue(clause in ({-1, 2}, {-1, -2}))
+        for lit in clause:
+            self.assertEqual(propagator.value[lit], FALSE)
+
+    def test_cancel_until(self):
+        propagator = makePropagator([[-1, 2], [-2, 3], [4, 5]])
+        propagator.newDecisionLevel()
+        propagator.assign(1, NO_REASON)
+        propagator.propagate()
+        self.assertEqual(propagator.level[3], 1)
+        propagator.cancelUntil(0)
+        self.assertEqual(propagator.trail, [])
+        for lit in (1, -1, 2, -2, 3, -3):
+            self.assertEqual(propagator.value[lit], UNASSIGNED)
+        # Watches still work after backtracking
+        propagator.newDecisionLevel()
+        propagator.assign(-3, NO_REASON)
+        self.assertEqual(propagator.propagate(), NO_REASON)
+        self.assertEqual(propagator.value[-1], TRUE)
+
+    def test_only_watching_clauses_visited(self):
+        propagator = makePropagator([[1, 2, 3], [4, 5, 6]])
+        propagator.newDecisionLevel()
+        propagator.assign(-4, NO_REASON)
+        self.assertEqual(propagator.propagate(), NO_REASON)
+        # The second clause moves its watch from 4 to 6, the first is never touched
+        self.assertEqual(list(propagator.clauses.clause(0)), [1, 2, 3])
+        self.assertEqual(propagator.watches[4], [])
+        self.assertEqual(propagator.watches[6], [1])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import random
+import unittest
+from arena import ClauseArena
+from generators import randomKSat
+from propagation import NO_REASON
+from purity import PureLiteralTracker
+from search import CDCL, DPLL, MODES, Solver
+from test_search import bruteForceSat, satisfies
+
+# Testing for Incremental Pure Literal Detection
+# Run tests using 'python test_purity.py'
+
+# Occurrence counts recomputed from scratch over the unsatisfied clauses
+def recount(solver) -> list:
+    assigned = set(solver.trail)
+    count = [0] * (2 * solver.numVars + 1)
+    for clause in solver.clauses:
+        if assigned.isdisjoint(clause):
+            for lit in clause:
+                count[lit] += 1
+    return count
+
+class pureLiteralTrackerTest(unittest.TestCase):
+    def test_counts_follow_assignments_and_backtracking(self):
+        rng = random.Random(3)
+        for seed in range(20):
+            solver = Solver(randomKSat(12, ratio=3.0, seed=seed), mode=DPLL)
+            solver.purity = PureLiteralTracker(solver)
+            for step in range(40):
+                free = [var for var in range(1, solver.numVars + 1) if solver.value[var] == 0]
+                if free and rng.random() < 0.7:
+                    solver.newDecisionLevel()
+                    solver.assign(rng.choice((1, -1)) * rng.choice(free), NO_REASON)
+                elif solver.trailLim:
+                    solver.cancelUntil(rng.randrange(len(solver.trailLim)))
+                solver.purity.update()
+                self.assertEqual(list(solver.purity.count), recount(solver))
+                lit = solver.purity.pick()
+                if lit != 0:
+                    self.assertEqual(solver.value[lit], 0)
+                    self.assertEqual(recount(solver)[-lit], 0)
+            solver.cancelUntil(0)
+            self.assertEqual(list(solver.purity.count), recount(solver))
+
+    def test_finds_every_pure_literal(self):
+        solver = Solver(ClauseArena.fromLists([[1, 2], [-2, 3], [1, -3], [4, -4]]), mode=DPLL)
+        tracker = PureLiteralTracker(solver)
+        pure = set()
+        lit = tracker.pick()
+        while lit != 0:
+            pure.add(lit)
+            lit = tracker.pick()
+        self.assertEqual(pure, {1})
+
+class pureLiteralSearchTest(unittest.TestCase):
+    def test_random_against_brute_force(self):
+        rng = random.Random(7)
+        for i in range(80):
+            numVars = rng.randint(3, 10)
+            clauses = [[rng.choice((1, -1)) * v
+                        for v in rng.sample(range(1, numVars + 1), rng.randint(1, 3))]
+                       for _ in range(rng.randint(1, 25))]
+            assumptions = [rng.choice((1, -1)) * v
+                           for v in rng.sample(range(1, numVars + 1), rng.randint(0, 2))]
+            units = [[lit] for lit in assumptions]
+            expected = bruteForceSat(numVars, clauses + units)
+            for mode in MODES:
+                solver = Solver(ClauseArena.fromLists(clauses, numVars=numVars), mode=mode,
+                                pureLiterals=True)
+                isSat = solver.solve(assumptions)
+                self.assertEqual(isSat, expected, (clauses, assumptions))
+                if isSat:
+                    self.assertTrue(satisfies(solver.model, clauses + units))
+                elif solver.failedAssumptions:
+                    self.assertTrue(set(solver.failedAssumptions) <= set(assumptions))
+                # The solver stays usable for the next call
+                self.assertEqual(solver.solve(), bruteForceSat(numVars, clauses))
+
+    def test_defaults(self):
+        self.assertTrue(Solver(mode=DPLL).pureLiterals)
+        self.assertFalse(Solver(mode=CDCL).pureLiterals)
+
+    def test_fewer_decisions(self):
+        # Every variable but the last occurs only positively, so setting
+        # them satisfies the chain and only the last is branched on
+        n = 200
+        clauses = [[i, i + 1, -n] for i in range(1, n - 1)] + [[n, 1]]
+        plain = Solver(ClauseArena.fromLists(clauses), mode=DPLL, pureLiterals=False)
+        pure = Solver(ClauseArena.fromLists(clauses), mode=DPLL)
+        self.assertTrue(plain.solve())
+        self.assertTrue(pure.solve())
+        self.assertTrue(satisfies(pure.model, clauses))
+        self.assertLessEqual(pure.decisions, 1)
+        self.assertGreater(pure.pureAssignments, 0)
+        self.assertGreater(plain.decisions, pure.decisions)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import random
+import unittest
+from arena import ClauseArena
+from generators import pigeonhole
+from restarts import GeometricRestarts, GlucoseRestarts, LubyRestarts, RESTART_POLICIES, luby, makeRestartPolicy
+from search import CDCL, DPLL, Solver
+from test_search import satisfies
+
+# Testing for the Restart Policies and Phase Saving
+# Run tests using 'python test_restarts.py'
+
+def conflictsPerRun(policy, runs):
+    counts = []
+    for i in range(runs):
+        conflicts = 0
+        while not policy.shouldRestart():
+            policy.onConflict(2, 10)
+            conflicts += 1
+        policy.onRestart()
+        counts.append(conflicts)
+    return counts
+
+class restartPolicyTest(unittest.TestCase):
+    def test_luby_sequence(self):
+        self.assertEqual([luby(i) for i in range(1, 16)], [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8])
+
+    def test_luby_restarts(self):
+        self.assertEqual(conflictsPerRun(LubyRestarts(10), 7), [10, 10, 20, 10, 10, 20, 40])
+
+    def test_geometric_restarts(self):
+        self.assertEqual(conflictsPerRun(GeometricRestarts(10, 2.0), 4), [10, 20, 40, 80])
+
+    def test_glucose_restarts_on_worse_lbd(self):
+        policy = GlucoseRestarts(lbdWindow=5)
+        for i in range(100):
+            policy.onConflict(3, 10)
+        self.assertFalse(policy.shouldRestart())
+        for i in range(5):
+            policy.onConflict(20, 10)
+        self.assertTrue(policy.shouldRestart())
+        policy.onRestart()
+        self.assertFalse(policy.shouldRestart())
+
+    def test_glucose_blocks_on_large_trail(self):
+        policy = GlucoseRestarts(lbdWindow=5, trailWindow=5, blockAfter=0)
+        for i in range(10):
+            policy.onConflict(3, 10)
+        policy.onConflict(20, 100)
+        self.assertEqual(policy.blocked, 1)
+        self.assertFalse(policy.shouldRestart())
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            makeRestartPolicy("vsids")
+
+class solverRestartTest(unittest.TestCase):
+    def test_restarts_counted(self):
+        solver = Solver(pigeonhole(6), CDCL, restarts="luby")
+        self.assertFalse(solver.solve())
+        self.assertGreater(solver.restarts, 0)
+
+    def test_dpll_never_restarts(self):
+        solver = Solver(pigeonhole(5), DPLL, restarts="luby")
+        self.assertFalse(solver.solve())
+        self.assertEqual(solver.restarts, 0)
+
+    def test_every_policy_correct(self):
+        rng = random.Random(9)
+        clauses = [[rng.choice((1, -1)) * v for v in rng.sample(range(1, 41), 3)] for i in range(150)]
+        for name in RESTART_POLICIES:
+            solver = Solver(ClauseArena.fromLists(clauses), CDCL, restarts=name)
+            if solver.solve():
+                self.assertTrue(satisfies(solver.model, clauses))
+            self.assertFalse(Solver(pigeonhole(5), CDCL, restarts=name).solve())
+
+    def test_phase_saving(self):
+        solver = Solver(ClauseArena.fromLists([[1, 2, 3], [-2, 4]]), CDCL, "vsids")
+        solver.newDecisionLevel()
+        solver.assign(-3, -1)
+        solver.newDecisionLevel()
+        solver.assign(2, -1)
+        solver.propagate()
+        solver.cancelUntil(0)
+        self.assertEqual(solver.polarity[3], 0)
+        self.assertEqual(solver.polarity[2], 1)
+        self.assertEqual(solver.polarity[4], 1)
+
+    def test_without_phase_saving(self):
+        solver = Solver(ClauseArena.fromLists([[1, 2, 3]]), CDCL, "vsids", phaseSaving=False)
+        solver.newDecisionLevel()
+        solver.assign(-3, -1)
+        solver.cancelUntil(0)
+        self.assertEqual(solver.polarity[3], 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,109 @@
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from array import array
+from arena import ClauseArena
+from generators import randomKSat
+from resultcache import ENTRY_OVERHEAD, ResultCache, fingerprint
+
+# Testing for the Persistent Result Cache
+# Run tests using 'python test_resultcache.py'
+
+def _storeFormulas(path: str, seeds):
+    with ResultCache(path) as cache:
+        for seed in seeds:
+            cache.store(randomKSat(10, seed=seed), False)
+            cache.lookup(randomKSat(10, seed=seed))
+
+class fingerprintTest(unittest.TestCase):
+    def test_invariant_to_order_and_duplicates(self):
+        arena = ClauseArena.fromLists([[1, -2, 3], [-1, 2], [2, 3]])
+        permuted = ClauseArena.fromLists([[3, 2], [2, -1], [3, 1, -2], [2, 3, 3], [-1, 2]])
+        self.assertEqual(fingerprint(arena), fingerprint(permuted))
+
+    def test_different_formulas(self):
+        self.assertNotEqual(fingerprint(ClauseArena.fromLists([[1, 2]])),
+                            fingerprint(ClauseArena.fromLists([[1, -2]])))
+        self.assertNotEqual(fingerprint(ClauseArena.fromLists([[1, 2]])),
+                            fingerprint(ClauseArena.fromLists([[1], [2]])))
+
+class resultCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "cache", "results.sqlite")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_hit_and_miss(self):
+        arena = ClauseArena.fromLists([[1, -2], [2, 3]])
+        with ResultCache(self.path) as cache:
+            self.assertIsNone(cache.lookup(arena))
+            cache.store(arena, True, [1, 2, -3])
+            permuted = ClauseArena.fromLists([[3, 2], [-2, 1]])
+            self.assertEqual(cache.lookup(permuted), (True, [1, 2, -3]))
+            cache.store(ClauseArena.fromLists([[1], [-1]]), False)
+            self.assertEqual(cache.lookup(ClauseArena.fromLists([[-1], [1]])), (False, None))
+            self.assertEqual((cache.hits, cache.misses), (2, 1))
+            self.assertIn("66.7% hit rate", repr(cache))
+
+    def test_wrong_model_is_dropped(self):
+        arena = ClauseArena.fromLists([[1, -2], [2, 3]])
+        with ResultCache(self.path) as cache:
+            cache.store(arena, True, [-1, 2, -3])
+            self.assertIsNone(cache.lookup(arena))
+            self.assertEqual(cache.statistics()["entries"], 0)
+
+    def test_counters_are_shared(self):
+        arena = ClauseArena.fromLists([[1]])
+        with ResultCache(self.path) as cache:
+            cache.store(arena, True, [1])
+            cache.lookup(arena)
+        with ResultCache(self.path) as cache:
+            cache.lookup(arena)
+            stats = cache.statistics()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (2, 0, 1))
+
+    def test_lru_eviction(self):
+        model = list(range(1, 11))
+        entrySize = ENTRY_OVERHEAD + 4 * len(model)
+        formulas = [ClauseArena.fromLists([[var] for var in model] + [[var, 10 + i]])
+                    for i, var in enumerate(model[:4], 1)]
+        with ResultCache(self.path, maxBytes=3 * entrySize) as cache:
+            for arena in formulas[:3]:
+                cache.store(arena, True, model)
+            # Using the first entry makes the second the least recent
+            self.assertIsNotNone(cache.lookup(formulas[0]))
+            cache.store(formulas[3], True, model)
+            self.assertEqual(cache.statistics()["entries"], 3)
+            self.assertIsNone(cache.lookup(formulas[1]))
+            self.assertIsNotNone(cache.lookup(formulas[0]))
+            self.assertIsNotNone(cache.lookup(formulas[3]))
+
+    def test_concurrent_processes(self):
+        ResultCache(self.path).close()
+        context = multiprocessing.get_context()
+        processes = [context.Process(target=_storeFormulas, args=(self.path, range(i, 40, 4)))
+                     for i in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            self.assertEqual(process.exitcode, 0)
+        with ResultCache(self.path) as cache:
+            stats = cache.statistics()
+        self.assertEqual(stats["entries"], 40)
+        self.assertEqual(stats["hits"], 40)
+
+    def test_model_stored_as_int32(self):
+        arena = ClauseArena.fromLists([[5, -7]])
+        with ResultCache(self.path) as cache:
+            cache.store(arena, True, [5, -7])
+        blob = sqlite3.connect(self.path).execute("SELECT model FROM results").fetchone()[0]
+        self.assertEqual(list(array("i", blob)), [5, -7])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+import itertools
+import random
+import unittest
+from arena import ClauseArena
+from generators import pigeonhole
+from search import CDCL, MODES, Solver
+
+# Testing for the Iterative Trail-Based Search
+# Run tests using 'python test_search.py'
+
+def bruteForceSat(numVars, clauses) -> bool:
+    for bits in itertools.product((False, True), repeat=numVars):
+        if all(any(bits[abs(lit) - 1] == (lit > 0) for lit in clause) for clause in clauses):
+            return True
+    return False
+
+def satisfies(model, clauses) -> bool:
+    modelSet = set(model)
+    return all(any(lit in modelSet for lit in clause) for clause in clauses)
+
+class solverSearchTest(unittest.TestCase):
+    def test_empty(self):
+        solver = Solver(ClauseArena.fromLists([]))
+        self.assertTrue(solver.solve())
+        self.assertEqual(solver.model, [])
+
+    def test_unsat(self):
+        solver = Solver(ClauseArena.fromLists([[1, 2], [1, -2], [-1, 2], [-1, -2]]))
+        self.assertFalse(solver.solve())
+        self.assertIsNone(solver.model)
+
+    def test_pigeonhole_unsat(self):
+        for mode in MODES:
+            self.assertFalse(Solver(pigeonhole(4), mode).solve())
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            Solver(ClauseArena.fromLists([[1]]), "vsids")
+
+    def test_deep_search_no_recursion_limit(self):
+        # Every variable needs its own decision, far beyond the recursion limit
+        numVars = 3000
+        clauses = [[var, var + 1] for var in range(1, numVars, 2)]
+        for mode in MODES:
+            solver = Solver(ClauseArena.fromLists(clauses), mode, "vsids")
+            self.assertTrue(solver.solve())
+            self.assertTrue(satisfies(solver.model, clauses))
+
+    def test_trail_reset_after_solve(self):
+        solver = Solver(ClauseArena.fromLists([[1, 2], [-1, 3]]))
+        self.assertTrue(solver.solve())
+        self.assertEqual(solver.decisionLevel(), 0)
+
+    def test_random_against_brute_force(self):
+        rng = random.Random(7)
+        for i in range(150):
+            numVars = rng.randint(1, 8)
+            clauses = [[rng.choice((1, -1)) * rng.randint(1, numVars)
+                        for j in range(rng.randint(1, 3))]
+                       for k in range(rng.randint(1, 30))]
+            expected = bruteForceSat(numVars, clauses)
+            for mode in MODES:
+                solver = Solver(ClauseArena.fromLists(clauses), mode)
+                isSat = solver.solve()
+                self.assertEqual(isSat, expected)
+                if isSat:
+                    self.assertTrue(satisfies(solver.model, clauses))
+
+class conflictAnalysisTest(unittest.TestCase):
+    def test_learned_clauses_are_implied(self):
+        rng = random.Random(11)
+        for i in range(20):
+            numVars = 9
+            clauses = [[rng.choice((1, -1)) * v for v in rng.sample(range(1, numVars + 1), 3)]
+                       for k in range(40)]
+            solver = Solver(ClauseArena.fromLists(clauses), CDCL)
+            solver.solve()
+            for position in range(solver.numOriginal, len(solver.clauses)):
+                learnt = list(solver.clauses.clause(position))
+                # The formula with the learned clause falsified has no model
+                negated = [[-lit] for lit in learnt]
+                self.assertFalse(bruteForceSat(numVars, clauses + negated))
+
+    def test_backjump_learns(self):
+        solver = Solver(pigeonhole(5), CDCL)
+        self.assertFalse(solver.solve())
+        self.assertGreater(solver.conflicts, 0)
+        self.assertGreater(len(solver.clauses), solver.numOriginal)
+
+class incrementalSolverTest(unittest.TestCase):
+    def test_add_clause_between_solves(self):
+        solver = Solver()
+        solver.addClause([1, 2])
+        self.assertTrue(solver.solve())
+        solver.addClause([-1])
+        self.assertTrue(solver.solve())
+        self.assertIn(2, solver.model)
+        solver.addClause([-2, 3])
+        solver.addClause([-3])
+        self.assertFalse(solver.solve())
+        self.assertEqual(solver.failedAssumptions, [])
+        self.assertFalse(solver.ok)
+
+    def test_new_variables(self):
+        solver = Solver(ClauseArena.fromLists([[1, 2], [-1, 2]]))
+        self.assertTrue(solver.solve())
+        solver.addClause([-2, 40])
+        solver.addClause([-40, -7])
+        self.assertTrue(solver.solve())
+        self.assertTrue(satisfies(solver.model, [[1, 2], [-1, 2], [-2, 40], [-40, -7]]))
+        self.assertTrue(solver.solve([7, 1]) is False)
+
+    def test_failed_assumptions(self):
+        # 1 -> 2 -> 3, and 4 is unrelated
+        solver = Solver(ClauseArena.fromLists([[-1, 2], [-2, 3], [4, 5]]))
+        self.assertFalse(solver.solve([4, 1, -3]))
+        self.assertEqual(sorted(solver.failedAssumptions), [-3, 1])
+        self.assertTrue(solver.ok)
+        self.assertTrue(solver.solve([4, 1]))
+        self.assertTrue({1, 2, 3, 4} <= set(solver.model))
+
+    def test_unsatisfiable_clauses_with_assumptions(self):
+        # Refuted without the assumptions, which are on a variable of its own
+        clauses = pigeonhole(4).toLists() + [[30, 31]]
+        for mode in MODES:
+            solver = Solver(ClauseArena.fromLists(clauses), mode=mode)
+            self.assertFalse(solver.solve([30, -31]))
+            self.assertEqual(solver.failedAssumptions, [], mode)
+            self.assertFalse(solver.ok, mode)
+            self.assertFalse(solver.solve())
+
+    def test_assumption_contradicting_root(self):
+        solver = Solver(ClauseArena.fromLists([[1], [-1, 2]]))
+        self.assertFalse(solver.solve([-2]))
+        self.assertEqual(solver.failedAssumptions, [-2])
+
+    def test_learned_clauses_kept(self):
+        # Without the clause of the first pigeon every pigeon finds a hole
+        clauses = pigeonhole(5).toLists()
+        solver = Solver(ClauseArena.fromLists(clauses[1:]))
+        self.assertTrue(solver.solve())
+        learnts = len(solver.clauses) - solver.numOriginal
+        self.assertGreater(learnts, 0)
+        conflicts = solver.conflicts
+        solver.addClause(clauses[0])
+        self.assertFalse(solver.solve())
+        # The added clause joined the originals in front of the learned ones
+        self.assertEqual(solver.numOriginal, len(clauses))
+        self.assertGreater(solver.conflicts, conflicts)
+
+    def test_add_learnt_clause(self):
+        solver = Solver(ClauseArena.fromLists([[1, 2, 3], [-1, 2], [4, 5]]))
+        solver.addClause([-4])
+        self.assertTrue(solver.solve())
+        solver.addLearntClause([4, 2, 3], 2)
+        self.assertEqual(len(solver.clauseDb), 1)
+        self.assertEqual(list(solver.clauses.clause(solver.numOriginal)), [2, 3])
+        solver.addLearntClause([-5], 1)
+        self.assertFalse(solver.solve())
+
+    def test_random_against_brute_force(self):
+        rng = random.Random(5)
+        for i in range(60):
+            numVars = rng.randint(4, 10)
+            for mode in MODES:
+                solver = Solver(mode=mode)
+                clauses = []
+                for step in range(10):
+                    for k in range(rng.randint(2, 8)):
+                        clause = [rng.choice((1, -1)) * v
+                                  for v in rng.sample(range(1, numVars + 1), rng.randint(1, 3))]
+                        clauses.append(clause)
+                        solver.addClause(clause)
+                    assumptions = [rng.choice((1, -1)) * v
+                                   for v in rng.sample(range(1, numVars + 1), rng.randint(0, 2))]
+                    units = [[lit] for lit in assumptions]
+                    isSat = solver.solve(assumptions)
+                    self.assertEqual(isSat, bruteForceSat(numVars, clauses + units))
+                    if isSat:
+                        self.assertTrue(satisfies(solver.model, clauses + units))
+                    elif solver.failedAssumptions:
+                        failed = [[lit] for lit in solver.failedAssumptions]
+                        self.assertTrue(set(solver.failedAssumptions) <= set(assumptions))
+                        self.assertFalse(bruteForceSat(numVars, clauses + failed))
+                    else:
+                        self.assertFalse(bruteForceSat(numVars, clauses))
+                        break
+
+if __name__ == "__main__":
+    unittest.main()
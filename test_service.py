@@ -0,0 +1,210 @@
+import asyncio
+import json
+import os
+import shutil
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from client import request
+from generators import pigeonhole
+from service import BUSY, ERROR, SAT, TIMEOUT, UNSAT, SolverService, solvePayload
+from test_batch import writeCnf
+
+# Testing for the Solver Service
+# Run tests using 'python test_service.py'
+
+def dimacsText(clauses) -> str:
+    return "".join(" ".join(map(str, clause)) + " 0\n" for clause in clauses)
+
+SAT_CNF = "p cnf 3 3\n1 2 0\n-1 0\n2 3 0\n"
+UNSAT_CNF = "p cnf 1 2\n1 0\n-1 0\n"
+HARD_CNF = dimacsText(pigeonhole(9))
+SERVICE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "service.py")
+CLIENT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "client.py")
+
+class solvePayloadTest(unittest.TestCase):
+    def test_answers(self):
+        response = solvePayload(SAT_CNF.encode())
+        self.assertEqual((response["status"], response["output"]),
+                         (SAT, "s SATISFIABLE\nv -1 2 3 0\n"))
+        response = solvePayload(UNSAT_CNF.encode())
+        self.assertEqual((response["status"], response["output"]), (UNSAT, "s UNSATISFIABLE\n"))
+
+    def test_timeout(self):
+        start = time.perf_counter()
+        response = solvePayload(HARD_CNF.encode(), timeout=0.2)
+        self.assertEqual((response["status"], response["output"]), (TIMEOUT, "s UNKNOWN\n"))
+        self.assertLess(time.perf_counter() - start, 5.0)
+
+    def test_error(self):
+        response = solvePayload("/nonexistent/formula.cnf")
+        self.assertEqual(response["status"], ERROR)
+        self.assertEqual(response["error"], "could not read the formula")
+
+    def test_error_hides_contents(self):
+        response = solvePayload(b"p cnf 2 1\nsecret 0\n")
+        self.assertEqual(response["status"], ERROR)
+        self.assertNotIn("secret", json.dumps(response))
+
+class solverServiceTest(unittest.TestCase):
+    # Runs the coroutine body on a started service, on a fresh event loop
+    def serve(self, body, **options):
+        async def main():
+            service = SolverService(**options)
+            await service.start()
+            try:
+                return await body(service)
+            finally:
+                service.close()
+        return asyncio.run(main())
+
+    def test_concurrent_requests_keep_ids(self):
+        async def body(service):
+            return await asyncio.gather(service.handle({"id": "a", "cnf": SAT_CNF}),
+                                        service.handle({"id": "b", "cnf": UNSAT_CNF}),
+                                        service.handle({"cnf": SAT_CNF}))
+        responses = self.serve(body, workers=2)
+        self.assertEqual([(r["id"], r["status"]) for r in responses], [("a", SAT), ("b", UNSAT), (1, SAT)])
+
+    def test_timeout_and_recovery(self):
+        async def body(service):
+            slow = await service.handle({"cnf": HARD_CNF, "timeout": 0.2})
+            fast = await service.handle({"cnf": SAT_CNF})
+            return slow, fast, repr(service)
+        slow, fast, summary = self.serve(body, workers=1, maxTimeout=5.0)
+        self.assertEqual(slow["status"], TIMEOUT)
+        self.assertEqual(fast["status"], SAT)
+        self.assertIn("1 SAT, 1 TIMEOUT", summary)
+
+    def test_pending_limit(self):
+        async def body(service):
+            slow = asyncio.ensure_future(service.handle({"cnf": HARD_CNF, "timeout": 0.5}))
+            await asyncio.sleep(0)
+            rejected = await service.handle({"cnf": SAT_CNF})
+            return rejected, await slow
+        rejected, slow = self.serve(body, workers=1, maxPending=1)
+        self.assertEqual(rejected["status"], BUSY)
+        self.assertEqual(slow["status"], TIMEOUT)
+
+    def test_dead_worker_is_replaced(self):
+        async def body(service):
+            service.workers[0].process.kill()
+            service.workers[0].process.join()
+            failed = await service.handle({"cnf": SAT_CNF})
+            return failed, await service.handle({"cnf": SAT_CNF})
+        failed, retried = self.serve(body, workers=1)
+        self.assertEqual(failed["status"], ERROR)
+        self.assertEqual(retried["status"], SAT)
+
+    def test_bad_requests(self):
+        async def body(service):
+            return (await service.handle({"id": 3}),
+                    await service.handle({"cnf": SAT_CNF, "timeout": "soon"}))
+        missing, badTimeout = self.serve(body, workers=1)
+        self.assertEqual((missing["id"], missing["status"]), (3, ERROR))
+        self.assertEqual(badTimeout["status"], ERROR)
+
+    def test_paths_need_opt_in(self):
+        handle, formula = tempfile.mkstemp(suffix=".cnf")
+        os.close(handle)
+        writeCnf(formula, [[1, 2], [-1], [2, 3]])
+
+        async def body(service):
+            return await service.handle({"path": formula})
+        try:
+            self.assertEqual(self.serve(body, workers=1)["status"], ERROR)
+            self.assertEqual(self.serve(body, workers=1, allowPaths=True)["status"], SAT)
+        finally:
+            os.remove(formula)
+
+class serviceProcessTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.formula = os.path.join(self.directory, "sat.cnf")
+        writeCnf(self.formula, [[1, 2], [-1], [2, 3]])
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_stdio(self):
+        requests = [{"id": 1, "path": self.formula}, {"id": 2, "cnf": UNSAT_CNF}]
+        lines = "".join(json.dumps(r) + "\n" for r in requests) + "not json\n"
+        completed = subprocess.run([sys.executable, SERVICE, "--stdio", "--workers", "1",
+                                    "--allow-paths"],
+                                   input=lines, capture_output=True, text=True, timeout=60)
+        responses = [json.loads(line) for line in completed.stdout.splitlines()]
+        statuses = {response["id"]: response["status"] for response in responses}
+        self.assertEqual(statuses, {1: SAT, 2: UNSAT, None: ERROR})
+
+    def test_socket_and_client(self):
+        socketPath = os.path.join(self.directory, "private", "service.sock")
+        service = subprocess.Popen([sys.executable, SERVICE, "--socket", socketPath,
+                                    "--workers", "1"], stderr=subprocess.DEVNULL)
+        try:
+            deadline = time.time() + 30
+            while not os.path.exists(socketPath) and time.time() < deadline:
+                time.sleep(0.05)
+            self.assertEqual(stat.S_IMODE(os.stat(socketPath).st_mode), 0o600)
+            self.assertEqual(stat.S_IMODE(os.stat(os.path.dirname(socketPath)).st_mode), 0o700)
+            response = request({"id": "q", "cnf": SAT_CNF}, socketPath)
+            self.assertEqual((response["id"], response["output"]),
+                             ("q", "s SATISFIABLE\nv -1 2 3 0\n"))
+            response = request({"id": "p", "path": self.formula}, socketPath)
+            self.assertEqual(response["status"], ERROR)
+            completed = subprocess.run([sys.executable, CLIENT, self.formula],
+                                       env=dict(os.environ, SAT_SOLVER_SOCKET=socketPath),
+                                       capture_output=True, text=True, timeout=60)
+            self.assertIn("c solved by the service", completed.stdout)
+            self.assertTrue(completed.stdout.endswith("s SATISFIABLE\nv -1 2 3 0\n"))
+        finally:
+            service.terminate()
+            service.wait(30)
+        self.assertFalse(os.path.exists(socketPath))
+
+    def test_client_without_service(self):
+        completed = subprocess.run([sys.executable, CLIENT, self.formula],
+                                   env=dict(os.environ, SAT_SOLVER_SOCKET=os.path.join(
+                                       self.directory, "none.sock")),
+                                   capture_output=True, text=True, timeout=60)
+        self.assertIn("s SATISFIABLE", completed.stdout)
+        self.assertNotIn("c solved by the service", completed.stdout)
+
+    def test_client_falls_back_on_errors(self):
+        # A socket path nobody can listen on, a service that hangs up and
+        # one that answers BUSY
+        socketPath = os.path.join(self.directory, "fake.sock")
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(socketPath)
+        listener.listen()
+        try:
+            for path, answer in ((self.directory, None), (socketPath, None), (socketPath, BUSY)):
+                completed = subprocess.Popen([sys.executable, CLIENT, self.formula, "30"],
+                                             env=dict(os.environ, SAT_SOLVER_SOCKET=path),
+                                             stdout=subprocess.PIPE, text=True)
+                if path == socketPath:
+                    connection, _ = listener.accept()
+                    with connection, connection.makefile("rwb") as stream:
+                        if answer is not None:
+                            requestId = json.loads(stream.readline())["id"]
+                            stream.write(json.dumps({"id": requestId, "status": answer,
+                                                     "output": ""}).encode() + b"\n")
+                stdout, _ = completed.communicate(timeout=60)
+                self.assertEqual(completed.returncode, 0)
+                self.assertIn("s SATISFIABLE", stdout)
+                self.assertNotIn("c solved by the service", stdout)
+        finally:
+            listener.close()
+
+    def test_client_rejects_bad_seconds(self):
+        completed = subprocess.run([sys.executable, CLIENT, self.formula, "abc"],
+                                   capture_output=True, text=True, timeout=60)
+        self.assertEqual(completed.returncode, 1)
+        self.assertIn("usage:", completed.stderr)
+        self.assertNotIn("Traceback", completed.stderr)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,14 @@
+import contextlib
+import io
 import unittest
 from solver import *
 from formula_constructor import constructFormula, constructRandomFormula, solveFormula
+from verify import ModelChecker
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # Testing for Solver as a Whole and the Oracle for Testing Property Based Test
 # Run tests using 'python test_solver.py'
@@ -98,6 +106,15 @@ class completeSolveTest(unittest.TestCase):
         complete = completeSolve(varbset, solution)
         self.assertEqual(set(complete), {"-1", "-2", "3", "4", "-5"})
 
+class parseArgumentsTest(unittest.TestCase):
+    def test_jobs_needs_cubes(self):
+        self.assertEqual(parseArguments(["f.cnf", "--cubes", "--jobs", "2"]).jobs, 2)
+        with contextlib.redirect_stderr(io.StringIO()):
+            with self.assertRaises(SystemExit):
+                parseArguments(["f.cnf", "--jobs", "2"])
+            with self.assertRaises(SystemExit):
+                parseArguments(["f.cnf", "--cubes", "--jobs", "0"])
+
 class constructRandomFormulaTest(unittest.TestCase):
     def test_construct_zero(self):
         (varbset, formula) = constructRandomFormula(0, 0)
@@ -154,5 +171,21 @@ class PropertyBasedTestForSolver(unittest.TestCase):
                 completeSolution = completeSolve(varbset, solution)
                 self.assertTrue(solveFormula(formula, completeSolution))
 
+    # Checks unsatisfiable answers too, by evaluating every assignment of
+    # small formulas in one batch
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_unsat_at_scale(self):
+        numLoop = 100
+        for i in range(0, numLoop):
+            numLit = random.randint(1, 12)
+            numClause = random.randint(1, 50)
+            (varbset, formula) = constructRandomFormula(numLit, numClause)
+            (solution, isSat) = solve(formula, set())
+            # Row r assigns variable v + 1 the bit v of r
+            rows = np.arange(1 << numLit)[:, np.newaxis]
+            assignments = (rows >> np.arange(numLit)) & 1 == 1
+            anySat = ModelChecker(formula).evaluateBatch(assignments).any()
+            self.assertEqual(isSat, bool(anySat))
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,102 @@
+import io
+import time
+import unittest
+from generators import pigeonhole, randomKSat
+from search import DPLL, Solver
+from stats import PHASES, SearchStats, peakRss
+
+# Testing for the Search Statistics
+# Run tests using 'python test_stats.py'
+
+class countersTest(unittest.TestCase):
+    def test_counters_without_stats(self):
+        solver = Solver(pigeonhole(4))
+        self.assertFalse(solver.solve())
+        self.assertGreater(solver.propagations, 0)
+        self.assertGreater(solver.backtracks, 0)
+        self.assertGreaterEqual(solver.backtracks, solver.conflicts - 1)
+
+    def test_dpll_counters(self):
+        solver = Solver(pigeonhole(3), DPLL)
+        self.assertFalse(solver.solve())
+        self.assertGreater(solver.propagations, 0)
+        self.assertGreater(solver.backtracks, 0)
+
+class searchStatsTest(unittest.TestCase):
+    def test_attach_times_phases(self):
+        solver = Solver(pigeonhole(5))
+        stats = SearchStats()
+        stats.attach(solver)
+        self.assertFalse(solver.solve())
+        stats.detach()
+        snapshot = stats.snapshot()
+        self.assertEqual(snapshot["conflicts"], solver.conflicts)
+        self.assertEqual(snapshot["propagations"], solver.propagations)
+        self.assertLessEqual(set(PHASES), set(snapshot["times"]))
+        self.assertGreater(snapshot["times"]["propagate"], 0)
+        self.assertEqual(snapshot["calls"]["analyze"], solver.conflicts - 1)
+        self.assertGreater(snapshot["memory"]["arena"], 0)
+        self.assertIn("decisions", repr(stats))
+
+    def test_detach_restores_methods(self):
+        solver = Solver(pigeonhole(3))
+        stats = SearchStats()
+        stats.attach(solver)
+        self.assertIn("propagate", solver.__dict__)
+        stats.detach()
+        for name in ("propagate", "analyze", "pickBranchLit"):
+            self.assertNotIn(name, solver.__dict__)
+        self.assertNotIn("reduce", solver.clauseDb.__dict__)
+        calls = stats.calls["propagate"]
+        solver.solve()
+        self.assertEqual(stats.calls["propagate"], calls)
+
+    def test_same_result_with_stats(self):
+        for seed in range(5):
+            arena = randomKSat(30, seed=seed)
+            plain = Solver(arena, seed=seed)
+            instrumented = Solver(arena, seed=seed)
+            SearchStats().attach(instrumented)
+            self.assertEqual(plain.solve(), instrumented.solve())
+            self.assertEqual(plain.conflicts, instrumented.conflicts)
+            self.assertEqual(plain.model, instrumented.model)
+
+    def test_callbacks(self):
+        snapshots = []
+        stats = SearchStats()
+        stats.addCallback(snapshots.append, interval=0.0)
+        solver = Solver(pigeonhole(4))
+        stats.attach(solver)
+        solver.solve()
+        stats.detach()
+        # Every propagation samples, plus the final snapshot
+        self.assertGreater(len(snapshots), 1)
+        self.assertEqual(snapshots[-1]["conflicts"], solver.conflicts)
+        self.assertIn("rss", snapshots[-1]["memory"])
+        stats.removeCallback(snapshots.append)
+        self.assertEqual(stats.nextSample, float("inf"))
+
+    def test_progress_lines(self):
+        output = io.StringIO()
+        stats = SearchStats(progressInterval=1e-9, output=output)
+        stats.attach(Solver(pigeonhole(4)))
+        stats.solver.solve()
+        stats.detach()
+        lines = output.getvalue().splitlines()
+        self.assertTrue(lines)
+        self.assertTrue(all(line.startswith("c progress ") for line in lines))
+
+    def test_phase(self):
+        stats = SearchStats()
+        with stats.phase("preprocess"):
+            time.sleep(0.01)
+        self.assertGreater(stats.times["preprocess"], 0)
+        self.assertEqual(stats.calls["preprocess"], 1)
+
+    def test_peak_rss(self):
+        peak = peakRss()
+        if peak is not None:
+            self.assertGreater(peak, 0)
+
+if __name__ == "__main__":
+    unittest.main()
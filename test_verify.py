@@ -0,0 +1,97 @@
+import itertools
+import random
+import unittest
+from arena import ClauseArena
+from formula_constructor import constructFormula, solveFormula
+from generators import randomKSat
+from verify import ModelChecker, np, unsatisfiedClauses
+import verify
+
+# Testing for the Vectorized Model Checker
+# Run tests using 'python test_verify.py'
+
+# Unsatisfied clauses found one clause at a time
+def slowUnsatisfied(clauses, model):
+    trueLits = set(model)
+    return [i for i, clause in enumerate(clauses) if trueLits.isdisjoint(clause)]
+
+@unittest.skipIf(np is None, "numpy is not installed")
+class modelCheckerTest(unittest.TestCase):
+    def test_unsatisfied_indices(self):
+        checker = ModelChecker(ClauseArena.fromLists([[1, -2], [], [2, 3], [-1]]))
+        self.assertEqual(checker.unsatisfied([1, -2, -3]).tolist(), [1, 2, 3])
+        self.assertEqual(checker.unsatisfied(["-1", "-2", "3"]).tolist(), [1])
+        self.assertFalse(checker.satisfies([-1, 2, 3]))
+
+    def test_unassigned_literals_are_false(self):
+        checker = ModelChecker(ClauseArena.fromLists([[1, 2], [-3]]))
+        self.assertEqual(checker.unsatisfied([]).tolist(), [0, 1])
+        self.assertTrue(checker.satisfies([2, -3]))
+
+    def test_clause_views(self):
+        formula = constructFormula({0: [1, -3], 1: [2, 3, -1]})
+        checker = ModelChecker(formula)
+        self.assertTrue(checker.satisfies(["1", "2", "3"]))
+        self.assertEqual(checker.unsatisfied(["1", "-2", "-3"]).tolist(), [1])
+
+    def test_matches_clause_by_clause_check(self):
+        rng = random.Random(3)
+        for seed in range(20):
+            arena = randomKSat(30, 3, ratio=3.0, seed=seed)
+            clauses = arena.toLists()
+            model = [var if rng.random() < 0.5 else -var for var in range(1, 31)]
+            self.assertEqual(ModelChecker(arena).unsatisfied(model).tolist(),
+                             slowUnsatisfied(clauses, model))
+
+    def test_batch_exhaustive(self):
+        arena = ClauseArena.fromLists([[1, 2], [-1, 3], [-2, -3], [1, -3, 4]])
+        rows = list(itertools.product([False, True], repeat=4))
+        counts = ModelChecker(arena).countUnsatisfied(np.array(rows))
+        for row, count in zip(rows, counts):
+            model = [var if value else -var for var, value in enumerate(row, 1)]
+            self.assertEqual(count, len(slowUnsatisfied(arena.toLists(), model)))
+
+    def test_batch_of_assignment_vectors(self):
+        arena = randomKSat(20, seed=1)
+        checker = ModelChecker(arena)
+        rng = random.Random(1)
+        models = [[var if rng.random() < 0.5 else -var for var in range(1, 21)] for _ in range(8)]
+        batch = np.stack([checker.assignment(model) for model in models])
+        expected = [not slowUnsatisfied(arena.toLists(), model) for model in models]
+        self.assertEqual(checker.evaluateBatch(batch).tolist(), expected)
+
+    def test_batch_split_in_chunks(self):
+        arena = randomKSat(10, seed=2)
+        rows = np.array(list(itertools.product([False, True], repeat=10)))
+        whole = ModelChecker(arena).countUnsatisfied(rows)
+        saved = verify.BATCH_BYTES
+        verify.BATCH_BYTES = 1
+        try:
+            chunked = ModelChecker(arena).countUnsatisfied(rows)
+        finally:
+            verify.BATCH_BYTES = saved
+        self.assertEqual(whole.tolist(), chunked.tolist())
+
+    def test_batch_too_narrow(self):
+        checker = ModelChecker(ClauseArena.fromLists([[1, 5]]))
+        with self.assertRaises(ValueError):
+            checker.countUnsatisfied(np.ones((2, 3), dtype=bool))
+
+class unsatisfiedClausesTest(unittest.TestCase):
+    def test_with_and_without_numpy(self):
+        arena = ClauseArena.fromLists([[1, -2], [2], [-1, -2]])
+        self.assertEqual(unsatisfiedClauses(arena, [1, 2]), [2])
+        saved = verify.np
+        verify.np = None
+        try:
+            self.assertEqual(unsatisfiedClauses(arena, ["1", "2"]), [2])
+        finally:
+            verify.np = saved
+
+    def test_solve_formula(self):
+        formula = constructFormula({0: [1, -3], 1: [2, 3, -1]})
+        self.assertTrue(solveFormula(formula, ["1", "2", "-3"]))
+        self.assertFalse(solveFormula(formula, ["1", "-2", "-3"]))
+
+if __name__ == "__main__":
+    unittest.main()
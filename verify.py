@@ -0,0 +1,108 @@
+from typing import Iterable, List, Union
+from arena import ClauseArena
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Vectorized Model Checking:
+# The formula is encoded once in CSR form: the arena's literal buffer split
+# into a variable array and a sign array, plus the clause offsets. An
+# assignment is an int8 vector indexed by variable holding 1 (true), -1
+# (false) or 0 (unassigned). Evaluating it is a gather of the assignment at
+# every literal, a sign comparison and a cumulative sum, whose differences at
+# the clause offsets count the true literals of every clause, so one pass
+# checks every clause of one model or of a whole batch of assignments (one
+# row each). Empty clauses have no true literals and are always unsatisfied.
+
+# Bytes of working memory a batch evaluation may use before it is split
+BATCH_BYTES = 64 << 20
+
+class ModelChecker:
+    def __init__(self, formula: Union[ClauseArena, list]):
+        if np is None:
+            raise ImportError("numpy is required for ModelChecker")
+        if not isinstance(formula, ClauseArena):
+            # A list of Clause views, as built by formula_constructor
+            formula = ClauseArena.fromLists(
+                [int(lit.value) for lit in clause.literalSet] for clause in formula)
+        self.numVars = formula.numVars
+        self.numClauses = len(formula)
+        lits, offsets = formula.asNumpy()
+        self.vars = np.abs(lits).astype(np.intp)
+        self.signs = np.where(lits > 0, 1, -1).astype(np.int8)
+        self.offsets = offsets.astype(np.intp)
+
+    """
+        The assignment vector of a model given as literals, integers or
+        strings, so that a completeSolve result can be passed directly.
+    """
+    def assignment(self, model: Iterable[Union[int, str]]) -> "np.ndarray":
+        lits = np.fromiter((int(lit) for lit in model), dtype=np.int64)
+        numVars = max(self.numVars, int(np.abs(lits).max(initial=0)))
+        values = np.zeros(numVars + 1, dtype=np.int8)
+        values[np.abs(lits)] = np.where(lits > 0, 1, -1)
+        return values
+
+    # Converts a batch to a 2D int8 array of assignment vectors. Boolean
+    # rows, which hold variables 1..n, are shifted into place.
+    def _batch(self, assignments) -> "np.ndarray":
+        batch = np.asarray(assignments)
+        if batch.ndim == 1:
+            batch = batch[np.newaxis, :]
+        if batch.dtype == np.bool_:
+            batch = np.where(batch, 1, -1).astype(np.int8)
+            batch = np.concatenate([np.zeros((len(batch), 1), dtype=np.int8), batch], axis=1)
+        if batch.shape[1] <= self.numVars:
+            raise ValueError(f"assignments cover {batch.shape[1] - 1} variables, "
+                             f"the formula has {self.numVars}")
+        return batch.astype(np.int8, copy=False)
+
+    """
+        Number of unsatisfied clauses under each assignment of a batch.
+        A batch is a 2D array with one assignment per row, either in the
+        vector form of assignment (column 0 unused) or as booleans for
+        variables 1 to numVars. It is evaluated in chunks of rows that
+        keep the working memory under BATCH_BYTES.
+    """
+    def countUnsatisfied(self, assignments) -> "np.ndarray":
+        batch = self._batch(assignments)
+        counts = np.empty(len(batch), dtype=np.int64)
+        rows = max(1, BATCH_BYTES // (8 * (len(self.vars) + 1)))
+        for start in range(0, len(batch), rows):
+            counts[start:start + rows] = (self._trueCounts(batch[start:start + rows]) == 0).sum(axis=1)
+        return counts
+
+    # True literals of every clause (columns) under every row of batch
+    def _trueCounts(self, batch: "np.ndarray") -> "np.ndarray":
+        isTrue = batch[:, self.vars] == self.signs
+        running = np.zeros((len(batch), len(self.vars) + 1), dtype=np.int32)
+        np.cumsum(isTrue, axis=1, out=running[:, 1:])
+        return running[:, self.offsets[1:]] - running[:, self.offsets[:-1]]
+
+    """
+        Whether each assignment of a batch satisfies every clause.
+    """
+    def evaluateBatch(self, assignments) -> "np.ndarray":
+        return self.countUnsatisfied(assignments) == 0
+
+    """
+        Indices (arena positions) of the clauses a model leaves unsatisfied.
+    """
+    def unsatisfied(self, model: Iterable[Union[int, str]]) -> "np.ndarray":
+        counts = self._trueCounts(self.assignment(model)[np.newaxis, :])[0]
+        return np.flatnonzero(counts == 0)
+
+    def satisfies(self, model: Iterable[Union[int, str]]) -> bool:
+        return len(self.unsatisfied(model)) == 0
+
+"""
+    Indices of the clauses of arena that model leaves unsatisfied, with
+    NumPy when it is installed and a short-circuiting scan otherwise.
+"""
+def unsatisfiedClauses(arena: ClauseArena, model: Iterable[Union[int, str]]) -> List[int]:
+    if np is not None:
+        return ModelChecker(arena).unsatisfied(model).tolist()
+    trueLits = {int(lit) for lit in model}
+    return [i for i, clause in enumerate(arena) if trueLits.isdisjoint(clause)]